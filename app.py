@@ -6,22 +6,49 @@ from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 
+from pkg import Password
+from pkg.sender import HttpClient
+from pkg.sender.smtp import smtp_pool
+from pkg.sender.webhook import webhook_dispatcher
 from pkg.utils import raise_internal_error
-from routes import (session, admin, object)
-from model.database import Database
+from routes import (session, admin, object, webhook)
+from model.database import Database, write_queue
+from services.notification import lost_scan_digest, notification_worker
+from services.scan import find_ip_buffer, scan_event_queue, scan_stats
+from services.session import apply_password_policy
 import os
 import pkg.conf
 from pkg import utils
 
 from loguru import logger
 
-Router = [admin, session, object]
+Router = [admin, session, object, webhook]
 
 # Findreve 的生命周期
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await Database().init_db()
+    async with Database.session_context() as db_session:
+        await apply_password_policy(db_session)
+    await HttpClient.start()
+    await write_queue.start()
+    await find_ip_buffer.start()
+    await scan_event_queue.start()
+    await scan_stats.start()
+    await lost_scan_digest.start()
+    await notification_worker.start()
     yield
+    await lost_scan_digest.stop()
+    await notification_worker.stop()
+    await scan_stats.stop()
+    await scan_event_queue.stop()
+    await find_ip_buffer.stop()
+    # 其他组件的最后一次刷写都经过写队列，需最后停止
+    await write_queue.stop()
+    await webhook_dispatcher.stop()
+    await smtp_pool.close()
+    await HttpClient.close()
+    Password.shutdown()
 
 # 定义 Findreve 服务器
 app = FastAPI(
@@ -0,0 +1,114 @@
+"""
+登录洪峰下公共扫码接口的延迟基准测试
+
+在临时 SQLite 数据库上启动 Findreve，同时发起大量错误密码的登录请求，
+并测量 `GET /api/object/{item_id}` 的 p50 / p99 延迟。
+
+用法::
+
+    python -m benchmarks.login_flood [--mode async|sync] [--flood 8] [--requests 200]
+
+`--mode sync` 会让登录在事件循环中直接执行 Argon2 校验，用于对比改造前的表现。
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+_tmpdir = tempfile.mkdtemp(prefix="findreve-bench-")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(_tmpdir, 'bench.db')}"
+# 放宽登录失败限制，保证洪峰中的每个请求都会执行 Argon2 校验，而不是被直接以 429 拒绝
+os.environ["LOGIN_MAX_FAILURES_PER_ACCOUNT"] = str(10 ** 9)
+os.environ["LOGIN_MAX_FAILURES_PER_IP"] = str(10 ** 9)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx  # noqa: E402
+from loguru import logger  # noqa: E402
+
+from app import app  # noqa: E402
+from model import Database, Item, User  # noqa: E402
+from pkg import Password  # noqa: E402
+from pkg.password import PasswordStatus  # noqa: E402
+
+
+async def prepare() -> str:
+    """初始化数据库并创建一个测试物品，返回物品 ID。"""
+    await Database().init_db()
+    async with Database.session_context() as session:
+        user = await User.add(session, User(
+            email="bench@example.com",
+            nickname="Bench",
+            password=Password.hash("correct-password"),
+        ))
+        item = await Item.add(session, Item(name="bench item", user_id=user.id))
+        return str(item.id)
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def flood(client: httpx.AsyncClient, stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        response = await client.post("/api/token", data={
+            "username": "bench@example.com",
+            "password": "wrong-password",
+        })
+        if response.status_code == 429:
+            raise RuntimeError("Login attempts were throttled; the flood no longer reaches the password hasher")
+
+
+async def measure(client: httpx.AsyncClient, item_id: str, count: int) -> list[float]:
+    latencies: list[float] = []
+    for _ in range(count):
+        start = time.perf_counter()
+        response = await client.get(f"/api/object/{item_id}")
+        latencies.append((time.perf_counter() - start) * 1000)
+        response.raise_for_status()
+    return latencies
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=("async", "sync"), default="async")
+    parser.add_argument("--flood", type=int, default=8, help="并发登录请求数")
+    parser.add_argument("--requests", type=int, default=200, help="测量的扫码请求数")
+    args = parser.parse_args()
+
+    logger.remove()
+
+    if args.mode == "sync":
+        async def verify_inline(hash: str, password: str) -> PasswordStatus:
+            return Password.verify(hash, password)
+        Password.verify_async = staticmethod(verify_inline)
+
+    item_id = await prepare()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        baseline = await measure(client, item_id, args.requests)
+
+        stop = asyncio.Event()
+        flooders = [asyncio.create_task(flood(client, stop)) for _ in range(args.flood)]
+        await asyncio.sleep(0.5)
+        loaded = await measure(client, item_id, args.requests)
+        stop.set()
+        await asyncio.gather(*flooders)
+
+    Password.shutdown()
+
+    print(f"mode={args.mode} flood={args.flood} requests={args.requests}")
+    for name, samples in (("idle", baseline), ("login flood", loaded)):
+        print(
+            f"{name:>12}: p50={statistics.median(samples):8.2f} ms  "
+            f"p99={percentile(samples, 99):8.2f} ms  max={max(samples):8.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,95 @@
+"""
+完整实体读取与列投影读取的对比基准测试
+
+在临时 SQLite 数据库中写入一批物品，分别用 `Item.get(...)`（构造 ORM 实例并进入 identity map）
+与 `Item.get(..., columns=[...])`（只返回 Row）读取物品列表需要的列，
+输出每秒读取的行数以及 tracemalloc 统计的分配峰值。
+
+用法::
+
+    python -m benchmarks.projection [--rows 5000] [--rounds 5]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+_tmpdir = tempfile.mkdtemp(prefix="findreve-bench-")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(_tmpdir, 'bench.db')}"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from loguru import logger  # noqa: E402
+
+from model import Database, Item, User  # noqa: E402
+from pkg import Password  # noqa: E402
+from services.object import _LIST_COLUMNS  # noqa: E402
+
+
+async def prepare(rows: int) -> User:
+    """初始化数据库并为测试用户写入 `rows` 个物品。"""
+    await Database().init_db()
+    async with Database.session_context() as session:
+        user = await User.add(session, User(
+            email="bench@example.com",
+            nickname="Bench",
+            password=Password.hash("bench-password"),
+        ))
+        await Item.add(
+            session,
+            [Item(name=f"item {i}", description="x" * 64, phone="13800000000", user_id=user.id) for i in range(rows)],
+            refresh=False,
+        )
+        return user
+
+
+async def read_full(user: User) -> int:
+    async with Database.session_context() as session:
+        items = await Item.get(session, Item.user_id == user.id, fetch_mode="all")
+        return len(items)
+
+
+async def read_projected(user: User) -> int:
+    async with Database.session_context() as session:
+        rows = await Item.get(session, Item.user_id == user.id, fetch_mode="all", columns=_LIST_COLUMNS)
+        return len(rows)
+
+
+async def run(name: str, reader, user: User, rounds: int) -> None:
+    await reader(user)  # 预热
+
+    count = 0
+    start = time.perf_counter()
+    for _ in range(rounds):
+        count += await reader(user)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    await reader(user)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{name:>10}: {count / elapsed:12,.0f} rows/s  peak={peak / 1024 / 1024:8.2f} MiB")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=5000, help="写入的物品数")
+    parser.add_argument("--rounds", type=int, default=5, help="每种方式读取的轮数")
+    args = parser.parse_args()
+
+    logger.remove()
+    user = await prepare(args.rows)
+
+    print(f"rows={args.rows} rounds={args.rounds}")
+    await run("full", read_full, user, args.rounds)
+    await run("projected", read_projected, user, args.rounds)
+
+    Password.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,98 @@
+"""
+推送通道发送吞吐量基准测试
+
+在本地启动一个模拟企业微信 Webhook 的桩服务器，分别测量：
+
+- before: 每条消息新建一个 `aiohttp.ClientSession`（改造前的做法）
+- after: 复用 `HttpClient` 共享连接池的 `WeChatBot.send_text`
+
+在顺序发送与并发发送两种场景下的吞吐量。
+
+用法::
+
+    python -m benchmarks.sender_throughput [--messages 500] [--concurrency 50]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import aiohttp  # noqa: E402
+from aiohttp import web  # noqa: E402
+from loguru import logger  # noqa: E402
+
+from model import Setting, SettingsCache  # noqa: E402
+from pkg.sender import HttpClient, WeChatBot  # noqa: E402
+from pkg.sender import wechat_bot  # noqa: E402
+
+
+async def start_stub() -> tuple[web.AppRunner, str]:
+    """启动桩服务器，返回 runner 与 Webhook 地址。"""
+    async def handle(request: web.Request) -> web.Response:
+        await request.read()
+        return web.json_response({"errcode": 0, "errmsg": "ok"})
+
+    app = web.Application()
+    app.router.add_post("/cgi-bin/webhook/send", handle)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}/cgi-bin/webhook/send"
+
+
+async def send_before(url: str) -> None:
+    async with aiohttp.ClientSession() as http_session:
+        async with http_session.post(
+            url=f"{url}?key=bench",
+            json={"msgtype": "text", "text": {"content": "bench"}},
+        ) as response:
+            await response.json()
+
+
+async def send_after(url: str) -> None:
+    await WeChatBot.send_text(session=None, text="bench")
+
+
+async def run(send, url: str, messages: int, concurrency: int) -> float:
+    """发送 `messages` 条消息，返回每秒发送条数。"""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one() -> None:
+        async with semaphore:
+            await send(url)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(messages)))
+    return messages / (time.perf_counter() - start)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=500, help="每个场景发送的消息数")
+    parser.add_argument("--concurrency", type=int, default=50, help="并发场景的并发数")
+    args = parser.parse_args()
+
+    logger.remove()
+    runner, url = await start_stub()
+    wechat_bot.webhook_url = url
+    SettingsCache.replace(Setting(type="string", name="wechat_bot_key", value="bench"))
+    await HttpClient.start()
+
+    print(f"messages={args.messages} concurrency={args.concurrency}")
+    for name, send in (("before", send_before), ("after", send_after)):
+        sequential = await run(send, url, args.messages, 1)
+        concurrent = await run(send, url, args.messages, args.concurrency)
+        print(f"{name:>7}: sequential={sequential:8.1f} msg/s  concurrent={concurrent:8.1f} msg/s")
+
+    await HttpClient.close()
+    await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,109 @@
+"""
+SQLite 连接配置的并发读写基准测试
+
+对 `SQLITE_PROFILES` 中的每个配置各建一个临时数据库，用同样的连接池设置运行一组并发读者
+（按主键查询）与并发写者（每次写入单独提交），输出每秒完成的读写次数以及
+`database is locked` 错误的次数。
+
+用法::
+
+    python -m benchmarks.sqlite_profile [--seconds 5] [--readers 8] [--writers 4] [--rows 10000]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+_tmpdir = tempfile.mkdtemp(prefix="findreve-bench-")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(_tmpdir, 'app.db')}"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event, text  # noqa: E402
+from sqlalchemy.exc import OperationalError  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine  # noqa: E402
+
+from model.database import SQLITE_PROFILES, apply_sqlite_pragmas, sqlite_pragmas  # noqa: E402
+
+
+def create_engine(profile: str) -> AsyncEngine:
+    """按与应用相同的方式创建引擎，并在每个连接上应用指定配置。"""
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{os.path.join(_tmpdir, f'{profile}.db')}",
+        connect_args={"check_same_thread": False},
+    )
+    pragmas = sqlite_pragmas(profile)
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _configure(dbapi_connection, connection_record):
+        apply_sqlite_pragmas(dbapi_connection, pragmas)
+
+    return engine
+
+
+async def prepare(engine: AsyncEngine, rows: int) -> None:
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE item (id INTEGER PRIMARY KEY, name TEXT, scan_count INTEGER)"))
+        await conn.execute(
+            text("INSERT INTO item (id, name, scan_count) VALUES (:id, :name, 0)"),
+            [{"id": i, "name": f"item {i}"} for i in range(rows)],
+        )
+
+
+async def run_profile(profile: str, seconds: float, readers: int, writers: int, rows: int) -> None:
+    engine = create_engine(profile)
+    await prepare(engine, rows)
+
+    counts = {"reads": 0, "writes": 0, "locked": 0}
+    deadline = time.perf_counter() + seconds
+
+    async def reader() -> None:
+        while time.perf_counter() < deadline:
+            try:
+                async with engine.connect() as conn:
+                    await conn.execute(text("SELECT name, scan_count FROM item WHERE id = :id"), {"id": random.randrange(rows)})
+                counts["reads"] += 1
+            except OperationalError:
+                counts["locked"] += 1
+
+    async def writer() -> None:
+        while time.perf_counter() < deadline:
+            try:
+                async with engine.begin() as conn:
+                    await conn.execute(
+                        text("UPDATE item SET scan_count = scan_count + 1 WHERE id = :id"),
+                        {"id": random.randrange(rows)},
+                    )
+                counts["writes"] += 1
+            except OperationalError:
+                counts["locked"] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(reader() for _ in range(readers)), *(writer() for _ in range(writers)))
+    elapsed = time.perf_counter() - start
+    await engine.dispose()
+
+    print(
+        f"{profile:>10}: reads={counts['reads'] / elapsed:10,.0f}/s  "
+        f"writes={counts['writes'] / elapsed:8,.0f}/s  locked={counts['locked']}"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=5, help="每个配置运行的秒数")
+    parser.add_argument("--readers", type=int, default=8, help="并发读者数")
+    parser.add_argument("--writers", type=int, default=4, help="并发写者数")
+    parser.add_argument("--rows", type=int, default=10000, help="表中的行数")
+    args = parser.parse_args()
+
+    print(f"seconds={args.seconds} readers={args.readers} writers={args.writers} rows={args.rows}")
+    for profile in SQLITE_PROFILES:
+        await run_profile(profile, args.seconds, args.readers, args.writers, args.rows)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
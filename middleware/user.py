@@ -1,14 +1,36 @@
-from typing import Annotated
+import os
+from typing import Annotated, Any
 
 import jwt
+import sqlalchemy as sa
 from fastapi import Depends
 from jwt import InvalidTokenError
+from sqlalchemy import event
+from sqlalchemy.orm import make_transient_to_detached, object_session
+from sqlalchemy.orm.session import Session as SessionClass
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 import JWT
 from model import User
 from model.database import Database
 from pkg import utils
+from pkg.cache import TTLCache
+
+# 进程级的身份缓存：令牌 subject(邮箱) -> 用户列数据
+principal_cache: TTLCache[str, dict[str, Any]] = TTLCache(
+    maxsize=int(os.getenv("PRINCIPAL_CACHE_SIZE", 1024)),
+    ttl=float(os.getenv("PRINCIPAL_CACHE_TTL", 30)),
+)
+
+def _detached_user(data: dict[str, Any]) -> User:
+    """
+    根据缓存的列数据构造一个独立的、处于 detached 状态的用户实例。
+
+    每个请求拿到的都是新实例，避免多个会话共享同一个 ORM 对象。
+    """
+    user = User(**data)
+    make_transient_to_detached(user)
+    return user
 
 async def get_current_user(
         token: Annotated[str, Depends(JWT.oauth2_scheme)],
@@ -16,14 +38,61 @@ async def get_current_user(
 ) -> User:
     """
     验证用户身份并返回当前用户信息。
+
+    FastAPI 会在同一个请求内缓存该依赖的结果；跨请求时优先命中
+    `principal_cache`，只有缓存未命中时才查询数据库。
     """
 
     try:
         payload = jwt.decode(token, await JWT.get_secret_key(), algorithms=[JWT.ALGORITHM])
-        username = payload.get("sub")
-        stored_account = await User.get(session, User.email == username)
-        if username is None or stored_account.email != username:
-            utils.raise_unauthorized("Login required")
-        return stored_account
     except InvalidTokenError:
-        utils.raise_unauthorized("Login required")
\ No newline at end of file
+        utils.raise_unauthorized("Login required")
+
+    username = payload.get("sub")
+    if username is None:
+        utils.raise_unauthorized("Login required")
+
+    cached = principal_cache.get(username)
+    if cached is not None:
+        return _detached_user(cached)
+
+    stored_account = await User.get_by(session, email=username)
+    if stored_account is None or stored_account.email != username:
+        utils.raise_unauthorized("Login required")
+
+    principal_cache.set(username, stored_account.model_dump())
+    return stored_account
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def invalidate_principal(mapper, connection, target: User) -> None:
+    """
+    用户记录被修改或删除时，清除对应的身份缓存（包括修改前的邮箱）。
+
+    该事件在 flush 时触发，此时事务尚未提交（组提交批次中可能还要等待一段时间），
+    期间并发的缓存未命中仍会读到旧数据并重新写入缓存。因此这里同时把受影响的邮箱
+    记在会话上，由 `evict_principals_after_commit` 在提交后再清除一次。
+    """
+    emails = {target.email, *sa.inspect(target).attrs.email.history.deleted}
+    for email in emails:
+        principal_cache.invalidate(email)
+
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("evict_principals", set()).update(emails)
+
+@event.listens_for(SessionClass, "after_commit")
+def evict_principals_after_commit(session: SessionClass) -> None:
+    """
+    事务提交后再次清除本事务修改过的用户的身份缓存。
+    """
+    for email in session.info.pop("evict_principals", ()):
+        principal_cache.invalidate(email)
+
+@event.listens_for(SessionClass, "after_soft_rollback")
+def discard_principal_evictions(session: SessionClass, previous_transaction) -> None:
+    """
+    事务回滚后数据库中的用户未被修改，丢弃待清除的邮箱。
+    """
+    if not session.in_transaction():
+        session.info.pop("evict_principals", None)
@@ -1,5 +1,8 @@
 from .response import DefaultResponse, TokenResponse, TokenData
-from .setting import Setting, SettingResponse
+from .setting import Setting, SettingResponse, SettingsCache, SettingsSnapshot
 from .item import Item, ItemDataResponse, ItemTypeEnum, ItemStatusEnum
 from .user import User, UserTypeEnum
+from .scan import ItemScanStats, ScanEvent, ScanEventResponse
+from .notification import NotificationOutbox, OutboxStatusEnum
+from .webhook import WebhookEventEnum, WebhookSubscription
 from .database import Database
@@ -1,9 +1,13 @@
 import uuid
 from datetime import datetime, timezone
-from typing import Union, TypeVar, Type, Literal, override, Optional, Any
+from typing import Union, TypeVar, Type, Literal, override, Optional, Any, Awaitable, Callable, ClassVar
 
 from fastapi import HTTPException
-from sqlalchemy import DateTime, BinaryExpression, ClauseElement
+from sqlalchemy import DateTime, BinaryExpression, ClauseElement, Row, bindparam, insert
+from sqlalchemy import delete as sa_delete
+from sqlalchemy import update as sa_update
+from sqlalchemy import select as sa_select
+from sqlalchemy import inspect as sa_inspect
 from sqlalchemy.orm import selectinload
 from sqlmodel import Field, select, Relationship, SQLModel
 from sqlmodel.ext.asyncio.session import AsyncSession
@@ -16,6 +20,39 @@ M = TypeVar("M", bound="SQLModel")
 now = lambda: datetime.now()
 now_date = lambda: datetime.now().date()
 
+statement_registry: dict[tuple, Any] = {}
+"""`TableBase.get_by` 按签名（模型、条件字段、投影列）缓存的查询语句"""
+
+write_executor: Callable[[AsyncSession, Callable[[AsyncSession], Awaitable[Any]]], Awaitable[Any]] | None = None
+"""
+执行并提交写操作的执行器，由 `model.database` 设置为组提交队列：能够合并的写操作在写连接上
+与其他请求的写操作一起提交，否则在调用方的会话中执行并提交。未设置时总是在调用方的会话中执行。
+"""
+
+
+async def _write(
+        session: AsyncSession,
+        operation: Callable[[AsyncSession], Awaitable[Any]],
+        commit: bool = True,
+        groupable: bool = True,
+) -> Any:
+    """
+    执行一个写操作。
+
+    :param session: 调用方的数据库会话
+    :param operation: 接收会话的异步函数，函数内不提交
+    :param commit: 是否提交；为 False 时在调用方的会话中执行，由调用方自行提交
+    :param groupable: 操作是否可以在其他会话中执行（如涉及调用方会话中已加载的实例时不可以）
+    """
+    if not commit:
+        return await operation(session)
+    if groupable and write_executor is not None:
+        return await write_executor(session, operation)
+    result = await operation(session)
+    await session.commit()
+    return result
+
+
 class TableBase(AsyncAttrs):
     id: int | None = Field(default=None, primary_key=True)
 
@@ -26,13 +63,24 @@ class TableBase(AsyncAttrs):
         default_factory=now
     )
 
+    _set_based_writes: ClassVar[bool] = True
+    """是否允许绕过 ORM 直接执行批量插入与按条件更新、删除。这类语句不触发 flush 事件，依赖这些事件做校验的模型应关闭"""
+
     @classmethod
-    async def add(cls: Type[T], session: AsyncSession, instances: T | list[T], refresh: bool = True) -> T | list[T]:
+    async def add(
+            cls: Type[T],
+            session: AsyncSession,
+            instances: T | list[T],
+            refresh: bool = True,
+            bulk: bool = False,
+    ) -> T | list[T]:
         """
         新增一条记录
         :param session: 数据库会话
         :param instances:
         :param refresh:
+        :param bulk: 批量插入模式，仅对列表生效。使用一条 executemany 的 INSERT ... RETURNING 写入，
+            只回填主键，不逐条 refresh，实例也不会进入会话；不触发 ORM 的 flush 事件
         :return: 新增的实例对象
 
         usage:
@@ -43,41 +91,89 @@ class TableBase(AsyncAttrs):
 
         item1_id = item1.id
         """
-        is_list = False
-        if isinstance(instances, list):
-            is_list = True
-            session.add_all(instances)
-        else:
-            session.add(instances)
+        if bulk and isinstance(instances, list):
+            await cls._bulk_insert(session, instances)
+            return instances
 
-        await session.commit()
+        is_list = isinstance(instances, list)
+        pending = instances if is_list else [instances]
+
+        async def operation(target: AsyncSession) -> None:
+            target.add_all(pending)
+            await target.flush()
+
+        await _write(session, operation, groupable=all(sa_inspect(i).transient for i in pending))
+        cls._reattach(session, pending)
 
         if refresh:
-            if is_list:
-                for instance in instances:
-                    await session.refresh(instance)
-            else:
-                await session.refresh(instances)
+            for instance in pending:
+                await session.refresh(instance)
 
         return instances
 
-    async def save(self: T, session: AsyncSession, load: Optional[Relationship] = None) -> T:
-        session.add(self)
-        await session.commit()
+    @staticmethod
+    def _reattach(session: AsyncSession, instances: list[T]) -> None:
+        # 在组提交的会话中写入的实例提交后处于游离状态，重新关联到调用方的会话，与直接提交时的行为一致
+        for instance in instances:
+            if sa_inspect(instance).detached:
+                session.add(instance)
+
+    @classmethod
+    async def _bulk_insert(cls: Type[T], session: AsyncSession, instances: list[T]) -> None:
+        if not cls._set_based_writes:
+            raise ValueError(f"{cls.__name__} does not support bulk insert")
+        if not instances:
+            return
+
+        table = cls.__table__
+        pk = table.c.id
+        rows = []
+        for instance in instances:
+            row = {column.key: getattr(instance, column.key) for column in table.columns}
+            if row['id'] is None:
+                # 自增主键由数据库生成
+                del row['id']
+            rows.append(row)
+
+        async def operation(target: AsyncSession) -> None:
+            if all('id' in row for row in rows):
+                await target.exec(insert(table), params=rows)
+            else:
+                result = await target.exec(insert(table).returning(pk, sort_by_parameter_order=True), params=rows)
+                for instance, new_id in zip(instances, result.scalars()):
+                    instance.id = new_id
+
+        await _write(session, operation)
+
+    async def save(self: T, session: AsyncSession, load: Optional[Relationship] = None, refresh: bool = True) -> T:
+        """
+        保存记录
+        :param session: 数据库会话
+        :param load: 提交后重新查询并预加载该关系
+        :param refresh: 提交后是否重新查询记录；调用方不再读取数据库生成的值时可关闭，省去一次 SELECT
+        :return: 保存后的记录
+        """
+        async def operation(target: AsyncSession) -> None:
+            target.add(self)
+            await target.flush()
+
+        await _write(session, operation, groupable=sa_inspect(self).transient)
+        self._reattach(session, [self])
 
         if load is not None:
             cls = type(self)
             return await cls.get(session, cls.id == self.id, load=load)
-        else:
+        elif refresh:
             await session.refresh(self)
-            return self
+        return self
 
     async def update(
             self: T,
             session: AsyncSession,
             other: M,
             extra_data: dict = None,
-            exclude_unset: bool = True
+            exclude_unset: bool = True,
+            refresh: bool = True,
     ) -> T:
         """
         更新记录
@@ -85,6 +181,7 @@ class TableBase(AsyncAttrs):
         :param other:
         :param extra_data:
         :param exclude_unset:
+        :param refresh: 提交后是否重新查询记录
         :return:
         """
         self.sqlmodel_update(other.model_dump(exclude_unset=exclude_unset), update=extra_data)
@@ -92,7 +189,8 @@ class TableBase(AsyncAttrs):
         session.add(self)
 
         await session.commit()
-        await session.refresh(self)
+        if refresh:
+            await session.refresh(self)
 
         return self
 
@@ -104,6 +202,9 @@ class TableBase(AsyncAttrs):
         :param instances:
         :return: None
 
+        按主键发出一条 `DELETE ... WHERE id IN (...)`，不加载任何关联对象，
+        子表的记录由数据库的 `ON DELETE` 规则处理。
+
         usage:
         item1 = Item.get(...)
         item2 = Item.get(...)
@@ -111,13 +212,75 @@ class TableBase(AsyncAttrs):
         Item.delete(session, [item1, item2])
 
         """
-        if isinstance(instances, list):
+        if not isinstance(instances, list):
+            instances = [instances]
+
+        if not cls._set_based_writes:
+            # 需要经过 ORM flush 事件校验的模型仍逐个删除
             for instance in instances:
                 await session.delete(instance)
-        else:
-            await session.delete(instances)
+            await session.commit()
+            return
 
-        await session.commit()
+        await cls.delete_where(session, cls.id.in_([instance.id for instance in instances]))
+
+    @classmethod
+    async def delete_where(
+            cls: Type[T],
+            session: AsyncSession,
+            condition: BinaryExpression | ClauseElement,
+            commit: bool = True,
+            returning: list | None = None,
+    ) -> int | list[Row]:
+        """
+        按条件删除记录
+        :param session: 数据库会话
+        :param condition: 删除条件
+        :param commit: 是否立即提交
+        :param returning: 用 `RETURNING` 返回被删除记录的这些列，如[Model.id]
+        :return: 删除的行数；指定 returning 时为被删除记录的 Row 列表
+
+        发出一条 `DELETE ... WHERE`，不加载任何实例；会话中已加载的对应实例不会被同步。
+        立即提交时语句可能经 `write_executor` 与其他写操作合并提交。
+        """
+        if not cls._set_based_writes:
+            raise ValueError(f"{cls.__name__} does not support set-based delete")
+
+        statement = sa_delete(cls).where(condition).execution_options(synchronize_session=False)
+        return await _write(session, lambda target: cls._execute_dml(target, statement, returning), commit)
+
+    @classmethod
+    async def update_where(
+            cls: Type[T],
+            session: AsyncSession,
+            condition: BinaryExpression | ClauseElement,
+            values: dict[str, Any],
+            commit: bool = True,
+            returning: list | None = None,
+    ) -> int | list[Row]:
+        """
+        按条件更新记录
+        :param session: 数据库会话
+        :param condition: 更新条件，如 (Model.id == id) & (Model.user_id == user_id)
+        :param values: 字段名与新值
+        :param commit: 是否立即提交
+        :param returning: 用 `RETURNING` 返回更新后记录的这些列，如[Model.id, Model.status]
+        :return: 更新的行数；指定 returning 时为更新后记录的 Row 列表
+
+        发出一条 `UPDATE ... WHERE`，条件校验、修改与读取新值在一次往返中完成；
+        会话中已加载的对应实例不会被同步。立即提交时语句可能经 `write_executor` 与其他写操作合并提交。
+        """
+        if not cls._set_based_writes:
+            raise ValueError(f"{cls.__name__} does not support set-based update")
+
+        statement = sa_update(cls).where(condition).values(**values).execution_options(synchronize_session=False)
+        return await _write(session, lambda target: cls._execute_dml(target, statement, returning), commit)
+
+    @staticmethod
+    async def _execute_dml(session: AsyncSession, statement, returning: list | None) -> int | list[Row]:
+        if returning:
+            return list((await session.exec(statement.returning(*returning))).all())
+        return (await session.exec(statement)).rowcount
 
     @classmethod
     async def get(
@@ -131,8 +294,10 @@ class TableBase(AsyncAttrs):
             join: Type[T] | tuple[Type[T], _OnClauseArgument] | None = None,
             options: list | None = None,
             load: Union[Relationship, None] = None,
-            order_by: list[ClauseElement] | None = None
-    ) -> T | list[T] | None:
+            order_by: list[ClauseElement] | None = None,
+            columns: list[ClauseElement] | None = None,
+            into: Type[M] | None = None,
+    ) -> T | list[T] | Row | list[Row] | M | list[M] | None:
         """
         异步获取模型实例
 
@@ -144,11 +309,18 @@ class TableBase(AsyncAttrs):
             options: 查询选项，如selectinload(Model.relation)，异步访问关系属性必备，不然会报错
             fetch_mode: 获取模式 - "one"/"all"/"first"
             join: 要联接的模型类
+            columns: 只查询这些列，如[Model.id, Model.name]。返回轻量的 Row（可按属性名访问），
+                不构造 ORM 实例，也不进入会话的 identity map；此时 options 与 load 不生效
+            into: 与 columns 搭配使用，将每一行按列名构造为该模型（如响应模型）
 
         返回:
             根据fetch_mode返回相应的查询结果
         """
-        statement = select(cls)
+        if columns:
+            # 使用 SQLAlchemy 原生 select，单列时同样返回 Row 而不是标量
+            statement = sa_select(*columns)
+        else:
+            statement = select(cls)
 
         if condition is not None:
             statement = statement.where(condition)
@@ -156,10 +328,10 @@ class TableBase(AsyncAttrs):
         if join is not None:
             statement = statement.join(*join)
 
-        if options:
+        if options and not columns:
             statement = statement.options(*options)
 
-        if load:
+        if load and not columns:
             statement = statement.options(selectinload(load))
 
         if order_by is not None:
@@ -172,16 +344,67 @@ class TableBase(AsyncAttrs):
             statement = statement.limit(limit)
 
         result = await session.exec(statement)
+        return cls._fetch(result, fetch_mode, into)
+
+    @classmethod
+    async def get_by(
+            cls: Type[T],
+            session: AsyncSession,
+            *,
+            fetch_mode: Literal["one", "first", "all"] = "first",
+            columns: list[ClauseElement] | None = None,
+            into: Type[M] | None = None,
+            **equals: Any,
+    ) -> T | list[T] | Row | list[Row] | M | list[M] | None:
+        """
+        按字段相等条件查询，用于按主键、邮箱、设置名等的热点查询
 
+        参数:
+            session: 异步数据库会话
+            fetch_mode: 获取模式 - "one"/"all"/"first"
+            columns: 同 `get`
+            into: 同 `get`
+            equals: 字段名与值，多个字段之间为 AND
+
+        返回:
+            根据fetch_mode返回相应的查询结果
+
+        同一签名的语句只构造一次并登记在 `statement_registry` 中，取值通过绑定参数传入；
+        重复调用既不在 Python 中重新构造语句，也不重新计算编译缓存的键，直接命中 SQLAlchemy 的编译缓存。
+
+        usage:
+        user = await User.get_by(session, email=email)
+        """
+        names = tuple(sorted(equals))
+        key = (cls, names, tuple(column.key for column in columns) if columns else None)
+
+        statement = statement_registry.get(key)
+        if statement is None:
+            statement = sa_select(*columns) if columns else select(cls)
+            statement = statement.where(*(getattr(cls, name) == bindparam(name) for name in names))
+            statement_registry[key] = statement
+
+        result = await session.exec(statement, params=equals)
+        return cls._fetch(result, fetch_mode, into)
+
+    @staticmethod
+    def _fetch(result, fetch_mode: str, into: Type[M] | None):
         if fetch_mode == "one":
-            return result.one()
+            row = result.one()
         elif fetch_mode == "first":
-            return result.first()
+            row = result.first()
         elif fetch_mode == "all":
-            return list(result.all())
+            rows = list(result.all())
+            if into is not None:
+                return [into.model_validate(row._mapping) for row in rows]
+            return rows
         else:
             raise ValueError(f"无效的 fetch_mode: {fetch_mode}")
 
+        if into is not None and row is not None:
+            return into.model_validate(row._mapping)
+        return row
+
     @classmethod
     async def get_exist_one(cls: Type[T], session: AsyncSession, id: int, load: Union[Relationship, None] = None) -> T:
         """此方法和 await session.get(cls, 主键)的区别就是当不存在时不返回None，
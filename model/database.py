@@ -1,14 +1,27 @@
 # ~/models/database.py
+import asyncio
+from collections import deque
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, Awaitable, Callable, TypeVar
 import os
 from dotenv import load_dotenv
+from loguru import logger
+from collections import Counter
+from sqlalchemy import event
+from sqlalchemy.engine import default as sa_default
 from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlmodel import SQLModel
+from sqlmodel import Session, SQLModel
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from pkg.batcher import PeriodicFlusher
+
+from .base import table_base
+from .base.table_base import statement_registry
 from .migration import migration
+from .setting import SettingsCache
+
+T = TypeVar("T")
 
 # 加载环境变量
 load_dotenv('.env')
@@ -18,20 +31,311 @@ DEBUG = os.getenv("DEBUG", "false").lower() in ("true", "1", "yes")
 
 ASYNC_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///data.db")
 
+_IS_SQLITE = ASYNC_DATABASE_URL.startswith("sqlite")
+
+SPLIT_READS = (
+    _IS_SQLITE
+    and ":memory:" not in ASYNC_DATABASE_URL
+    and os.getenv("DB_SPLIT_READS", "true").lower() in ("true", "1", "yes")
+)
+"""是否读写分离：SQLite 文件数据库默认只用一个写连接，查询走独立的只读连接池"""
+
 engine: AsyncEngine = create_async_engine(
     ASYNC_DATABASE_URL,
     echo=DEBUG,  # 根据 DEBUG 配置决定是否输出 SQL 日志
     connect_args={
         "check_same_thread": False
-    } if ASYNC_DATABASE_URL.startswith("sqlite") else {},
+    } if _IS_SQLITE else {},
     future=True,
+    query_cache_size=int(os.getenv("DB_QUERY_CACHE_SIZE", 500)),
+    # SQLite 同一时刻只允许一个写事务，写入全部排队使用同一个连接，而不是在数据库锁上竞争
+    **({"pool_size": 1, "max_overflow": 0} if SPLIT_READS else {}),
     # pool_size=POOL_SIZE,
     # max_overflow=64,
 )
+"""写引擎；不读写分离时同时用于查询"""
+
+read_engine: AsyncEngine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    echo=DEBUG,
+    connect_args={"check_same_thread": False},
+    future=True,
+    query_cache_size=int(os.getenv("DB_QUERY_CACHE_SIZE", 500)),
+    pool_size=int(os.getenv("DB_READ_POOL_SIZE", 8)),
+    max_overflow=0,
+) if SPLIT_READS else engine
+"""只读引擎，连接上开启了 query_only"""
+
+SQLITE_PROFILES: dict[str, dict[str, str]] = {
+    # 仅开启外键，其余保持 SQLite 默认值（回滚日志、synchronous=FULL）
+    "safe": {
+        "foreign_keys": "ON",
+    },
+    # WAL 下读写互不阻塞；synchronous=NORMAL 在 WAL 下断电只可能丢失最后提交的事务，不会损坏数据库
+    "production": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": "5000",
+        "cache_size": "-65536",
+        "mmap_size": "268435456",
+        "temp_store": "MEMORY",
+        "foreign_keys": "ON",
+    },
+}
+"""SQLite 连接配置，由 `SQLITE_PROFILE` 选择；单项可用 `SQLITE_<PRAGMA>` 环境变量覆盖，如 `SQLITE_BUSY_TIMEOUT=10000`"""
+
+SQLITE_PRAGMA_NAMES: tuple[str, ...] = tuple(
+    dict.fromkeys(name for pragmas in SQLITE_PROFILES.values() for name in pragmas)
+)
+"""可用 `SQLITE_<PRAGMA>` 环境变量设置的 PRAGMA，不在所选配置中的也会被加上"""
+
+
+def sqlite_pragmas(profile: str) -> dict[str, str]:
+    """
+    获取某个连接配置最终生效的 PRAGMA。
+
+    :param profile: 配置名，见 `SQLITE_PROFILES`
+    """
+    if profile not in SQLITE_PROFILES:
+        raise ValueError(f"Unknown SQLITE_PROFILE '{profile}', expected one of {', '.join(SQLITE_PROFILES)}")
+    pragmas = dict(SQLITE_PROFILES[profile])
+    for name in SQLITE_PRAGMA_NAMES:
+        value = os.getenv(f"SQLITE_{name.upper()}")
+        if value is not None:
+            pragmas[name] = value
+    return pragmas
+
+
+def apply_sqlite_pragmas(dbapi_connection, pragmas: dict[str, str]) -> None:
+    """
+    在一个新建立的 SQLite 连接上执行 PRAGMA。
+
+    :param dbapi_connection: DBAPI 连接
+    :param pragmas: PRAGMA 名称与值
+    """
+    cursor = dbapi_connection.cursor()
+    for name, value in pragmas.items():
+        cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
+
+
+SQLITE_PROFILE = os.getenv("SQLITE_PROFILE", "production")
+"""当前使用的 SQLite 连接配置名"""
+
+if _IS_SQLITE:
+    _sqlite_pragmas = sqlite_pragmas(SQLITE_PROFILE)
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _configure_sqlite_connection(dbapi_connection, connection_record):
+        """
+        PRAGMA 只对当前连接生效（journal_mode 除外），需要在连接池的每个新连接上执行；
+        其中 foreign_keys 必须开启，`ON DELETE` 规则才会生效。
+
+        同时关闭驱动自带的事务管理，改为由下面的 `begin` 事件显式开启事务，
+        否则驱动会打乱 SAVEPOINT，`Database.write` 无法按操作回滚。
+        """
+        apply_sqlite_pragmas(dbapi_connection, _sqlite_pragmas)
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def _begin_sqlite_transaction(conn):
+        # 读写分离时写连接上只有写事务，直接取得写锁，避免读锁升级为写锁时的 SQLITE_BUSY
+        conn.exec_driver_sql("BEGIN IMMEDIATE" if SPLIT_READS else "BEGIN")
+
+if SPLIT_READS:
+    @event.listens_for(read_engine.sync_engine, "connect")
+    def _configure_sqlite_read_connection(dbapi_connection, connection_record):
+        apply_sqlite_pragmas(dbapi_connection, {**_sqlite_pragmas, "query_only": "ON"})
+
+_compile_cache_counts: Counter = Counter()
+"""按 SQLAlchemy 编译缓存的命中情况（CACHE_HIT、CACHE_MISS 等）统计的语句执行次数"""
+
+
+def _count_compile_cache(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and context.compiled is not None:
+        _compile_cache_counts[context.cache_hit.name] += 1
+
+for _engine in {engine, read_engine}:
+    event.listen(_engine.sync_engine, "before_cursor_execute", _count_compile_cache)
+
+
+class RoutingSession(Session):
+    """
+    读写分离的同步会话，作为 `AsyncSession` 的底层会话使用。
+
+    - 查询（SELECT）走只读连接池，写入、DDL、PRAGMA 等其他语句都走写连接
+    - 当前事务用过写连接后，之后的查询也留在写连接上，以读到本事务尚未提交的修改
+    - `info={"writer": True}` 的会话始终使用写连接；先读后写、需要同一快照的逻辑应使用这种会话
+      （见 `Database.session_context(writer=True)`）或放入 `Database.write`
+    """
+
+    _writer_pinned = False
+
+    @property
+    def holds_writer(self) -> bool:
+        """当前事务是否已占用写连接"""
+        return self._writer_pinned
+
+    def get_bind(self, mapper=None, *, clause=None, **kw):
+        if (
+            read_engine is not engine
+            and getattr(clause, "is_select", False)
+            and not self._writer_pinned
+            and not self._flushing
+            and not self.info.get("writer")
+        ):
+            return read_engine.sync_engine
+        self._writer_pinned = True
+        return engine.sync_engine
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _unpin_writer(session: RoutingSession, transaction) -> None:
+    if transaction.parent is None:
+        session._writer_pinned = False
 
 _async_session_factory = sessionmaker(
-    engine, class_=AsyncSession, expire_on_commit=False
+    engine, class_=AsyncSession, sync_session_class=RoutingSession, expire_on_commit=False
+)
+
+
+class GroupCommitQueue(PeriodicFlusher):
+    """
+    写操作的组提交队列。
+
+    `submit` 把一个写操作放入队列并等待其结果；后台任务在同一个写会话中依次执行队列中
+    已有的操作，每个操作包在一个 SAVEPOINT 中，失败只回滚该操作，最后整批只提交一次。
+    写连接忙于上一批提交时到达的操作自然汇入下一批，写入越密集，每次提交分摊的操作越多。
+
+    操作内不得提交或回滚会话，只能执行语句或 `flush`。
+    """
+
+    def __init__(self, interval: float, max_batch: int) -> None:
+        """
+        :param interval: 没有新操作时后台任务的最长等待时间，单位秒
+        :param max_batch: 一次提交最多包含的操作数
+        """
+        super().__init__(interval)
+        self.max_batch = max_batch
+        self._pending: deque[tuple[Callable[[AsyncSession], Awaitable[Any]], asyncio.Future]] = deque()
+        self._inflight: asyncio.Future | None = None
+        self.commits = 0
+        self.operations = 0
+        self.failed = 0
+
+    async def submit(self, operation: Callable[[AsyncSession], Awaitable[T]]) -> T:
+        """
+        提交一个写操作并等待它随所在批次一起提交。
+
+        队列未启动时（如脚本、基准测试）直接在独立的会话中执行并提交。
+
+        :param operation: 接收会话的异步函数，其返回值作为本方法的返回值
+        :raises Exception: 操作本身抛出的异常，或整批提交失败时的异常
+        """
+        if self._task is None:
+            async with _async_session_factory(info={"writer": True}) as session:
+                result = await operation(session)
+                await session.commit()
+                return result
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((operation, future))
+        self.wake()
+        return await future
+
+    async def execute(self, session: AsyncSession, operation: Callable[[AsyncSession], Awaitable[T]]) -> T:
+        """
+        执行调用方会话上的一个写操作并提交，是 `TableBase` 各写入方法的提交入口。
+
+        调用方的会话没有未提交的修改、也没有占用写连接时，操作交给队列，与其他请求的写操作
+        合并为一次提交；否则操作依赖该会话的事务，只能在该会话中执行并直接提交。
+
+        :param session: 调用方的数据库会话
+        :param operation: 接收会话的异步函数，函数内不得提交或回滚
+        """
+        if (
+            self._task is None
+            or session.info.get("writer")
+            or session.sync_session.holds_writer
+            or session.new
+            or session.dirty
+            or session.deleted
+        ):
+            result = await operation(session)
+            await session.commit()
+            return result
+        return await self.submit(operation)
+
+    async def flush(self) -> None:
+        # 停止时后台任务可能在等待一批提交时被取消，先等这批提交完成，不与它并行开始新的一批
+        if self._inflight is not None and not self._inflight.done():
+            await asyncio.wait([self._inflight])
+
+        while self._pending:
+            batch = [self._pending.popleft() for _ in range(min(self.max_batch, len(self._pending)))]
+            # 已开始的提交不能被打断，否则无法确定这批操作是否已经写入
+            self._inflight = asyncio.ensure_future(self._commit(batch))
+            await asyncio.shield(self._inflight)
+
+    async def _commit(self, batch: list[tuple[Callable[[AsyncSession], Awaitable[Any]], asyncio.Future]]) -> None:
+        results: dict[asyncio.Future, tuple[Any, BaseException | None]] = {}
+        error: BaseException | None = None
+        committed = False
+
+        try:
+            async with _async_session_factory(info={"writer": True}) as session:
+                for operation, future in batch:
+                    if future.done():
+                        # 调用方已取消等待
+                        continue
+                    try:
+                        async with session.begin_nested():
+                            results[future] = (await operation(session), None)
+                    except (Exception, asyncio.CancelledError) as exc:
+                        # 本任务受 shield 保护不会被外部取消，这里的 CancelledError 只可能来自操作本身
+                        results[future] = (None, exc)
+                await session.commit()
+                committed = True
+        except Exception as exc:
+            error = exc
+            logger.exception(f"Group commit of {len(batch)} write operations failed")
+        finally:
+            # 无论以何种方式结束，都要让每个等待者得到结果，否则调用方会永远挂起
+            self.commits += 1
+            for _, future in batch:
+                result, exc = results.get(future, (None, None))
+                self.operations += 1
+                if not committed:
+                    exc = error or RuntimeError("Group commit was aborted")
+                if exc is not None:
+                    self.failed += 1
+                if future.done():
+                    continue
+                if exc is not None:
+                    future.set_exception(exc)
+                else:
+                    future.set_result(result)
+
+    def stats(self) -> dict[str, int | float]:
+        """
+        返回组提交的统计信息。
+        """
+        return {
+            "pending": len(self._pending),
+            "commits": self.commits,
+            "operations": self.operations,
+            "failed": self.failed,
+            "avg_batch": round(self.operations / self.commits, 2) if self.commits else 0.0,
+        }
+
+
+write_queue = GroupCommitQueue(
+    interval=float(os.getenv("DB_WRITE_QUEUE_INTERVAL", 1)),
+    max_batch=int(os.getenv("DB_WRITE_QUEUE_MAX_BATCH", 256)),
 )
+"""全局写操作组提交队列，在 `lifespan` 中启动与停止"""
+
+table_base.write_executor = write_queue.execute
 
 
 # 数据库类
@@ -51,23 +355,64 @@ class Database:
 
     @staticmethod
     @asynccontextmanager
-    async def session_context() -> AsyncGenerator[AsyncSession, None]:
+    async def session_context(writer: bool = False) -> AsyncGenerator[AsyncSession, None]:
         """
         提供异步上下文管理器用于直接获取数据库会话
+
+        :param writer: 所有语句都走写连接，用于先读后写、需要读写在同一事务快照中的场景
         
         使用示例:
         >>> async with Database.session_context() as session:
                 # 执行数据库操作
                 pass
         """
-        async with _async_session_factory() as session:
+        async with _async_session_factory(info={"writer": True} if writer else {}) as session:
             yield session
 
+    @staticmethod
+    async def write(operation: Callable[[AsyncSession], Awaitable[T]]) -> T:
+        """
+        通过组提交队列执行一个写操作，与同时到达的其他写操作合并为一次提交。
+
+        使用示例:
+        >>> async def mark(session):
+                await Item.update_where(session, Item.id == item_id, {"status": "lost"}, commit=False)
+        >>> await Database.write(mark)
+
+        :param operation: 接收会话的异步函数，函数内不得提交或回滚会话
+        """
+        return await write_queue.submit(operation)
+
+    @staticmethod
+    def statement_cache_stats() -> dict[str, int | float]:
+        """
+        返回编译缓存的命中统计，命中率下降说明出现了每次都不同、无法复用的语句。
+
+        SAVEPOINT、RELEASE、DDL 等没有缓存键的语句单独计为 `uncacheable`，其数量随写入量增长，
+        不计入命中率；`uncached` 为方言或配置不支持缓存的执行次数。
+        """
+        hits = _compile_cache_counts[sa_default.CACHE_HIT.name]
+        misses = _compile_cache_counts[sa_default.CACHE_MISS.name]
+        uncacheable = _compile_cache_counts[sa_default.NO_CACHE_KEY.name]
+        total = sum(_compile_cache_counts.values())
+        return {
+            "hits": hits,
+            "misses": misses,
+            "uncacheable": uncacheable,
+            "uncached": total - hits - misses - uncacheable,
+            "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            "registered_statements": len(statement_registry),
+        }
+
     async def init_db(self):
         """创建数据库结构"""
+        if _IS_SQLITE:
+            logger.info(f"SQLite connection profile: {SQLITE_PROFILE} {_sqlite_pragmas}, split reads: {SPLIT_READS}")
+
         async with engine.begin() as conn:
             await conn.run_sync(SQLModel.metadata.create_all)
 
         # For internal use, create a temporary context manager
         async with self.session_context() as session:
             await migration(session)  # 执行迁移脚本
+            await SettingsCache.reload(session)  # 预热设置快照
@@ -2,6 +2,7 @@ from datetime import datetime
 from enum import StrEnum
 from typing import TYPE_CHECKING, Optional
 from uuid import UUID
+from sqlalchemy import Index
 from sqlmodel import Field, Relationship
 
 from .base import SQLModelBase, UUIDTableBase
@@ -37,6 +38,12 @@ class ItemBase(SQLModelBase):
     """物品描述"""
 
 class Item(ItemBase, UUIDTableBase, table=True):
+    __table_args__ = (
+        # 物主物品列表的键集分页：WHERE user_id = ? AND (created_at, id) > (?, ?) ORDER BY created_at, id
+        # 只用于定位与排序，不是覆盖索引，其余列仍需按 rowid 回表读取
+        Index('ix_item_user_id_created_at_id', 'user_id', 'created_at', 'id'),
+    )
+
     expires_at: datetime | None = None
     """物品过期时间"""
 
@@ -72,6 +79,65 @@ class ItemDataResponse(ItemBase):
     lost_at: datetime | None = None
     """物品丢失的时间"""
 
+class ItemOwnerResponse(ItemBase):
+    id: UUID
+    """物品ID"""
+
+    find_ip: str | None = None
+    """最后一次发现的IP地址"""
+
+    created_at: datetime
+    """物品创建时间"""
+
+    expires_at: datetime | None = None
+    """物品过期时间"""
+
+    lost_at: datetime | None = None
+    """物品丢失的时间"""
+
+    parent_item_id: UUID | None = None
+    """父物品ID"""
+
+    scan_count: int = 0
+    """累计扫码次数"""
+
+    unique_finders: int = 0
+    """估算的不同扫码者数量"""
+
+class ItemPage(SQLModelBase):
+    items: list[ItemOwnerResponse]
+    """本页的物品"""
+
+    next_cursor: str | None = None
+    """下一页的游标，没有更多数据时为 None"""
+
+class ItemBatchResultEnum(StrEnum):
+    ok = 'ok'
+    not_found = 'not_found'
+    conflict = 'conflict'
+
+class ItemBatchRequest(SQLModelBase):
+    ids: list[UUID] = Field(min_length=1)
+    """物品ID列表"""
+
+class ItemBatchUpdateRequest(ItemBatchRequest):
+    patch: ItemDataUpdateRequest
+    """要应用到所有物品的修改，只包含需要修改的字段"""
+
+class ItemBatchResult(SQLModelBase):
+    id: UUID
+    """物品ID"""
+
+    result: ItemBatchResultEnum
+    """处理结果：成功、不存在（或无权访问）、仍有子物品而无法删除"""
+
+class ItemBatchGetResponse(SQLModelBase):
+    items: list[ItemOwnerResponse]
+    """找到的物品，顺序与请求一致"""
+
+    not_found: list[UUID]
+    """不存在或无权访问的物品ID"""
+
 class ItemDataResponseAdmin(ItemBase):
     expires_at: datetime | None = None
     """物品过期时间"""
@@ -1,35 +1,69 @@
 from loguru import logger
+from sqlmodel import SQLModel
 from .setting import Setting
 from .user import User, UserTypeEnum
 from pkg import Password
 
 default_settings: list[Setting] = [
-    Setting(type='string', name='version', value='2.0.0'),              # 版本号，用于考虑是否需要数据迁移
-    Setting(type='int', name='jwt_token_exp', value='30'),              # JWT Token 访问令牌
-    Setting(type='int', name='mentioned_channel', value='wechat_bot'),  # 通知推送通道
-    Setting(type='string', name='server_chan_key', value=''),           # Server 酱推送密钥
-    Setting(type='string', name='wechat_bot_key', value=''),            # 企业微信机器人推送密钥
+    Setting(type='string', name='version', value='2.0.0'),                 # 版本号，用于考虑是否需要数据迁移
+    Setting(type='int', name='jwt_token_exp', value='30'),                 # JWT Token 访问令牌
+    Setting(type='string', name='mentioned_channel', value='wechat_bot,server_chan,email'),  # 通知推送通道，多个用英文逗号分隔
+    Setting(type='string', name='server_chan_key', value=''),              # Server 酱推送密钥
+    Setting(type='string', name='wechat_bot_key', value=''),               # 企业微信机器人推送密钥
+    Setting(type='string', name='smtp_host', value=''),                    # SMTP 服务器地址
+    Setting(type='int', name='smtp_port', value='587'),                    # SMTP 端口
+    Setting(type='string', name='smtp_tls', value='starttls'),             # SMTP 加密方式：starttls / tls / none
+    Setting(type='string', name='smtp_username', value=''),                # SMTP 用户名
+    Setting(type='string', name='smtp_password', value=''),                # SMTP 密码
+    Setting(type='string', name='smtp_sender', value=''),                  # 发件人地址，留空使用用户名
+    Setting(type='string', name='smtp_recipient', value=''),               # 通知邮件的收件人
+    Setting(type='int', name='argon2_time_cost', value=''),                # Argon2 迭代次数，留空使用默认值
+    Setting(type='int', name='argon2_memory_cost', value=''),              # Argon2 内存开销(KiB)，留空使用默认值
+    Setting(type='int', name='argon2_parallelism', value=''),              # Argon2 并行度，留空使用默认值
+    Setting(type='int', name='notify_dedup_window', value='60'),           # 同一物品重复通知的合并窗口(秒)
+    Setting(type='int', name='lost_scan_digest_window', value='300'),      # 丢失物品扫码提醒的汇总窗口(秒)
 ]
 
+def _ensure_indexes(sync_session) -> None:
+    """
+    补建已有表上缺失的索引。
+
+    `create_all` 只为新建的表创建索引，升级后在已有表上新增的索引需要在这里补上。
+    """
+    connection = sync_session.connection()
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=connection, checkfirst=True)
+
 async def migration(session):
+    await session.run_sync(_ensure_indexes)
+    await session.commit()
+
     # 先准备基础配置
-    settings: list[Setting] = default_settings.copy()
+    settings: list[Setting] = [Setting(type=s.type, name=s.name, value=s.value) for s in default_settings]
 
-    if await Setting.get(session, Setting.name == 'version'):
-        # 已有数据，说明不是第一次运行，直接返回
-        return
-    
-    settings.append(Setting(type='string', name='SECRET_KEY', value=Password.generate(64)))
+    if not await Setting.get(session, Setting.name == 'version'):
+        # 第一次运行，生成 JWT 密钥
+        settings.append(Setting(type='string', name='SECRET_KEY', value=Password.generate(64)))
 
-    # 读取库里已存在的 name，避免主键冲突
+    # 读取库里已存在的 name，只补充缺失的设置项（升级后新增的设置项也会被写入）
     names = [s.name for s in settings]
     existed_settings = await Setting.get(
         session, 
-        Setting.name in names,
+        Setting.name.in_(names),
         fetch_mode='all'
     )
     existed: set[str] = {s.name for s in (existed_settings or [])}
 
+    # 已有设置项的类型随版本调整时（如 mentioned_channel 由 int 改为 string）同步更新，否则新值无法通过类型校验
+    default_types = {s.name: s.type for s in default_settings}
+    for setting in existed_settings or []:
+        expected = default_types.get(setting.name)
+        if expected is not None and setting.type != expected:
+            logger.info(f"Migrating setting '{setting.name}' type from '{setting.type}' to '{expected}'")
+            await Setting.update_where(session, Setting.name == setting.name, {"type": expected}, commit=False)
+    await session.commit()
+
     to_insert = [s for s in settings if s.name not in existed]
     if to_insert:
         await Setting.add(session, to_insert)
@@ -0,0 +1,49 @@
+from datetime import datetime
+from enum import StrEnum
+from uuid import UUID
+
+from sqlalchemy import Index
+from sqlmodel import Field
+
+from .base import SQLModelBase, TableBase
+from .base.table_base import now
+
+
+class OutboxStatusEnum(StrEnum):
+    pending = 'pending'
+    sent = 'sent'
+    failed = 'failed'
+
+class NotificationOutbox(SQLModelBase, TableBase, table=True):
+    """待投递的通知，由后台任务读取并发送"""
+
+    __table_args__ = (
+        Index('ix_notificationoutbox_status_next_attempt_at', 'status', 'next_attempt_at'),
+    )
+
+    dedup_key: str = Field(index=True)
+    """去重键，同一去重键在时间窗口内只投递一次"""
+
+    item_id: UUID | None = Field(default=None, foreign_key='item.id', ondelete='SET NULL')
+    """关联的物品ID"""
+
+    title: str
+    """通知标题"""
+
+    body: str
+    """通知正文（Markdown）"""
+
+    status: OutboxStatusEnum = OutboxStatusEnum.pending
+    """投递状态"""
+
+    attempts: int = 0
+    """已尝试投递的次数"""
+
+    next_attempt_at: datetime = Field(default_factory=now)
+    """下一次尝试投递的时间"""
+
+    last_error: str | None = None
+    """最近一次投递失败的原因"""
+
+    sent_at: datetime | None = None
+    """投递成功的时间"""
@@ -0,0 +1,44 @@
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import Index, LargeBinary
+from sqlmodel import Field
+
+from .base import SQLModelBase, TableBase
+
+
+class ScanEventBase(SQLModelBase):
+    ip: str | None = None
+    """扫码者的 IP 地址"""
+
+    user_agent: str | None = None
+    """扫码者的 User-Agent"""
+
+class ScanEvent(ScanEventBase, TableBase, table=True):
+    """物品被扫码的历史记录，`created_at` 为扫码发生的时间"""
+
+    __table_args__ = (
+        Index('ix_scanevent_item_id_created_at', 'item_id', 'created_at'),
+    )
+
+    item_id: UUID = Field(foreign_key='item.id', ondelete='CASCADE')
+    """被扫码的物品ID"""
+
+class ScanEventResponse(ScanEventBase):
+    created_at: datetime
+    """扫码时间"""
+
+class ItemScanStats(SQLModelBase, TableBase, table=True):
+    """物品的扫码统计，由后台任务定期合并写入"""
+
+    item_id: UUID = Field(foreign_key='item.id', ondelete='CASCADE', unique=True)
+    """物品ID"""
+
+    scan_count: int = 0
+    """累计扫码次数"""
+
+    unique_estimate: int = 0
+    """估算的不同扫码者数量，写入时根据 `sketch` 计算"""
+
+    sketch: bytes | None = Field(default=None, sa_type=LargeBinary)
+    """扫码者 IP 的 HyperLogLog 寄存器数据"""
@@ -1,6 +1,16 @@
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import ClassVar, Mapping
+
+from loguru import logger
 from sqlmodel import Field
+from sqlmodel.ext.asyncio.session import AsyncSession
+
 from .base import TableBase, SQLModelBase
 
+SettingValue = int | str | None
+"""设置项经过类型转换后的值"""
+
 
 class SettingBase(SQLModelBase):
     type: str = Field(index=True)
@@ -17,3 +27,133 @@ class Setting(SettingBase, TableBase, table=True):
 
 class SettingResponse(SettingBase):
     pass
+
+
+def coerce_setting_value(type_: str, value: str | None) -> SettingValue:
+    """
+    根据设置项的 `type` 列将数据库中的字符串值转换为对应的 Python 类型。
+
+    :param type_: 设置类型，目前支持 `int` 与 `string`
+    :param value: 数据库中存储的原始值
+    :return: 转换后的值
+    :raises ValueError: `int` 类型的值无法转换为整数时抛出
+    """
+    if type_ == 'int':
+        if value is None or value == '':
+            return None
+        return int(value)
+    return value
+
+
+@dataclass(frozen=True, slots=True)
+class SettingsSnapshot:
+    """
+    设置项的不可变快照。
+
+    快照在创建后不会再被修改，更新设置时会整体替换为新的版本，
+    因此读取方拿到的永远是一份内部一致的数据。
+    """
+
+    values: Mapping[str, SettingValue] = field(default_factory=lambda: MappingProxyType({}))
+    """设置名称到类型化值的只读映射"""
+
+    revision: int = 0
+    """快照版本号，每次替换递增"""
+
+    def get(self, name: str, default: SettingValue = None) -> SettingValue:
+        """
+        获取设置项的值，不存在时返回默认值。
+
+        :param name: 设置名称
+        :param default: 默认值
+        """
+        return self.values.get(name, default)
+
+    def __getitem__(self, name: str) -> SettingValue:
+        return self.values[name]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.values
+
+
+def _to_value(setting: Setting) -> SettingValue:
+    try:
+        return coerce_setting_value(setting.type, setting.value)
+    except ValueError:
+        logger.warning(
+            f"Setting '{setting.name}' is declared as '{setting.type}' "
+            f"but holds {setting.value!r}, falling back to the raw string"
+        )
+        return setting.value
+
+
+class SettingsCache:
+    """
+    进程内的设置快照缓存。
+
+    首次访问时从 `Setting` 表整体加载一次，之后热路径直接从内存读取，不再查询数据库。
+    通过 `services.admin.update_setting_value` 修改设置时会写穿并原子替换快照。
+
+    注意：缓存是进程级的，多进程部署时其他进程需要重启或调用 `reload` 才能看到变更。
+    """
+
+    _snapshot: ClassVar[SettingsSnapshot | None] = None
+
+    @classmethod
+    async def get(cls, session: AsyncSession) -> SettingsSnapshot:
+        """
+        获取当前的设置快照，尚未加载时从数据库加载。
+
+        :param session: 数据库会话，仅在首次加载时使用
+        :return: 当前设置快照
+        """
+        snapshot = cls._snapshot
+        if snapshot is None:
+            snapshot = await cls.reload(session)
+        return snapshot
+
+    @classmethod
+    async def reload(cls, session: AsyncSession) -> SettingsSnapshot:
+        """
+        从数据库重新加载全部设置并替换当前快照。
+
+        :param session: 数据库会话
+        :return: 新的设置快照
+        """
+        settings = await Setting.get(
+            session,
+            None,
+            fetch_mode='all',
+            columns=[Setting.type, Setting.name, Setting.value],
+        )
+        values = {s.name: _to_value(s) for s in settings}
+        return cls._swap(values)
+
+    @classmethod
+    def replace(cls, setting: Setting) -> SettingsSnapshot:
+        """
+        用一条已持久化的设置项生成新版本快照并原子替换。
+
+        :param setting: 已提交到数据库的设置项
+        :return: 新的设置快照
+        """
+        current = cls._snapshot
+        values = dict(current.values) if current is not None else {}
+        values[setting.name] = _to_value(setting)
+        return cls._swap(values)
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """丢弃当前快照，下一次访问时重新加载。"""
+        cls._snapshot = None
+
+    @classmethod
+    def _swap(cls, values: dict[str, SettingValue]) -> SettingsSnapshot:
+        current = cls._snapshot
+        snapshot = SettingsSnapshot(
+            values=MappingProxyType(values),
+            revision=(current.revision + 1) if current is not None else 1,
+        )
+        # 单次属性赋值是原子的，读取方要么看到旧快照，要么看到新快照
+        cls._snapshot = snapshot
+        return snapshot
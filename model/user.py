@@ -35,12 +35,15 @@ class User(UserBase, UUIDTableBase, table=True):
     role: UserTypeEnum = Field(default=UserTypeEnum.normal_user, index=True)
     """用户的权限等级"""
 
-    items: list[Item] = Relationship(back_populates='user', cascade_delete=True)
-    """物品关系"""
+    items: list[Item] = Relationship(back_populates='user', passive_deletes='all')
+    """物品关系，删除用户时由数据库的 ON DELETE CASCADE 删除物品，不加载到内存"""
 
     _initializing: ClassVar[bool] = False
     """标记当前是否处于初始化阶段，初始化阶段允许创建 super_admin"""
 
+    _set_based_writes: ClassVar[bool] = False
+    """用户的增删必须经过 `check_super_admin_immutability` 校验，不允许绕过 ORM 批量写入"""
+
 @event.listens_for(SessionClass, "before_flush")
 def check_super_admin_immutability(session, flush_context, instances):
     """
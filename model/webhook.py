@@ -0,0 +1,79 @@
+from datetime import datetime
+from enum import StrEnum
+from uuid import UUID
+
+from pydantic import HttpUrl
+from sqlmodel import Field
+
+from .base import SQLModelBase, UUIDTableBase
+
+
+class WebhookEventEnum(StrEnum):
+    scan = 'scan'
+    """物品被扫码"""
+
+    status_change = 'status_change'
+    """物品状态变化"""
+
+    notify = 'notify'
+    """请求通知物主（如挪车通知）"""
+
+class WebhookSubscriptionBase(SQLModelBase):
+    url: str
+    """接收事件的地址"""
+
+    enabled: bool = True
+    """是否启用"""
+
+class WebhookSubscription(WebhookSubscriptionBase, UUIDTableBase, table=True):
+    """用户注册的 Webhook，物品事件以签名后的 JSON POST 到 `url`"""
+
+    user_id: UUID = Field(foreign_key='user.id', ondelete='CASCADE', index=True)
+    """所属用户ID"""
+
+    events: str
+    """订阅的事件，多个用英文逗号分隔"""
+
+    secret: str
+    """HMAC-SHA256 签名密钥"""
+
+    @property
+    def event_set(self) -> frozenset[str]:
+        """订阅的事件集合"""
+        return frozenset(e for e in self.events.split(',') if e)
+
+class WebhookSubscriptionCreateRequest(SQLModelBase):
+    url: HttpUrl
+    """接收事件的地址"""
+
+    events: list[WebhookEventEnum] = list(WebhookEventEnum)
+    """订阅的事件，默认订阅全部"""
+
+    enabled: bool = True
+    """是否启用"""
+
+class WebhookSubscriptionUpdateRequest(SQLModelBase):
+    url: HttpUrl | None = None
+    """接收事件的地址"""
+
+    events: list[WebhookEventEnum] | None = None
+    """订阅的事件"""
+
+    enabled: bool | None = None
+    """是否启用"""
+
+class WebhookSubscriptionResponse(WebhookSubscriptionBase):
+    id: UUID
+    """Webhook ID"""
+
+    events: list[WebhookEventEnum]
+    """订阅的事件"""
+
+    created_at: datetime
+    """创建时间"""
+
+    secret: str | None = None
+    """签名密钥，仅在创建时返回"""
+
+    stats: dict | None = None
+    """本进程内的投递统计"""
@@ -0,0 +1,69 @@
+"""
+后台批量刷写工具
+
+为"先在内存中缓冲、再定期批量写入"的组件提供统一的生命周期管理。
+"""
+
+import asyncio
+from abc import ABC, abstractmethod
+
+from loguru import logger
+
+
+class PeriodicFlusher(ABC):
+    """
+    周期性后台刷写的基类。
+
+    子类实现 `flush`，在 FastAPI 的 `lifespan` 中调用 `start` 与 `stop`：
+    运行期间每隔 `interval` 秒（或被 `wake` 唤醒时）刷写一次，关闭时再做最后一次刷写。
+    """
+
+    def __init__(self, interval: float) -> None:
+        """
+        :param interval: 两次刷写之间的最长间隔，单位秒
+        """
+        self.interval = interval
+        self._task: asyncio.Task | None = None
+        self._wakeup: asyncio.Event | None = None
+
+    @abstractmethod
+    async def flush(self) -> None:
+        """将缓冲的数据写入数据库。"""
+
+    def wake(self) -> None:
+        """提前唤醒后台任务执行一次刷写。"""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def start(self) -> None:
+        """启动后台刷写任务。"""
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run(), name=type(self).__name__)
+
+    async def stop(self) -> None:
+        """停止后台刷写任务，并将剩余数据全部写入。"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            self._wakeup = None
+        await self._safe_flush()
+
+    async def _safe_flush(self) -> None:
+        try:
+            await self.flush()
+        except Exception:
+            logger.exception(f"{type(self).__name__} failed to flush")
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self._safe_flush()
@@ -0,0 +1,189 @@
+"""
+进程内缓存工具
+
+提供带过期时间（TTL）与容量上限（LRU 淘汰）的内存缓存，
+以及在此基础上合并并发加载（single-flight）的读穿缓存。
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """
+    带过期时间的 LRU 缓存。
+
+    - 超过 `maxsize` 时淘汰最久未使用的条目
+    - 条目在写入 `ttl` 秒后过期，过期条目在读取时惰性清除
+    - 记录命中、未命中与淘汰次数，便于观察缓存效果
+
+    缓存只在事件循环线程内使用，不做加锁处理。
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0) -> None:
+        """
+        :param maxsize: 最多缓存的条目数
+        :param ttl: 条目存活的秒数
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: K) -> V | None:
+        """
+        读取缓存，不存在或已过期时返回 None。
+
+        :param key: 缓存键
+        :return: 缓存值或 None
+        """
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        """
+        写入缓存。
+
+        :param key: 缓存键
+        :param value: 缓存值
+        """
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: K) -> None:
+        """
+        删除指定的缓存条目，不存在时忽略。
+
+        :param key: 缓存键
+        """
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """清空全部缓存条目。"""
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict[str, int | float]:
+        """
+        返回缓存的统计信息。
+
+        :return: 包含条目数、命中、未命中、淘汰次数与命中率的字典
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class _LoadCancelled(Exception):
+    """执行加载的调用方被取消，等待方应重试"""
+
+
+class LoadingCache(TTLCache[K, V]):
+    """
+    读穿缓存，并发未命中时只执行一次加载（single-flight）。
+
+    同一个键的多个并发未命中会等待同一次加载的结果，而不是各自访问数据库。
+    加载期间若该键被 `invalidate`，本次加载的结果只返回给已在等待的调用方，不会写入缓存。
+    加载结果为 None 时不缓存。执行加载的调用方被取消时，等待方不会被连带取消，而是由其中之一重新加载。
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0) -> None:
+        super().__init__(maxsize=maxsize, ttl=ttl)
+        self._inflight: dict[K, asyncio.Future[V | None]] = {}
+        self.loads = 0
+        self.coalesced = 0
+
+    async def get_or_load(self, key: K, loader: Callable[[], Awaitable[V | None]]) -> V | None:
+        """
+        读取缓存，未命中时调用 `loader` 加载并写入缓存。
+
+        :param key: 缓存键
+        :param loader: 无参的异步加载函数
+        :return: 缓存值或加载结果
+        """
+        while True:
+            value = self.get(key)
+            if value is not None:
+                return value
+
+            future = self._inflight.get(key)
+            if future is None:
+                break
+            self.coalesced += 1
+            try:
+                # shield 防止某个等待方被取消时连带取消共享的加载结果
+                return await asyncio.shield(future)
+            except _LoadCancelled:
+                # 执行加载的调用方被取消，由等待方之一用自己的 loader 重新加载
+                continue
+
+        future = asyncio.get_running_loop().create_future()
+        # 没有其他等待方时也要取走异常，避免 "exception was never retrieved" 警告
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[key] = future
+        self.loads += 1
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            # 不取消共享的结果，否则所有等待方都会随之被取消
+            future.set_exception(_LoadCancelled())
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            if self._inflight.get(key) is future and value is not None:
+                self.set(key, value)
+            future.set_result(value)
+            return value
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def invalidate(self, key: K) -> None:
+        """
+        删除缓存条目，并使进行中的加载结果不再写入缓存。
+
+        :param key: 缓存键
+        """
+        super().invalidate(key)
+        self._inflight.pop(key, None)
+
+    def clear(self) -> None:
+        super().clear()
+        self._inflight.clear()
+
+    def stats(self) -> dict[str, int | float]:
+        stats = super().stats()
+        stats.update(loads=self.loads, coalesced=self.coalesced, inflight=len(self._inflight))
+        return stats
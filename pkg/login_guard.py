@@ -0,0 +1,80 @@
+"""
+登录失败计数模块
+
+按账号与来源 IP 统计滑动窗口内的登录失败次数，超过阈值后直接拒绝，
+从而在撞库攻击时跳过昂贵的 Argon2 校验。
+"""
+
+import time
+from collections import OrderedDict, deque
+
+
+class FailureTracker:
+    """
+    滑动窗口内的失败次数统计。
+
+    - 每个键最多保留 `limit` 个失败时间戳，达到上限即视为被封禁，直到最早的记录滑出窗口
+    - 最多跟踪 `maxsize` 个键，超出时淘汰最久未活动的键
+
+    因此无论请求量多大，内存占用都不超过 `maxsize * limit` 个时间戳。
+    """
+
+    def __init__(self, limit: int, window: float, maxsize: int = 10000) -> None:
+        """
+        :param limit: 窗口内允许的最大失败次数
+        :param window: 滑动窗口长度，单位秒
+        :param maxsize: 最多跟踪的键数量
+        """
+        self.limit = limit
+        self.window = window
+        self.maxsize = maxsize
+        self._failures: OrderedDict[str, deque[float]] = OrderedDict()
+
+    def _prune(self, key: str, now: float) -> deque[float] | None:
+        failures = self._failures.get(key)
+        if failures is None:
+            return None
+
+        while failures and failures[0] <= now - self.window:
+            failures.popleft()
+        if not failures:
+            del self._failures[key]
+            return None
+        return failures
+
+    def is_blocked(self, key: str) -> bool:
+        """
+        判断该键是否已超过失败阈值。
+
+        :param key: 账号或 IP
+        :return: 是否应拒绝本次请求
+        """
+        failures = self._prune(key, time.monotonic())
+        return failures is not None and len(failures) >= self.limit
+
+    def record_failure(self, key: str) -> None:
+        """
+        记录一次失败。
+
+        :param key: 账号或 IP
+        """
+        now = time.monotonic()
+        failures = self._prune(key, now)
+        if failures is None:
+            failures = self._failures[key] = deque(maxlen=self.limit)
+        failures.append(now)
+        self._failures.move_to_end(key)
+
+        while len(self._failures) > self.maxsize:
+            self._failures.popitem(last=False)
+
+    def reset(self, key: str) -> None:
+        """
+        清除该键的失败记录，通常在登录成功后调用。
+
+        :param key: 账号或 IP
+        """
+        self._failures.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._failures)
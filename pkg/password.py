@@ -1,4 +1,9 @@
+import asyncio
+import os
 import secrets
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, NamedTuple, TypeVar
 from loguru import logger
 from argon2 import PasswordHasher
 from argon2.exceptions import VerifyMismatchError
@@ -6,6 +11,37 @@ from enum import StrEnum
 
 _ph = PasswordHasher()
 
+R = TypeVar("R")
+
+# Argon2 专用线程池，延迟到首次使用时创建，以便读取 .env 中的配置
+_executor: ThreadPoolExecutor | None = None
+_max_workers: int = 0
+_max_queue: int = 0
+_pending: int = 0
+
+# 用于未知账号的占位哈希，保证校验开销与真实账号一致
+_dummy_hash: str | None = None
+
+class PasswordPoolBusyError(RuntimeError):
+    """Argon2 线程池的排队数量已达上限"""
+
+class Argon2Cost(NamedTuple):
+    """Argon2 的成本参数"""
+
+    time_cost: int
+    """迭代次数"""
+
+    memory_cost: int
+    """内存开销，单位 KiB"""
+
+    parallelism: int
+    """并行度"""
+
+# 校准时的参数下限（OWASP 推荐的最低配置）与内存上限
+_MIN_TIME_COST = 2
+_MIN_MEMORY_COST = 19 * 1024
+_MAX_MEMORY_COST = 1024 * 1024
+
 class PasswordStatus(StrEnum):
     """密码校验状态枚举"""
 
@@ -18,6 +54,42 @@ class PasswordStatus(StrEnum):
     EXPIRED = "expired"
     """密码哈希已过时，建议重新哈希"""
 
+def _get_executor() -> ThreadPoolExecutor:
+    """
+    获取 Argon2 线程池。
+
+    - `ARGON2_MAX_WORKERS`: 同时进行哈希运算的线程数，默认为 CPU 核心数的一半（至少为 1）
+    - `ARGON2_MAX_QUEUE`: 允许排队等待的最大任务数，默认为 64
+    """
+    global _executor, _max_workers, _max_queue
+
+    if _executor is None:
+        _max_workers = int(os.getenv("ARGON2_MAX_WORKERS", max(1, (os.cpu_count() or 2) // 2)))
+        _max_queue = int(os.getenv("ARGON2_MAX_QUEUE", 64))
+        _executor = ThreadPoolExecutor(max_workers=_max_workers, thread_name_prefix="argon2")
+    return _executor
+
+async def _run_in_pool(func: Callable[..., R], *args) -> R:
+    """
+    在 Argon2 线程池中执行函数，超出并发与排队上限时立即拒绝。
+
+    argon2-cffi 在进行哈希运算时会释放 GIL，因此线程池即可让运算与事件循环并行，
+    登录请求过多时只会拖慢登录本身，不会阻塞其他接口。
+
+    :raises PasswordPoolBusyError: 排队任务数已达上限
+    """
+    global _pending
+
+    executor = _get_executor()
+    if _pending >= _max_workers + _max_queue:
+        raise PasswordPoolBusyError("Argon2 pool is saturated")
+
+    _pending += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(executor, func, *args)
+    finally:
+        _pending -= 1
+
 class Password:
     """密码处理工具类，包含密码生成、哈希和验证功能"""
 
@@ -77,3 +149,143 @@ class Password:
             # 这是预期的异常，当密码不匹配时触发。
             return PasswordStatus.INVALID
         # 其他异常（如哈希格式错误）应该传播，让调用方感知系统问题
+
+    @staticmethod
+    def verify_dummy(
+            password: str
+    ) -> PasswordStatus:
+        """
+        对一个占位哈希执行完整的 Argon2 校验，结果恒为失败。
+
+        用于账号不存在的情况，使其耗时与真实账号的校验一致，避免通过响应时间探测账号是否存在。
+        占位哈希使用当前的成本参数生成，并在参数变更后重新生成。
+
+        :param password: 用户本次提供的密码
+        :return: 恒为 `PasswordStatus.INVALID`
+        """
+        global _dummy_hash
+
+        if _dummy_hash is None:
+            _dummy_hash = _ph.hash(secrets.token_hex(16))
+        try:
+            _ph.verify(_dummy_hash, password)
+        except VerifyMismatchError:
+            pass
+        return PasswordStatus.INVALID
+
+    @staticmethod
+    def configure(
+            cost: Argon2Cost
+    ) -> None:
+        """
+        使用新的成本参数替换全局的 Argon2 哈希器。
+
+        之后用旧参数生成的哈希在校验时会返回 `PasswordStatus.EXPIRED`。
+
+        :param cost: Argon2 成本参数
+        """
+        global _ph, _dummy_hash
+
+        _dummy_hash = None
+        _ph = PasswordHasher(
+            time_cost=cost.time_cost,
+            memory_cost=cost.memory_cost,
+            parallelism=cost.parallelism,
+        )
+        logger.info(
+            f"Argon2 configured: time_cost={cost.time_cost}, "
+            f"memory_cost={cost.memory_cost} KiB, parallelism={cost.parallelism}"
+        )
+
+    @staticmethod
+    def current_cost() -> Argon2Cost:
+        """
+        获取当前全局哈希器使用的成本参数。
+
+        :return: Argon2 成本参数
+        """
+        return Argon2Cost(_ph.time_cost, _ph.memory_cost, _ph.parallelism)
+
+    @staticmethod
+    def calibrate(
+            budget_ms: float,
+            parallelism: int = 1
+    ) -> Argon2Cost:
+        """
+        在当前主机上测量哈希耗时，选出不超过延迟预算的最大成本参数。
+
+        先在 `time_cost` 为下限时逐步翻倍内存开销，再逐步增加迭代次数。
+        即使预算过低，也不会低于 OWASP 推荐的最低配置。
+
+        该方法会执行多次完整的哈希运算，耗时较长，只应在启动或运维时调用。
+
+        :param budget_ms: 单次哈希的目标耗时，单位毫秒
+        :param parallelism: 并行度
+        :return: 校准后的成本参数
+        """
+        def measure(time_cost: int, memory_cost: int) -> float:
+            hasher = PasswordHasher(time_cost=time_cost, memory_cost=memory_cost, parallelism=parallelism)
+            best = float("inf")
+            for _ in range(3):
+                start = time.perf_counter()
+                hasher.hash("findreve-calibration")
+                best = min(best, (time.perf_counter() - start) * 1000)
+            return best
+
+        time_cost, memory_cost = _MIN_TIME_COST, _MIN_MEMORY_COST
+        while memory_cost * 2 <= _MAX_MEMORY_COST and measure(time_cost, memory_cost * 2) <= budget_ms:
+            memory_cost *= 2
+        while measure(time_cost + 1, memory_cost) <= budget_ms:
+            time_cost += 1
+
+        return Argon2Cost(time_cost, memory_cost, parallelism)
+
+    @staticmethod
+    async def hash_async(
+            password: str
+    ) -> str:
+        """
+        在线程池中异步生成密码的 Argon2 哈希值，不阻塞事件循环。
+
+        :param password: 需要哈希的原始密码
+        :return: Argon2 哈希字符串
+        :raises PasswordPoolBusyError: 线程池排队已满
+        """
+        return await _run_in_pool(Password.hash, password)
+
+    @staticmethod
+    async def verify_async(
+            hash: str,
+            password: str
+    ) -> PasswordStatus:
+        """
+        在线程池中异步验证密码，不阻塞事件循环。
+
+        :param hash: 数据库中存储的 Argon2 哈希字符串
+        :param password: 用户本次提供的密码
+        :return: 密码校验状态
+        :raises PasswordPoolBusyError: 线程池排队已满
+        """
+        return await _run_in_pool(Password.verify, hash, password)
+
+    @staticmethod
+    async def verify_dummy_async(
+            password: str
+    ) -> PasswordStatus:
+        """
+        在线程池中执行占位校验，参见 `verify_dummy`。
+
+        :param password: 用户本次提供的密码
+        :return: 恒为 `PasswordStatus.INVALID`
+        :raises PasswordPoolBusyError: 线程池排队已满
+        """
+        return await _run_in_pool(Password.verify_dummy, password)
+
+    @staticmethod
+    def shutdown() -> None:
+        """关闭 Argon2 线程池，等待正在执行的任务完成。"""
+        global _executor
+
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+            _executor = None
@@ -0,0 +1,167 @@
+"""
+进程内发布/订阅
+
+为 SSE 等长连接推送提供按主题分发的消息中心，每个订阅者都有独立的有界缓冲区。
+"""
+
+import asyncio
+from typing import Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+M = TypeVar("M")
+
+
+class SubscriberOverflow(Exception):
+    """订阅者消费过慢，缓冲区已满而被断开"""
+
+
+class Subscription(Generic[K, M]):
+    """
+    一个订阅者。
+
+    空闲的订阅者只占用一个空队列，不持有任何任务或数据库连接。
+    """
+
+    __slots__ = ("topic", "_queue", "_overflowed")
+
+    def __init__(self, topic: K, maxsize: int) -> None:
+        self.topic = topic
+        self._queue: asyncio.Queue[M] = asyncio.Queue(maxsize)
+        self._overflowed = False
+
+    def _offer(self, message: M) -> bool:
+        if self._overflowed:
+            return False
+        try:
+            self._queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # 缓冲区已满说明消费者没有在等待，它在下一次 get 时会发现自己已被断开
+            self._overflowed = True
+            return False
+        return True
+
+    async def get(self, timeout: float) -> M | None:
+        """
+        等待下一条消息。
+
+        :param timeout: 最长等待时间，单位秒
+        :return: 消息；超时返回 None，调用方可借此发送心跳
+        :raises SubscriberOverflow: 缓冲区溢出，订阅已失效
+        """
+        if self._overflowed:
+            raise SubscriberOverflow
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class PubSubHub(Generic[K, M]):
+    """
+    按主题分发消息的发布/订阅中心。
+
+    - `publish` 不等待任何订阅者，直接把消息放入各订阅者的缓冲区
+    - 订阅者的缓冲区满时判定其消费过慢并断开，不会拖慢发布方或其他订阅者
+    - 订阅者总数与单个主题的订阅者数都有上限
+
+    只在事件循环线程内使用，不做加锁处理。
+    """
+
+    def __init__(self, buffer_size: int, max_subscribers: int, max_per_topic: int) -> None:
+        """
+        :param buffer_size: 每个订阅者最多缓存的消息数
+        :param max_subscribers: 订阅者总数上限
+        :param max_per_topic: 单个主题的订阅者数上限
+        """
+        self.buffer_size = buffer_size
+        self.max_subscribers = max_subscribers
+        self.max_per_topic = max_per_topic
+        self._topics: dict[K, set[Subscription[K, M]]] = {}
+        self._count = 0
+        self.published = 0
+        self.delivered = 0
+        self.overflowed = 0
+        self.rejected = 0
+
+    def can_subscribe(self, topic: K) -> bool:
+        """
+        判断主题当前是否还能接受新的订阅者。
+
+        :param topic: 主题
+        """
+        subscribers = self._topics.get(topic)
+        return self._count < self.max_subscribers and not (subscribers and len(subscribers) >= self.max_per_topic)
+
+    def subscribe(self, topic: K) -> Subscription[K, M] | None:
+        """
+        订阅一个主题。
+
+        :param topic: 主题
+        :return: 订阅者；超过订阅数上限时返回 None
+        """
+        if not self.can_subscribe(topic):
+            self.rejected += 1
+            return None
+
+        subscription: Subscription[K, M] = Subscription(topic, self.buffer_size)
+        self._topics.setdefault(topic, set()).add(subscription)
+        self._count += 1
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription[K, M]) -> None:
+        """
+        取消订阅，可重复调用。
+
+        :param subscription: 订阅者
+        """
+        subscribers = self._topics.get(subscription.topic)
+        if subscribers is None or subscription not in subscribers:
+            return
+        subscribers.discard(subscription)
+        self._count -= 1
+        if not subscribers:
+            del self._topics[subscription.topic]
+
+    def has_subscribers(self, topic: K) -> bool:
+        """
+        判断主题是否有订阅者，发布方可借此跳过消息的构造。
+
+        :param topic: 主题
+        """
+        return topic in self._topics
+
+    def publish(self, topic: K, message: M) -> int:
+        """
+        向一个主题发布消息。
+
+        :param topic: 主题
+        :param message: 消息
+        :return: 收到消息的订阅者数
+        """
+        subscribers = self._topics.get(topic)
+        if not subscribers:
+            return 0
+
+        self.published += 1
+        received = 0
+        for subscription in list(subscribers):
+            if subscription._offer(message):
+                received += 1
+            else:
+                self.overflowed += 1
+                self.unsubscribe(subscription)
+        self.delivered += received
+        return received
+
+    def stats(self) -> dict[str, int]:
+        """
+        返回订阅与分发的统计信息。
+        """
+        return {
+            "subscribers": self._count,
+            "topics": len(self._topics),
+            "published": self.published,
+            "delivered": self.delivered,
+            "overflowed": self.overflowed,
+            "rejected": self.rejected,
+        }
@@ -1,2 +1,4 @@
 from .wechat_bot import WeChatBot
-from .server_chan import ServerChatBot
\ No newline at end of file
+from .server_chan import ServerChatBot
+from .http import HttpClient
+from .smtp import EmailSender
@@ -0,0 +1,298 @@
+import asyncio
+import math
+import os
+import time
+from enum import StrEnum
+from typing import Awaitable, Callable
+
+from loguru import logger
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from .server_chan import ServerChatBot
+from .smtp import EmailSender
+from .wechat_bot import WeChatBot
+
+ChannelSender = Callable[[AsyncSession, str, str], Awaitable[None]]
+"""推送通道的发送函数，参数为 (数据库会话, 标题, Markdown 正文)"""
+
+ChannelBatchSender = Callable[[AsyncSession, list[tuple[str, str]]], Awaitable[list[bool]]]
+"""推送通道的批量发送函数，参数为 (数据库会话, [(标题, Markdown 正文)])，返回每条通知是否发送成功"""
+
+
+class CircuitStateEnum(StrEnum):
+    closed = 'closed'
+    """正常放行"""
+
+    open = 'open'
+    """熔断中，直接跳过"""
+
+    half_open = 'half_open'
+    """熔断冷却结束，放行一次试探请求"""
+
+
+class CircuitBreaker:
+    """
+    推送通道的熔断器。
+
+    连续失败达到 `failure_threshold` 次后熔断，`reset_timeout` 秒内直接跳过该通道；
+    冷却结束后放行一次试探请求，成功则恢复，失败则重新熔断。
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float) -> None:
+        """
+        :param name: 通道名称，用于日志
+        :param failure_threshold: 触发熔断的连续失败次数
+        :param reset_timeout: 熔断的持续时间，单位秒
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CircuitStateEnum.closed
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+
+    def allow(self) -> bool:
+        """
+        判断本次是否允许调用该通道。
+        """
+        if self.state == CircuitStateEnum.closed:
+            return True
+        if self.state == CircuitStateEnum.open and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = CircuitStateEnum.half_open
+            return True
+        # 半开状态下已有试探请求在进行，其余请求继续跳过
+        return False
+
+    def record_success(self) -> None:
+        """记录一次成功，恢复为正常状态。"""
+        self.state = CircuitStateEnum.closed
+        self.consecutive_failures = 0
+
+    def record_failure(self) -> None:
+        """记录一次失败，达到阈值或试探失败时熔断。"""
+        self.consecutive_failures += 1
+        if self.state == CircuitStateEnum.half_open or self.consecutive_failures >= self.failure_threshold:
+            if self.state != CircuitStateEnum.open:
+                logger.warning(f"Circuit of channel '{self.name}' opened after {self.consecutive_failures} consecutive failures")
+            self.state = CircuitStateEnum.open
+            self.opened_at = time.monotonic()
+
+
+class ChannelStats:
+    """单个推送通道的投递统计"""
+
+    def __init__(self) -> None:
+        self.sent = 0
+        self.failed = 0
+        self.timeouts = 0
+        self.skipped = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.last_error: str | None = None
+
+    def observe(self, latency: float) -> None:
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+
+    def as_dict(self) -> dict[str, int | float | str | None]:
+        attempts = self.sent + self.failed
+        return {
+            "sent": self.sent,
+            "failed": self.failed,
+            "timeouts": self.timeouts,
+            "skipped": self.skipped,
+            "avg_latency_ms": round(self.total_latency / attempts * 1000, 2) if attempts else 0.0,
+            "max_latency_ms": round(self.max_latency * 1000, 2),
+            "last_error": self.last_error,
+        }
+
+
+class NotificationDispatcher:
+    """
+    通知分发器。
+
+    将一条通知并发发送到所有指定的通道，每个通道都有独立的超时时间与熔断器，
+    某个通道缓慢或不可用时不会拖慢其他通道。注册了批量发送函数的通道可以一次发送多条通知。
+    """
+
+    def __init__(self, timeout: float, failure_threshold: int, reset_timeout: float) -> None:
+        """
+        :param timeout: 单个通道的发送期限，单位秒
+        :param failure_threshold: 触发熔断的连续失败次数
+        :param reset_timeout: 熔断的持续时间，单位秒
+        """
+        self.timeout = timeout
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._channels: dict[str, ChannelSender] = {}
+        self._batch_senders: dict[str, ChannelBatchSender] = {}
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._stats: dict[str, ChannelStats] = {}
+
+    def register(self, name: str, sender: ChannelSender, batch_sender: ChannelBatchSender | None = None) -> None:
+        """
+        注册一个推送通道。
+
+        :param name: 通道名称
+        :param sender: 发送函数
+        :param batch_sender: 批量发送函数，通道能在一次调用中发送多条通知时提供
+        """
+        self._channels[name] = sender
+        if batch_sender is not None:
+            self._batch_senders[name] = batch_sender
+        self._breakers[name] = CircuitBreaker(name, self.failure_threshold, self.reset_timeout)
+        self._stats[name] = ChannelStats()
+
+    @property
+    def channels(self) -> list[str]:
+        """已注册的通道名称"""
+        return list(self._channels)
+
+    async def dispatch(
+        self,
+        session: AsyncSession,
+        title: str,
+        body: str,
+        channels: list[str],
+    ) -> dict[str, bool]:
+        """
+        并发发送到指定的通道。
+
+        :param session: 数据库会话
+        :param title: 通知标题
+        :param body: 通知正文（Markdown）
+        :param channels: 需要发送的通道名称
+        :return: 通道名称到是否发送成功的映射，被熔断跳过的通道记为 False
+        """
+        names = [name for name in channels if name in self._channels]
+        results = await asyncio.gather(
+            *(
+                self._send(name, lambda name=name: self._channels[name](session, title, body), self.timeout)
+                for name in names
+            )
+        )
+        return {name: sent[0] for name, sent in zip(names, results)}
+
+    async def dispatch_batch(
+        self,
+        session: AsyncSession,
+        messages: list[tuple[str, str]],
+        channels: list[str],
+        budget: float | None = None,
+    ) -> list[dict[str, bool]]:
+        """
+        将多条通知并发发送到指定的通道。
+
+        注册了批量发送函数的通道按批发送，每批的期限按通知条数放宽；其他通道逐条发送。
+        给出 `budget` 时每个通道的总耗时不超过它：批的大小与每次发送的期限都受剩余时间限制，
+        时间用完后尚未发送的通知记为失败并计入 `skipped`，由调用方稍后重试。
+
+        :param session: 数据库会话
+        :param messages: (标题, Markdown 正文) 列表
+        :param channels: 需要发送的通道名称
+        :param budget: 每个通道的总时间上限，单位秒
+        :return: 与 `messages` 一一对应的通道名称到是否发送成功的映射
+        """
+        names = [name for name in channels if name in self._channels]
+        loop = asyncio.get_running_loop()
+        deadline = None if budget is None else loop.time() + budget
+
+        async def send_all(name: str) -> list[bool]:
+            batch_sender = self._batch_senders.get(name)
+            sender = self._channels[name]
+            sent: list[bool] = []
+            while len(sent) < len(messages):
+                left = math.inf if deadline is None else deadline - loop.time()
+                if left <= 0:
+                    self._stats[name].skipped += len(messages) - len(sent)
+                    sent += [False] * (len(messages) - len(sent))
+                    break
+
+                if batch_sender is not None:
+                    size = len(messages) - len(sent)
+                    if deadline is not None:
+                        # 每条通知保留一个通道期限，整批的期限不超过剩余时间
+                        size = max(1, min(size, int(left // self.timeout)))
+                    chunk = messages[len(sent):len(sent) + size]
+                    sent += await self._send(
+                        name, lambda: batch_sender(session, chunk), min(self.timeout * size, left), size
+                    )
+                else:
+                    title, body = messages[len(sent)]
+                    sent += await self._send(name, lambda: sender(session, title, body), min(self.timeout, left))
+            return sent
+
+        results = await asyncio.gather(*(send_all(name) for name in names))
+        return [{name: sent[index] for name, sent in zip(names, results)} for index in range(len(messages))]
+
+    async def _send(
+        self,
+        name: str,
+        send: Callable[[], Awaitable[list[bool] | None]],
+        timeout: float,
+        count: int = 1,
+    ) -> list[bool]:
+        breaker, stats = self._breakers[name], self._stats[name]
+        if not breaker.allow():
+            stats.skipped += count
+            return [False] * count
+
+        start = time.perf_counter()
+        try:
+            async with asyncio.timeout(timeout):
+                # 批量发送函数返回每条通知的结果，单条发送函数不抛出异常即为成功
+                sent = await send() or [True] * count
+        except Exception as exc:  # noqa: BLE001
+            stats.observe(time.perf_counter() - start)
+            stats.failed += count
+            if isinstance(exc, TimeoutError):
+                stats.timeouts += 1
+                stats.last_error = f"Timed out after {timeout:.1f}s"
+            else:
+                stats.last_error = str(getattr(exc, "detail", exc))[:200]
+            breaker.record_failure()
+            logger.warning(f"Notification channel '{name}' failed: {stats.last_error}")
+            return [False] * count
+
+        stats.observe(time.perf_counter() - start)
+        stats.sent += sum(sent)
+        stats.failed += count - sum(sent)
+        if not all(sent):
+            stats.last_error = f"{count - sum(sent)} of {count} notifications were rejected"
+            logger.warning(f"Notification channel '{name}' rejected {count - sum(sent)} of {count} notifications")
+        breaker.record_success()
+        return sent
+
+    def stats(self) -> dict[str, dict]:
+        """
+        返回各通道的熔断状态与投递统计。
+        """
+        return {
+            name: {"circuit": self._breakers[name].state, **self._stats[name].as_dict()}
+            for name in self._channels
+        }
+
+
+async def _send_wechat_bot(session: AsyncSession, title: str, body: str) -> None:
+    await WeChatBot.send_markdown(session=session, markdown=f"# {title}\n\n{body}", version="v1")
+
+async def _send_server_chan(session: AsyncSession, title: str, body: str) -> None:
+    await ServerChatBot.send_text(session=session, title=title, description=body)
+
+async def _send_email(session: AsyncSession, title: str, body: str) -> None:
+    await EmailSender.send_text(session=session, title=title, description=body)
+
+async def _send_email_batch(session: AsyncSession, messages: list[tuple[str, str]]) -> list[bool]:
+    return await EmailSender.send_batch(session=session, messages=messages)
+
+
+dispatcher = NotificationDispatcher(
+    timeout=float(os.getenv("NOTIFY_CHANNEL_TIMEOUT", 5)),
+    failure_threshold=int(os.getenv("NOTIFY_BREAKER_THRESHOLD", 5)),
+    reset_timeout=float(os.getenv("NOTIFY_BREAKER_RESET", 60)),
+)
+"""全局通知分发器"""
+
+dispatcher.register("wechat_bot", _send_wechat_bot)
+dispatcher.register("server_chan", _send_server_chan)
+dispatcher.register("email", _send_email, _send_email_batch)
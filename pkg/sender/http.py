@@ -0,0 +1,64 @@
+import os
+from typing import ClassVar
+
+import aiohttp
+from loguru import logger
+
+
+class HttpClient:
+    """
+    应用级共享的 aiohttp 客户端。
+
+    在 FastAPI 的 `lifespan` 中创建并在关闭时释放，所有推送通道复用同一个连接池，
+    避免每条消息都重新建立连接、解析 DNS 与进行 TLS 握手。
+
+    可通过环境变量调整：
+
+    - `HTTP_MAX_CONNECTIONS`: 连接池总连接数上限，默认 100
+    - `HTTP_MAX_CONNECTIONS_PER_HOST`: 每个主机的连接数上限，默认 10
+    - `HTTP_KEEPALIVE_TIMEOUT`: 空闲连接保活时间（秒），默认 30
+    - `HTTP_DNS_CACHE_TTL`: DNS 缓存时间（秒），默认 300
+    - `HTTP_CONNECT_TIMEOUT`: 建立连接的超时时间（秒），默认 5
+    - `HTTP_READ_TIMEOUT`: 读取响应的超时时间（秒），默认 10
+    """
+
+    _session: ClassVar[aiohttp.ClientSession | None] = None
+
+    @classmethod
+    async def start(cls) -> aiohttp.ClientSession:
+        """
+        创建共享客户端，已创建时直接返回。
+        """
+        if cls._session is None or cls._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=int(os.getenv("HTTP_MAX_CONNECTIONS", 100)),
+                limit_per_host=int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", 10)),
+                keepalive_timeout=float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", 30)),
+                ttl_dns_cache=int(os.getenv("HTTP_DNS_CACHE_TTL", 300)),
+            )
+            timeout = aiohttp.ClientTimeout(
+                connect=float(os.getenv("HTTP_CONNECT_TIMEOUT", 5)),
+                sock_read=float(os.getenv("HTTP_READ_TIMEOUT", 10)),
+            )
+            cls._session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+            logger.debug("Shared HTTP client started")
+        return cls._session
+
+    @classmethod
+    async def get(cls) -> aiohttp.ClientSession:
+        """
+        获取共享客户端。
+
+        正常情况下客户端已在 `lifespan` 中创建；在脚本等场景中首次调用时会自动创建。
+        """
+        if cls._session is None or cls._session.closed:
+            return await cls.start()
+        return cls._session
+
+    @classmethod
+    async def close(cls) -> None:
+        """关闭共享客户端并释放所有连接。"""
+        if cls._session is not None:
+            await cls._session.close()
+            cls._session = None
+            logger.debug("Shared HTTP client closed")
@@ -1,18 +1,18 @@
 from typing import Literal
 from loguru import logger
-from model import Setting
+from model import SettingsCache
 from sqlmodel.ext.asyncio.session import AsyncSession
 from pkg.utils import raise_internal_error, raise_service_unavailable
-import aiohttp
+from .http import HttpClient
 
 class ServerChatBot:
     async def get_url(session: AsyncSession):
-        server_chan_key = await Setting.get(session, Setting.name == "server_chan_key")
+        server_chan_key = (await SettingsCache.get(session)).get("server_chan_key")
     
-        if not server_chan_key.value:
+        if not server_chan_key:
             raise_internal_error("Server酱未配置，请联系管理员")
         
-        url = f"https://sctapi.ftqq.com/{server_chan_key.value}.send"
+        url = f"https://sctapi.ftqq.com/{server_chan_key}.send"
         return url
     
     async def send_text(
@@ -27,16 +27,16 @@ class ServerChatBot:
             title (str): 需要发送的标题
             description (str): 需要发送的文本消息
         """
-        async with aiohttp.ClientSession() as http_session:
-            async with http_session.post(
-                url=await ServerChatBot.get_url(session),
-                data={
-                    "title": title,
-                    "desp": description
-                }
-            ) as response:
-                if response.status != 200:
-                    logger.error(f"Failed to send to Server Chan: {response.status}")
-                    raise_internal_error("Server酱服务不可用，请稍后再试")
-                else:
-                   logger.info("Server Chan message sent successfully")
\ No newline at end of file
+        http_session = await HttpClient.get()
+        async with http_session.post(
+            url=await ServerChatBot.get_url(session),
+            data={
+                "title": title,
+                "desp": description
+            }
+        ) as response:
+            if response.status != 200:
+                logger.error(f"Failed to send to Server Chan: {response.status}")
+                raise_internal_error("Server酱服务不可用，请稍后再试")
+            else:
+               logger.info("Server Chan message sent successfully")
\ No newline at end of file
@@ -0,0 +1,243 @@
+import asyncio
+import os
+import time
+from email.message import EmailMessage
+from typing import NamedTuple
+
+import aiosmtplib
+from loguru import logger
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from model import SettingsCache
+from pkg.utils import raise_internal_error, raise_service_unavailable
+
+
+class SMTPConfig(NamedTuple):
+    """SMTP 连接参数，来自 `smtp_*` 设置项"""
+
+    host: str
+    port: int
+    username: str | None
+    password: str | None
+    tls: str
+    """加密方式：`starttls`、`tls` 或 `none`"""
+
+
+class SMTPPool:
+    """
+    已登录的 SMTP 连接池。
+
+    连接在发送后放回池中复用，避免每封邮件都重新进行 TCP 连接、TLS 握手与登录。
+    池中连接空闲超过 `idle_timeout` 秒后在下次取出时先发送 NOOP 探活，失效则重建；
+    SMTP 设置变更后旧连接会被全部关闭。
+
+    可通过环境变量调整：
+
+    - `SMTP_POOL_SIZE`: 最多同时打开的连接数，默认 2
+    - `SMTP_IDLE_TIMEOUT`: 连接空闲多久后需要探活（秒），默认 30
+    - `SMTP_TIMEOUT`: 连接与单条命令的超时时间（秒），默认 10
+    """
+
+    def __init__(self, size: int, idle_timeout: float, timeout: float) -> None:
+        """
+        :param size: 最多同时打开的连接数
+        :param idle_timeout: 连接空闲多久后需要探活，单位秒
+        :param timeout: 连接与单条命令的超时时间，单位秒
+        """
+        self.size = size
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self._config: SMTPConfig | None = None
+        self._idle: list[tuple[float, aiosmtplib.SMTP]] = []
+        self._slots: asyncio.Semaphore | None = None
+        self.connects = 0
+        self.reuses = 0
+        self.sent = 0
+
+    async def _connect(self, config: SMTPConfig) -> aiosmtplib.SMTP:
+        client = aiosmtplib.SMTP(
+            hostname=config.host,
+            port=config.port,
+            use_tls=config.tls == "tls",
+            start_tls=config.tls == "starttls",
+            timeout=self.timeout,
+        )
+        await client.connect()
+        if config.username:
+            await client.login(config.username, config.password or "")
+        self.connects += 1
+        return client
+
+    async def _acquire(self, config: SMTPConfig) -> aiosmtplib.SMTP:
+        if config != self._config:
+            # 设置已变更，旧连接不再可用
+            await self.close()
+            self._config = config
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.size)
+
+        await self._slots.acquire()
+        try:
+            while self._idle:
+                idle_since, client = self._idle.pop()
+                if not client.is_connected:
+                    continue
+                if time.monotonic() - idle_since > self.idle_timeout:
+                    try:
+                        await client.noop()
+                    except aiosmtplib.SMTPException:
+                        client.close()
+                        continue
+                self.reuses += 1
+                return client
+            return await self._connect(config)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def _release(self, config: SMTPConfig, client: aiosmtplib.SMTP, reusable: bool) -> None:
+        if reusable and client.is_connected and config == self._config:
+            self._idle.append((time.monotonic(), client))
+        else:
+            client.close()
+        self._slots.release()
+
+    async def send(self, config: SMTPConfig, messages: list[EmailMessage]) -> list[Exception | None]:
+        """
+        通过同一个连接依次发送多封邮件。
+
+        服务器拒收某一封邮件时记录该邮件的错误并继续发送其余邮件；连接中断时其余邮件都记为失败，
+        出错的连接会被丢弃。
+
+        :param config: SMTP 连接参数
+        :param messages: 待发送的邮件
+        :return: 与 `messages` 一一对应的错误，发送成功时为 None
+        :raises aiosmtplib.SMTPException: 建立连接或登录失败时抛出
+        """
+        client = await self._acquire(config)
+        results: list[Exception | None] = []
+        reusable = False
+        try:
+            for message in messages:
+                try:
+                    await client.send_message(message)
+                except (aiosmtplib.SMTPResponseException, aiosmtplib.SMTPRecipientsRefused) as exc:
+                    results.append(exc)
+                    if not client.is_connected:
+                        raise
+                    continue
+                results.append(None)
+                self.sent += 1
+            reusable = True
+        except (aiosmtplib.SMTPException, OSError) as exc:
+            # 已经发出的邮件保持成功，其余邮件都记为这次的错误
+            results += [exc] * (len(messages) - len(results))
+        finally:
+            self._release(config, client, reusable)
+        return results
+
+    async def close(self) -> None:
+        """关闭所有空闲连接。"""
+        idle, self._idle = self._idle, []
+        for _, client in idle:
+            try:
+                await client.quit()
+            except (aiosmtplib.SMTPException, OSError):
+                client.close()
+
+    def stats(self) -> dict[str, int]:
+        """
+        返回连接池的统计信息。
+        """
+        return {
+            "idle": len(self._idle),
+            "connects": self.connects,
+            "reuses": self.reuses,
+            "sent": self.sent,
+        }
+
+
+smtp_pool = SMTPPool(
+    size=int(os.getenv("SMTP_POOL_SIZE", 2)),
+    idle_timeout=float(os.getenv("SMTP_IDLE_TIMEOUT", 30)),
+    timeout=float(os.getenv("SMTP_TIMEOUT", 10)),
+)
+"""全局 SMTP 连接池"""
+
+
+class EmailSender:
+    async def get_config(session: AsyncSession) -> tuple[SMTPConfig, str, str]:
+        """
+        读取 SMTP 设置。
+
+        :return: (连接参数, 发件人, 收件人)
+        """
+        settings = await SettingsCache.get(session)
+        host = settings.get("smtp_host")
+        recipient = settings.get("smtp_recipient")
+
+        if not host or not recipient:
+            raise_internal_error("邮件通知未配置，请联系管理员")
+
+        config = SMTPConfig(
+            host=host,
+            port=settings.get("smtp_port") or 587,
+            username=settings.get("smtp_username") or None,
+            password=settings.get("smtp_password") or None,
+            tls=(settings.get("smtp_tls") or "starttls").lower(),
+        )
+        sender = settings.get("smtp_sender") or config.username or f"findreve@{host}"
+        return config, sender, recipient
+
+    async def send_batch(
+        session: AsyncSession,
+        messages: list[tuple[str, str]],
+    ) -> list[bool]:
+        """发送多封邮件，复用同一个 SMTP 连接。
+
+        Args:
+            session (AsyncSession): 数据库会话
+            messages (list[tuple[str, str]]): (标题, 正文) 列表
+
+        Returns:
+            list[bool]: 与 messages 一一对应的是否发送成功；全部失败时抛出异常
+        """
+        if not messages:
+            return []
+
+        config, sender, recipient = await EmailSender.get_config(session)
+        emails = []
+        for title, description in messages:
+            email = EmailMessage()
+            email["From"] = sender
+            email["To"] = recipient
+            email["Subject"] = title
+            email.set_content(description)
+            emails.append(email)
+
+        try:
+            errors = await smtp_pool.send(config, emails)
+        except (aiosmtplib.SMTPException, OSError) as exc:
+            errors = [exc] * len(emails)
+
+        failed = [error for error in errors if error is not None]
+        if failed:
+            logger.error(f"Failed to send {len(failed)} of {len(emails)} email(s): {failed[0]}")
+        if len(failed) == len(emails):
+            raise_service_unavailable("邮件服务不可用，请稍后再试")
+        logger.info(f"Sent {len(emails) - len(failed)} email(s) to {recipient}")
+        return [error is None for error in errors]
+
+    async def send_text(
+        session: AsyncSession,
+        title: str,
+        description: str,
+    ) -> None:
+        """发送一封纯文本邮件。
+
+        Args:
+            session (AsyncSession): 数据库会话
+            title (str): 邮件标题
+            description (str): 邮件正文
+        """
+        await EmailSender.send_batch(session, [(title, description)])
@@ -0,0 +1,319 @@
+import asyncio
+import hashlib
+import hmac
+import ipaddress
+import json
+import os
+import socket
+import time
+from dataclasses import dataclass
+from typing import Any
+from urllib.parse import urlsplit
+from uuid import UUID
+
+import aiohttp
+from loguru import logger
+from yarl import URL
+
+from .http import HttpClient
+
+SIGNATURE_HEADER = "X-Findreve-Signature"
+"""签名请求头，值为 `sha256=<hex>`，签名内容为 `{时间戳}.{请求体}`"""
+
+TIMESTAMP_HEADER = "X-Findreve-Timestamp"
+"""签名时间戳请求头（Unix 秒），接收方可据此拒绝重放的请求"""
+
+EVENT_HEADER = "X-Findreve-Event"
+"""事件类型请求头"""
+
+
+def sign_payload(secret: str, timestamp: int, body: bytes) -> str:
+    """
+    计算 Webhook 请求的签名。
+
+    :param secret: 订阅的签名密钥
+    :param timestamp: Unix 时间戳（秒）
+    :param body: 请求体
+    :return: `sha256=<hex>` 形式的签名
+    """
+    digest = hmac.new(secret.encode(), f"{timestamp}.".encode() + body, hashlib.sha256).hexdigest()
+    return f"sha256={digest}"
+
+
+def is_public_address(address: str) -> bool:
+    """
+    判断 IP 地址是否为可以投递的公网地址。
+
+    回环、私有、链路本地、保留、组播与未指定地址都不是公网地址；IPv4 映射的 IPv6 地址按 IPv4 判断。
+
+    :param address: IP 地址，可带 IPv6 区域标识
+    """
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    if ip.version == 6 and ip.ipv4_mapped is not None:
+        ip = ip.ipv4_mapped
+    return ip.is_global and not ip.is_multicast
+
+
+async def resolve_public_address(url: str) -> str:
+    """
+    校验 Webhook 地址并解析出用于连接的 IP 地址。
+
+    只允许 https；主机名解析出的所有地址都必须是公网地址，避免 Webhook 被用来访问内网服务。
+
+    :param url: Webhook 地址
+    :return: 第一个解析出的地址
+    :raises ValueError: 地址不是 https、无法解析或解析到非公网地址
+    """
+    parsed = URL(url)
+    if parsed.scheme != "https" or not parsed.host:
+        raise ValueError("Webhook URL must use https")
+
+    try:
+        infos = await asyncio.get_running_loop().getaddrinfo(parsed.host, parsed.port, type=socket.SOCK_STREAM)
+    except OSError as exc:
+        raise ValueError(f"Cannot resolve webhook host '{parsed.host}': {exc}") from exc
+
+    addresses = [info[4][0] for info in infos]
+    if not addresses or not all(is_public_address(address) for address in addresses):
+        raise ValueError(f"Webhook host '{parsed.host}' does not resolve to a public address")
+    return addresses[0]
+
+
+@dataclass(frozen=True, slots=True)
+class WebhookTarget:
+    """一次投递的目标"""
+
+    subscription_id: UUID
+    """订阅 ID，用于统计"""
+
+    url: str
+    """接收地址"""
+
+    secret: str
+    """签名密钥"""
+
+
+class WebhookStats:
+    """单个订阅的投递统计"""
+
+    __slots__ = ("delivered", "failed", "dropped", "total_latency", "last_status", "last_error", "last_delivery_at")
+
+    def __init__(self) -> None:
+        self.delivered = 0
+        self.failed = 0
+        self.dropped = 0
+        self.total_latency = 0.0
+        self.last_status: int | None = None
+        self.last_error: str | None = None
+        self.last_delivery_at: float | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        attempts = self.delivered + self.failed
+        return {
+            "delivered": self.delivered,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "avg_latency_ms": round(self.total_latency / attempts * 1000, 2) if attempts else 0.0,
+            "last_status": self.last_status,
+            "last_error": self.last_error,
+            "last_delivery_at": self.last_delivery_at,
+        }
+
+
+class WebhookDispatcher:
+    """
+    Webhook 投递器。
+
+    `submit` 不等待网络请求，只创建一个投递任务；任务先获取目标主机的信号量，再获取全局信号量，
+    因此单个缓慢的主机最多占用 `max_per_host` 个并发名额，不会拖慢其他主机。
+    排在主机信号量后面的投递只计入该主机的 `max_pending_per_host`，已获得主机名额的投递计入
+    全局的 `max_pending`，任一上限已满时新事件被丢弃并计数，缓慢的主机不会挤占其他主机的名额。
+    每次请求前重新解析并校验目标地址，并直接连接校验过的 IP。
+    所有请求复用 `HttpClient` 的连接池。
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        max_per_host: int,
+        max_pending: int,
+        max_pending_per_host: int,
+        timeout: float,
+    ) -> None:
+        """
+        :param max_concurrency: 同时进行的请求数上限
+        :param max_per_host: 同一主机同时进行的请求数上限
+        :param max_pending: 已获得主机名额、尚未完成的投递数上限
+        :param max_pending_per_host: 同一主机尚未完成的投递数上限
+        :param timeout: 单次请求的超时时间，单位秒
+        """
+        self.max_per_host = max_per_host
+        self.max_pending = max_pending
+        self.max_pending_per_host = max_pending_per_host
+        self.timeout = timeout
+        self._global = asyncio.Semaphore(max_concurrency)
+        # 主机 -> [信号量, 引用计数]，引用计数归零时移除，避免主机数无限增长
+        self._hosts: dict[str, list] = {}
+        # 已获得或即将获得主机名额的投递数，即各主机 min(引用计数, max_per_host) 之和
+        self._admitted = 0
+        self._tasks: set[asyncio.Task] = set()
+        self._stats: dict[UUID, WebhookStats] = {}
+        self.delivered = 0
+        self.failed = 0
+        self.dropped = 0
+
+    def submit(self, targets: list[WebhookTarget], event: str, payload: dict[str, Any]) -> int:
+        """
+        将一个事件投递到多个订阅，立即返回。
+
+        :param targets: 投递目标
+        :param event: 事件类型
+        :param payload: 事件内容，会被序列化为 JSON
+        :return: 实际提交的投递数
+        """
+        if not targets:
+            return 0
+
+        body = json.dumps(
+            {"event": event, "data": payload},
+            ensure_ascii=False,
+            default=str,
+        ).encode()
+
+        submitted = 0
+        for target in targets:
+            host = urlsplit(target.url).netloc
+            slot = self._hosts.get(host)
+            queued = slot[1] if slot else 0
+            if queued >= self.max_pending_per_host or (queued < self.max_per_host and self._admitted >= self.max_pending):
+                self.dropped += 1
+                self._stats_for(target.subscription_id).dropped += 1
+                continue
+            if slot is None:
+                slot = self._hosts[host] = [asyncio.Semaphore(self.max_per_host), 0]
+            slot[1] += 1
+            if slot[1] <= self.max_per_host:
+                self._admitted += 1
+            task = asyncio.create_task(self._deliver(host, slot, target, event, body))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            submitted += 1
+
+        if submitted < len(targets):
+            logger.warning(f"Webhook backlog full, dropped {len(targets) - submitted} deliveries of '{event}'")
+        return submitted
+
+    async def _deliver(self, host: str, slot: list, target: WebhookTarget, event: str, body: bytes) -> None:
+        stats = self._stats_for(target.subscription_id)
+        try:
+            async with slot[0], self._global:
+                timestamp = int(time.time())
+                headers = {
+                    "Content-Type": "application/json",
+                    EVENT_HEADER: event,
+                    TIMESTAMP_HEADER: str(timestamp),
+                    SIGNATURE_HEADER: sign_payload(target.secret, timestamp, body),
+                }
+                url = URL(target.url)
+                start = time.perf_counter()
+                try:
+                    # 注册后域名可能被改为解析到内网，每次投递都重新校验，并连接校验过的地址
+                    address = await resolve_public_address(target.url)
+                    headers["Host"] = url.host_port_subcomponent
+                    http_session = await HttpClient.get()
+                    async with http_session.post(
+                        url.with_host(address),
+                        data=body,
+                        headers=headers,
+                        server_hostname=url.host,
+                        timeout=aiohttp.ClientTimeout(total=self.timeout),
+                        allow_redirects=False,
+                    ) as response:
+                        await response.read()
+                        stats.last_status = response.status
+                        ok = 200 <= response.status < 300
+                        stats.last_error = None if ok else f"HTTP {response.status}"
+                except (ValueError, aiohttp.ClientError, asyncio.TimeoutError) as exc:
+                    ok = False
+                    stats.last_status = None
+                    stats.last_error = str(exc)[:200] or type(exc).__name__
+
+                stats.total_latency += time.perf_counter() - start
+                stats.last_delivery_at = time.time()
+                if ok:
+                    stats.delivered += 1
+                    self.delivered += 1
+                else:
+                    stats.failed += 1
+                    self.failed += 1
+                    logger.debug(f"Webhook {target.subscription_id} delivery failed: {stats.last_error}")
+        finally:
+            if slot[1] <= self.max_per_host:
+                self._admitted -= 1
+            slot[1] -= 1
+            if slot[1] == 0:
+                self._hosts.pop(host, None)
+
+    def _stats_for(self, subscription_id: UUID) -> WebhookStats:
+        stats = self._stats.get(subscription_id)
+        if stats is None:
+            stats = self._stats[subscription_id] = WebhookStats()
+        return stats
+
+    def subscription_stats(self, subscription_id: UUID) -> dict[str, Any]:
+        """
+        获取单个订阅的投递统计。
+
+        :param subscription_id: 订阅 ID
+        """
+        stats = self._stats.get(subscription_id)
+        return (stats or WebhookStats()).as_dict()
+
+    def forget(self, subscription_id: UUID) -> None:
+        """
+        删除订阅时清除其统计。
+
+        :param subscription_id: 订阅 ID
+        """
+        self._stats.pop(subscription_id, None)
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        """
+        等待尚未完成的投递结束，超时后取消。
+
+        :param timeout: 最长等待时间，单位秒
+        """
+        if not self._tasks:
+            return
+        _, pending = await asyncio.wait(set(self._tasks), timeout=timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+            logger.warning(f"Cancelled {len(pending)} unfinished webhook deliveries")
+
+    def stats(self) -> dict[str, int]:
+        """
+        返回投递器的整体统计。
+        """
+        return {
+            "pending": len(self._tasks),
+            "admitted": self._admitted,
+            "active_hosts": len(self._hosts),
+            "dropped": self.dropped,
+            "delivered": self.delivered,
+            "failed": self.failed,
+        }
+
+
+webhook_dispatcher = WebhookDispatcher(
+    max_concurrency=int(os.getenv("WEBHOOK_MAX_CONCURRENCY", 50)),
+    max_per_host=int(os.getenv("WEBHOOK_MAX_PER_HOST", 4)),
+    max_pending=int(os.getenv("WEBHOOK_MAX_PENDING", 5000)),
+    max_pending_per_host=int(os.getenv("WEBHOOK_MAX_PENDING_PER_HOST", 200)),
+    timeout=float(os.getenv("WEBHOOK_TIMEOUT", 10)),
+)
+"""全局 Webhook 投递器"""
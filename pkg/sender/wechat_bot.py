@@ -1,19 +1,19 @@
 from typing import Literal
 from loguru import logger
-from model import Setting
+from model import SettingsCache
 from sqlmodel.ext.asyncio.session import AsyncSession
 from pkg.utils import raise_internal_error, raise_service_unavailable
-import aiohttp
+from .http import HttpClient
 
 webhook_url = "https://qyapi.weixin.qq.com/cgi-bin/webhook/send"
 
 class WeChatBot:
     async def get_key(session: AsyncSession):
-        key = await Setting.get(session, Setting.name == "wechat_bot_key")
+        key = (await SettingsCache.get(session)).get("wechat_bot_key")
     
-        if not key.value:
+        if not key:
             raise_internal_error("企业微信机器人未配置，请联系管理员")
-        return key.value
+        return key
     
     async def send_text(
         session: AsyncSession, 
@@ -33,28 +33,28 @@ class WeChatBot:
         """
         key = await WeChatBot.get_key(session)
         
-        async with aiohttp.ClientSession() as http_session:
-            async with http_session.post(
-                url=f"{webhook_url}?key={key}",
-                json={
-                    "msgtype": "text",
-                    "text": {
-                        "content": text
-                    },
-                    "mentioned_list": ["@all"] if mentioned_all else mentioned_list,
-                    "mentioned_mobile_list": ["@all"] if mentioned_all else mentioned_mobile_list
-                }
-            ) as response:
-                if response.status != 200:
-                    logger.error(f"Failed to send WeChat message: {response.status}")
-                    raise_internal_error("企业微信机器人服务不可用，请稍后再试")
+        http_session = await HttpClient.get()
+        async with http_session.post(
+            url=f"{webhook_url}?key={key}",
+            json={
+                "msgtype": "text",
+                "text": {
+                    "content": text
+                },
+                "mentioned_list": ["@all"] if mentioned_all else mentioned_list,
+                "mentioned_mobile_list": ["@all"] if mentioned_all else mentioned_mobile_list
+            }
+        ) as response:
+            if response.status != 200:
+                logger.error(f"Failed to send WeChat message: {response.status}")
+                raise_internal_error("企业微信机器人服务不可用，请稍后再试")
+            else:
+                resp_json = await response.json()
+                if resp_json.get("errcode") != 0:
+                    logger.error(f"WeChat API error: {resp_json.get('errmsg')}")
+                    raise_service_unavailable("发送企业微信消息失败，请稍后再试或联系管理员")
                 else:
-                    resp_json = await response.json()
-                    if resp_json.get("errcode") != 0:
-                        logger.error(f"WeChat API error: {resp_json.get('errmsg')}")
-                        raise_service_unavailable("发送企业微信消息失败，请稍后再试或联系管理员")
-                    else:
-                        logger.info("WeChat message sent successfully")
+                    logger.info("WeChat message sent successfully")
     
     async def send_markdown(
         session: AsyncSession, 
@@ -85,18 +85,18 @@ class WeChatBot:
                 }
             }
         
-        async with aiohttp.ClientSession() as http_session:
-            async with http_session.post(
-                url=f"{webhook_url}?key={key}",
-                json=payload
-            ) as response:
-                if response.status != 200:
-                    logger.error(f"Failed to send WeChat message: {response.status}")
-                    raise_internal_error("企业微信机器人服务不可用，请稍后再试")
+        http_session = await HttpClient.get()
+        async with http_session.post(
+            url=f"{webhook_url}?key={key}",
+            json=payload
+        ) as response:
+            if response.status != 200:
+                logger.error(f"Failed to send WeChat message: {response.status}")
+                raise_internal_error("企业微信机器人服务不可用，请稍后再试")
+            else:
+                resp_json = await response.json()
+                if resp_json.get("errcode") != 0:
+                    logger.error(f"WeChat API error: {resp_json.get('errmsg')}")
+                    raise_service_unavailable("发送企业微信消息失败，请稍后再试或联系管理员")
                 else:
-                    resp_json = await response.json()
-                    if resp_json.get("errcode") != 0:
-                        logger.error(f"WeChat API error: {resp_json.get('errmsg')}")
-                        raise_service_unavailable("发送企业微信消息失败，请稍后再试或联系管理员")
-                    else:
-                        logger.info("WeChat message sent successfully")
\ No newline at end of file
+                    logger.info("WeChat message sent successfully")
\ No newline at end of file
@@ -5,19 +5,30 @@
 """
 
 import asyncio
+import os
 from loguru import logger
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 
 from model.database import Database
+from services.session import calibrate_password_hasher
 
 
 async def init_database() -> None:
     """
     初始化数据库
+
+    当 `ARGON2_CALIBRATE` 为真时，会按 `ARGON2_HASH_BUDGET_MS`（默认 250 毫秒）
+    在当前主机上校准 Argon2 成本参数并保存到设置中。
     """
     await Database().init_db()
 
+    if os.getenv("ARGON2_CALIBRATE", "false").lower() in ("true", "1", "yes"):
+        budget_ms = float(os.getenv("ARGON2_HASH_BUDGET_MS", 250))
+        logger.info(f"Calibrating Argon2 cost for a {budget_ms} ms budget, this may take a while")
+        async with Database.session_context() as session:
+            await calibrate_password_hasher(session, budget_ms)
+
 
 def mount_static_files(app: FastAPI) -> None:
     """
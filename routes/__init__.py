@@ -1,3 +1,4 @@
 from . import admin
 from . import session
-from . import object
\ No newline at end of file
+from . import object
+from . import webhook
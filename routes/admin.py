@@ -1,9 +1,12 @@
 from typing import Annotated
 
+from uuid import UUID
+
 from fastapi import APIRouter, Depends
+from starlette.status import HTTP_202_ACCEPTED
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from middleware.admin import is_admin
+from middleware.admin import is_admin, is_super_admin
 from model import database
 from model.response import DefaultResponse
 from services import admin as admin_service
@@ -59,3 +62,38 @@ async def update_settings(
 ) -> DefaultResponse:
     result = await admin_service.update_setting_value(session=session, name=name, value=value)
     return DefaultResponse(data=result)
+
+@Router.get(
+    path='/stats',
+    summary='获取运行统计',
+    description='获取进程内缓存命中率等运行统计',
+    response_model=DefaultResponse,
+    response_description='运行统计'
+)
+async def get_stats() -> DefaultResponse:
+    """
+    获取当前进程的运行统计，统计数据在进程重启后清零。
+    """
+    return DefaultResponse(data=await admin_service.fetch_stats())
+
+@Router.post(
+    path='/users/{user_id}/purge',
+    summary='删除用户及其全部数据',
+    description='在后台分批删除用户的全部物品，完成后删除用户',
+    status_code=HTTP_202_ACCEPTED,
+    response_model=DefaultResponse,
+    response_description='清除任务已开始',
+    dependencies=[Depends(is_super_admin)]
+)
+async def purge_user(
+    session: Annotated[AsyncSession, Depends(database.Database.get_session)],
+    user_id: UUID
+) -> DefaultResponse:
+    """
+    删除用户及其全部数据，仅超级管理员可用。
+
+    接口立即返回，删除在后台分批进行，进度可在 `/api/admin/stats` 的 `user_purge` 中查看。
+    超级管理员不能被删除。
+    """
+    await admin_service.start_user_purge(session=session, user_id=user_id)
+    return DefaultResponse(data=True)
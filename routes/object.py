@@ -1,7 +1,8 @@
-from typing import Annotated
+from typing import Annotated, Literal
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -9,8 +10,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from dependencies import SessionDep
 from middleware.user import get_current_user
 from model import DefaultResponse, User, database
-from model.item import ItemDataUpdateRequest
+from model.item import ItemBatchRequest, ItemBatchUpdateRequest, ItemDataUpdateRequest, ItemStatusEnum, ItemTypeEnum
+from pkg import utils
+from services import events as events_service
 from services import object as object_service
+from services import scan as scan_service
 from starlette.status import HTTP_204_NO_CONTENT
 
 limiter = Limiter(key_func=get_remote_address)
@@ -27,20 +31,30 @@ Router = APIRouter(prefix='/api/object', tags=['物品 Object'])
 async def get_items(
     session: Annotated[AsyncSession, Depends(database.Database.get_session)],
     token: Annotated[User, Depends(get_current_user)],
-    id: int | None = Query(default=None, ge=1, description='物品ID'),
-    key: str | None = Query(default=None, description='物品序列号')):
+    id: UUID | None = Query(default=None, description='物品ID'),
+    status: ItemStatusEnum | None = Query(default=None, description='物品状态'),
+    type: ItemTypeEnum | None = Query(default=None, description='物品类型'),
+    parent_item_id: UUID | None = Query(default=None, description='父物品ID'),
+    cursor: str | None = Query(default=None, description='分页游标，取自上一页的 next_cursor'),
+    limit: int = Query(default=50, ge=1, le=200, description='每页数量')):
     """
-    获得物品信息。
+    分页获得物品信息。
 
-    不传参数返回所有信息,否则可传入 `id` 或 `key` 进行筛选。
+    可按 `id`、`status`、`type`、`parent_item_id` 筛选，按创建时间升序排列。
+    返回 `{items, next_cursor}`，将 `next_cursor` 作为下一次请求的 `cursor` 即可翻页，
+    `next_cursor` 为 null 时表示没有更多数据。
     """
-    items = await object_service.list_items(
+    page = await object_service.list_items(
         session=session,
         user=token,
         item_id=id,
-        key=key,
+        status=status,
+        type=type,
+        parent_item_id=parent_item_id,
+        cursor=cursor,
+        limit=limit,
     )
-    return DefaultResponse(data=items)
+    return DefaultResponse(data=page.model_dump())
 
 @Router.post(
     path='/items',
@@ -63,6 +77,108 @@ async def add_items(
         request=request,
     )
 
+@Router.post(
+    path='/items/import',
+    summary='批量导入物品',
+    description='从 CSV 或 JSON Lines 请求体批量导入物品',
+    response_model=DefaultResponse,
+    response_description='导入结果'
+)
+async def import_items(
+    session: SessionDep,
+    user: Annotated[User, Depends(get_current_user)],
+    request: Request,
+    format: Literal['csv', 'jsonl'] = Query(default='jsonl', description='请求体格式'),
+) -> DefaultResponse:
+    """
+    批量导入物品，请求体以流的方式读取，适合一次导入成千上万个物品。
+
+    - **csv**: 首行为表头，可用列为 `name`、`type`、`icon`、`status`、`phone`、`description`
+    - **jsonl**: 每行一个 JSON 对象，字段同上
+
+    校验失败的行会被跳过，返回 `imported`、`failed` 以及前 100 条错误所在的行号与原因。
+    """
+    result = await object_service.import_items(
+        session=session,
+        user=user,
+        chunks=request.stream(),
+        format=format,
+    )
+    return DefaultResponse(data=result)
+
+@Router.post(
+    path='/items/batch/get',
+    summary='批量获取物品',
+    description='根据物品ID列表批量获取物品信息',
+    response_model=DefaultResponse,
+    response_description='物品信息与不存在的物品ID'
+)
+async def get_items_batch(
+    session: SessionDep,
+    user: Annotated[User, Depends(get_current_user)],
+    request: ItemBatchRequest,
+) -> DefaultResponse:
+    """
+    批量获取物品信息，单次最多 500 个。
+
+    返回 `items` 与 `not_found`，不存在或不属于当前用户的物品ID列在 `not_found` 中。
+    """
+    data = await object_service.get_items_batch(
+        session=session,
+        user=user,
+        ids=request.ids,
+    )
+    return DefaultResponse(data=data.model_dump())
+
+@Router.patch(
+    path='/items/batch',
+    summary='批量更新物品',
+    description='对一批物品应用同一组修改',
+    response_model=DefaultResponse,
+    response_description='每个物品的处理结果'
+)
+async def update_items_batch(
+    session: SessionDep,
+    user: Annotated[User, Depends(get_current_user)],
+    request: ItemBatchUpdateRequest,
+) -> DefaultResponse:
+    """
+    批量更新物品信息，如将一批物品标记为丢失。
+
+    `patch` 中只需包含要修改的字段。返回每个物品ID的结果：`ok` 或 `not_found`。
+    """
+    results = await object_service.update_items_batch(
+        session=session,
+        user=user,
+        ids=request.ids,
+        patch=request.patch,
+    )
+    return DefaultResponse(data=[r.model_dump() for r in results])
+
+@Router.post(
+    path='/items/batch/delete',
+    summary='批量删除物品',
+    description='根据物品ID列表批量删除物品',
+    response_model=DefaultResponse,
+    response_description='每个物品的处理结果'
+)
+async def delete_items_batch(
+    session: SessionDep,
+    user: Annotated[User, Depends(get_current_user)],
+    request: ItemBatchRequest,
+) -> DefaultResponse:
+    """
+    批量删除物品。
+
+    返回每个物品ID的结果：`ok`、`not_found`，或仍有子物品而未删除的 `conflict`。
+    """
+    results = await object_service.delete_items_batch(
+        session=session,
+        user=user,
+        ids=request.ids,
+    )
+    return DefaultResponse(data=[r.model_dump() for r in results])
+
 @Router.patch(
     path='/items/{item_id}',
     summary='更新物品信息',
@@ -121,6 +237,63 @@ async def delete_items(
         item_id=item_id,
     )
 
+@Router.get(
+    path='/items/{item_id}/scans',
+    summary='获取物品扫码记录',
+    description='分页获取物品的扫码历史，按时间倒序排列',
+    response_model=DefaultResponse,
+    response_description='扫码记录列表'
+)
+async def get_item_scans(
+    session: SessionDep,
+    user: Annotated[User, Depends(get_current_user)],
+    item_id: UUID,
+    offset: int = Query(default=0, ge=0, description='偏移量'),
+    limit: int = Query(default=50, ge=1, le=200, description='每页数量'),
+) -> DefaultResponse:
+    """
+    获取物品的扫码记录（时间、IP、User-Agent）。
+
+    扫码记录由后台批量写入，最新的记录可能会有几秒延迟。
+    """
+    events = await scan_service.list_scan_events(
+        session=session,
+        user=user,
+        item_id=item_id,
+        offset=offset,
+        limit=limit,
+    )
+    return DefaultResponse(data=events)
+
+@Router.get(
+    path='/events',
+    summary='订阅物品实时事件',
+    description='以 Server-Sent Events 推送当前用户物品的扫码、状态变化与通知事件',
+    response_class=StreamingResponse,
+    response_description='SSE 事件流'
+)
+async def get_item_events(
+    session: SessionDep,
+    user: Annotated[User, Depends(get_current_user)],
+) -> StreamingResponse:
+    """
+    订阅当前用户物品的实时事件，替代轮询 `GET /api/object/items`。
+
+    事件类型为 `scan`、`status_change`、`notify`，`data` 为 JSON；
+    空闲时定期发送心跳注释。收到 `overflow` 事件表示消费过慢已被断开，应重新连接。
+    """
+    if not events_service.live_events.can_subscribe(user.id):
+        utils.raise_service_unavailable("Too many event streams, please try again later")
+
+    # 鉴权完成后立即归还数据库连接，长连接期间不占用连接池
+    await session.close()
+
+    return StreamingResponse(
+        events_service.stream(user.id),
+        media_type='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
+
 @Router.get(
     path='/{item_id}',
     summary="获取物品信息",
@@ -140,8 +313,9 @@ async def get_object(
         session=session,
         item_id=item_id,
         client_host=str(request.client.host),
+        user_agent=request.headers.get('user-agent'),
     )
-    return DefaultResponse(data=data.model_dump())
+    return DefaultResponse(data=data)
 
 @Router.post(
     path='/{item_id}/notify_move_car',
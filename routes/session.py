@@ -1,6 +1,6 @@
 # 导入库
 from typing import Annotated
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, BackgroundTasks, Depends, Request
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlmodel.ext.asyncio.session import AsyncSession
 
@@ -22,11 +22,15 @@ Router = APIRouter(tags=["令牌 session"])
 async def login_for_access_token(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
     session: Annotated[AsyncSession, Depends(database.Database.get_session)],
+    background_tasks: BackgroundTasks,
+    request: Request,
 ) -> TokenResponse:
     token_response = await session_service.login_for_access_token(
         session=session,
         username=form_data.username,
         password=form_data.password,
+        client_host=request.client.host if request.client else None,
+        background_tasks=background_tasks,
     )
     if not token_response:
         utils.raise_unauthorized("Incorrect username or password")
@@ -0,0 +1,98 @@
+from typing import Annotated
+from uuid import UUID
+
+from fastapi import APIRouter, Depends
+from starlette.status import HTTP_204_NO_CONTENT
+
+from dependencies import SessionDep
+from middleware.user import get_current_user
+from model import DefaultResponse, User
+from model.webhook import WebhookSubscriptionCreateRequest, WebhookSubscriptionUpdateRequest
+from services import webhook as webhook_service
+
+Router = APIRouter(prefix='/api/webhook', tags=['Webhook'])
+
+@Router.get(
+    path='/',
+    summary='获取 Webhook 列表',
+    description='返回当前用户注册的 Webhook 及其投递统计',
+    response_model=DefaultResponse,
+    response_description='Webhook 列表'
+)
+async def get_webhooks(
+    session: SessionDep,
+    user: Annotated[User, Depends(get_current_user)],
+) -> DefaultResponse:
+    """
+    获取当前用户的 Webhook 列表。
+
+    `stats` 为本进程内的投递统计，重启后清零。
+    """
+    data = await webhook_service.list_webhooks(session=session, user=user)
+    return DefaultResponse(data=data)
+
+@Router.post(
+    path='/',
+    summary='注册 Webhook',
+    description='注册一个接收物品事件的 Webhook',
+    response_model=DefaultResponse,
+    response_description='新注册的 Webhook，包含签名密钥'
+)
+async def add_webhook(
+    session: SessionDep,
+    user: Annotated[User, Depends(get_current_user)],
+    request: WebhookSubscriptionCreateRequest,
+) -> DefaultResponse:
+    """
+    注册 Webhook。
+
+    事件以 JSON POST 到 `url`，请求头 `X-Findreve-Signature` 为
+    `sha256=HMAC-SHA256(secret, "{X-Findreve-Timestamp}.{body}")`。
+    签名密钥 `secret` 只在此接口返回一次，请妥善保存。
+
+    - **url**: 接收事件的地址
+    - **events**: 订阅的事件，可选 `scan`、`status_change`、`notify`
+    - **enabled**: 是否启用
+    """
+    data = await webhook_service.create_webhook(session=session, user=user, request=request)
+    return DefaultResponse(data=data.model_dump())
+
+@Router.patch(
+    path='/{webhook_id}',
+    summary='更新 Webhook',
+    description='更新 Webhook 的地址、订阅事件或启用状态',
+    status_code=HTTP_204_NO_CONTENT,
+    response_description='更新成功'
+)
+async def update_webhook(
+    session: SessionDep,
+    user: Annotated[User, Depends(get_current_user)],
+    webhook_id: UUID,
+    request: WebhookSubscriptionUpdateRequest,
+):
+    """
+    更新 Webhook，未传入的字段保持不变。
+    """
+    await webhook_service.update_webhook(
+        session=session,
+        user=user,
+        webhook_id=webhook_id,
+        request=request,
+    )
+
+@Router.delete(
+    path='/{webhook_id}',
+    summary='删除 Webhook',
+    description='删除指定的 Webhook',
+    status_code=HTTP_204_NO_CONTENT,
+    response_description='删除成功'
+)
+async def delete_webhook(
+    session: SessionDep,
+    user: Annotated[User, Depends(get_current_user)],
+    webhook_id: UUID,
+):
+    """
+    删除 Webhook。
+    """
+    await webhook_service.delete_webhook(session=session, user=user, webhook_id=webhook_id)
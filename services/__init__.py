@@ -2,12 +2,16 @@
 服务层模块聚合。
 """
 
-from . import admin, object, session, site  # noqa: F401
+from . import admin, events, notification, object, scan, session, site, webhook  # noqa: F401
 
 
 __all__ = [
     "admin",
+    "events",
+    "notification",
     "object",
+    "scan",
     "session",
     "site",
+    "webhook",
 ]
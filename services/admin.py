@@ -2,13 +2,28 @@
 管理员相关业务逻辑。
 """
 
-from typing import Iterable, List
+import asyncio
+import os
+from typing import Any, List
+from uuid import UUID
 
+from loguru import logger
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from model import Setting
+from model import Database, Item, Setting, SettingsCache, User, UserTypeEnum
 from model import SettingResponse
+from model.database import write_queue
+from model.setting import coerce_setting_value
+from middleware.user import principal_cache
 from pkg import utils
+from pkg.sender.dispatcher import dispatcher
+from pkg.sender.smtp import smtp_pool
+from pkg.sender.webhook import webhook_dispatcher
+from services.events import live_events
+from services.notification import lost_scan_digest, notification_worker
+from services.object import item_cache
+from services.scan import scan_event_queue, scan_stats
+from services.webhook import subscription_cache
 
 
 async def fetch_settings(
@@ -20,16 +35,16 @@ async def fetch_settings(
     """
     data: list[SettingResponse] = []
 
+    columns = [Setting.type, Setting.name, Setting.value]
+
     if name:
-        setting = await Setting.get(session, Setting.name == name)
+        setting = await Setting.get_by(session, name=name, columns=columns, into=SettingResponse)
         if setting:
-            data.append(SettingResponse.model_validate(setting))
+            data.append(setting)
         else:
             utils.raise_not_found("Setting not found")
     else:
-        settings: Iterable[Setting] | None = await Setting.get(session, fetch_mode="all")
-        if settings:
-            data = [SettingResponse.model_validate(s) for s in settings]
+        data = await Setting.get(session, None, fetch_mode="all", columns=columns, into=SettingResponse)
 
     return data
 
@@ -41,12 +56,116 @@ async def update_setting_value(
 ) -> bool:
     """
     更新设置项的值。
+
+    写入数据库后会原子替换进程内的设置快照，热路径随即读取到新值。
     """
-    setting = await Setting.get(session, Setting.name == name)
+    setting = await Setting.get_by(session, name=name)
     if not setting:
         utils.raise_not_found("Setting not found")
 
+    try:
+        coerce_setting_value(setting.type, value)
+    except ValueError:
+        utils.raise_bad_request(f"Setting '{name}' requires a value of type '{setting.type}'")
+
     setting.value = value
-    await Setting.save(session)
+    setting = await setting.save(session, refresh=False)
+    SettingsCache.replace(setting)
 
     return True
+
+
+USER_PURGE_CHUNK_SIZE = int(os.getenv("USER_PURGE_CHUNK_SIZE", 200))
+"""清除用户数据时每个事务删除的物品数"""
+
+USER_PURGE_PAUSE = float(os.getenv("USER_PURGE_PAUSE", 0.05))
+"""两个删除事务之间的间隔，单位秒，让其他写入有机会获得写锁"""
+
+_purges: dict[UUID, asyncio.Task] = {}
+"""正在进行的用户清除任务"""
+
+purge_stats: dict[str, int] = {"completed": 0, "failed": 0, "items_deleted": 0}
+"""用户清除任务的统计"""
+
+
+async def start_user_purge(session: AsyncSession, user_id: UUID) -> None:
+    """
+    在后台分批删除用户的全部物品，最后删除用户本身。
+
+    每批只删除 `USER_PURGE_CHUNK_SIZE` 个物品并立即提交，批次之间让出写锁，
+    再大的账号也不会长时间阻塞其他写入。中途失败或进程重启后可以再次发起，从剩余的数据继续。
+    """
+    user = await User.get(session, User.id == user_id, columns=[User.id, User.role])
+    if not user:
+        utils.raise_not_found("User not found")
+    if user.role == UserTypeEnum.super_admin:
+        utils.raise_forbidden("Super admin cannot be deleted")
+    if user_id in _purges:
+        utils.raise_conflict("User purge is already in progress")
+
+    task = asyncio.create_task(_purge_user(user_id), name=f"purge-user-{user_id}")
+    _purges[user_id] = task
+    task.add_done_callback(lambda _: _purges.pop(user_id, None))
+
+
+async def _delete_item_chunk(session: AsyncSession, user_id: UUID) -> list[UUID]:
+    rows = await Item.get(
+        session,
+        Item.user_id == user_id,
+        columns=[Item.id],
+        limit=USER_PURGE_CHUNK_SIZE,
+        fetch_mode="all",
+    )
+    ids = [row.id for row in rows]
+    if ids:
+        # 子物品的外键为 RESTRICT，先解除与本批物品的父子关系
+        await Item.update_where(session, Item.parent_item_id.in_(ids), {"parent_item_id": None}, commit=False)
+        await Item.delete_where(session, Item.id.in_(ids), commit=False)
+    return ids
+
+
+async def _purge_user(user_id: UUID) -> None:
+    try:
+        while True:
+            # 每批删除经组提交队列写入，与扫码等其他写入交替进行
+            ids = await Database.write(lambda session: _delete_item_chunk(session, user_id))
+            if not ids:
+                break
+
+            purge_stats["items_deleted"] += len(ids)
+            for item_id in ids:
+                item_cache.invalidate(item_id)
+            await asyncio.sleep(USER_PURGE_PAUSE)
+
+        async with Database.session_context() as session:
+            user = await User.get(session, User.id == user_id)
+            if user:
+                await User.delete(session, user)
+    except Exception:
+        purge_stats["failed"] += 1
+        logger.exception(f"Failed to purge user {user_id}")
+    else:
+        purge_stats["completed"] += 1
+        logger.info(f"Purged user {user_id}")
+
+
+async def fetch_stats() -> dict[str, Any]:
+    """
+    获取进程内各项缓存与后台组件的运行统计。
+    """
+    return {
+        "notification_worker": await notification_worker.stats(),
+        "notification_channels": dispatcher.stats(),
+        "smtp_pool": smtp_pool.stats(),
+        "lost_scan_digest": lost_scan_digest.stats(),
+        "webhooks": webhook_dispatcher.stats(),
+        "live_events": live_events.stats(),
+        "item_cache": item_cache.stats(),
+        "principal_cache": principal_cache.stats(),
+        "webhook_subscription_cache": subscription_cache.stats(),
+        "scan_event_queue": scan_event_queue.stats(),
+        "scan_stats": scan_stats.stats(),
+        "user_purge": {"running": len(_purges), **purge_stats},
+        "statement_cache": Database.statement_cache_stats(),
+        "write_queue": write_queue.stats(),
+    }
@@ -0,0 +1,89 @@
+"""
+物品事件的统一出口。
+
+业务代码只调用 `emit`，由这里负责把事件分发到各个订阅方：
+物主的 SSE 连接与物主注册的 Webhook。
+"""
+
+import json
+import os
+from datetime import datetime
+from typing import Any, AsyncIterator
+from uuid import UUID
+
+from loguru import logger
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from model.webhook import WebhookEventEnum
+from pkg.pubsub import PubSubHub, SubscriberOverflow
+from pkg.sender.webhook import webhook_dispatcher
+from services.webhook import targets_for
+
+SSE_HEARTBEAT_INTERVAL = float(os.getenv("SSE_HEARTBEAT_INTERVAL", 15))
+"""SSE 连接空闲时发送心跳的间隔，单位秒"""
+
+live_events: PubSubHub[UUID, str] = PubSubHub(
+    buffer_size=int(os.getenv("SSE_BUFFER_SIZE", 100)),
+    max_subscribers=int(os.getenv("SSE_MAX_SUBSCRIBERS", 10000)),
+    max_per_topic=int(os.getenv("SSE_MAX_PER_USER", 5)),
+)
+"""物品实时事件的发布/订阅中心，以物主 ID 为主题，消息为编码好的 SSE 帧"""
+
+
+async def emit(
+    session: AsyncSession,
+    user_id: UUID,
+    event: WebhookEventEnum,
+    item_id: UUID,
+    data: dict[str, Any] | None = None,
+) -> None:
+    """
+    发布一个物品事件。
+
+    事件投递在后台进行，本函数不等待任何网络请求；分发失败只记录日志，不影响调用方。
+
+    :param session: 数据库会话
+    :param user_id: 物主 ID
+    :param event: 事件类型
+    :param item_id: 物品 ID
+    :param data: 事件的附加内容
+    """
+    payload = {"item_id": item_id, "occurred_at": datetime.now(), **(data or {})}
+
+    if live_events.has_subscribers(user_id):
+        # 只编码一次，所有订阅者共享同一个 SSE 帧
+        frame = f"event: {event}\ndata: {json.dumps(payload, ensure_ascii=False, default=str)}\n\n"
+        live_events.publish(user_id, frame)
+
+    try:
+        webhook_dispatcher.submit(await targets_for(session, user_id, event), event, payload)
+    except Exception:
+        logger.exception(f"Failed to dispatch '{event}' event of item {item_id}")
+
+
+async def stream(user_id: UUID) -> AsyncIterator[str]:
+    """
+    订阅物主的实时事件并转换为 SSE 文本流。
+
+    订阅在开始迭代时才建立，连接关闭时自动取消。空闲时每隔 `SSE_HEARTBEAT_INTERVAL` 秒
+    发送一条注释作为心跳；消费过慢被断开或订阅数已满时发送 `overflow` 事件后结束，
+    客户端应重新连接并刷新数据。
+
+    :param user_id: 物主 ID
+    """
+    subscription = live_events.subscribe(user_id)
+    if subscription is None:
+        yield "event: overflow\ndata: {}\n\n"
+        return
+
+    try:
+        yield "retry: 3000\n\n"
+        while True:
+            try:
+                frame = await subscription.get(SSE_HEARTBEAT_INTERVAL)
+            except SubscriberOverflow:
+                yield "event: overflow\ndata: {}\n\n"
+                return
+            yield frame if frame is not None else ": ping\n\n"
+    finally:
+        live_events.unsubscribe(subscription)
@@ -0,0 +1,400 @@
+"""
+通知投递服务。
+
+通知先写入 `NotificationOutbox` 表，与业务数据处于同一事务中；
+后台任务再读取到期的记录进行投递，失败时按指数退避重试。
+"""
+
+import os
+from datetime import datetime, timedelta
+from uuid import UUID
+
+from loguru import logger
+from sqlmodel import func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from model import Database, NotificationOutbox, OutboxStatusEnum, SettingsCache, SettingsSnapshot
+from pkg.batcher import PeriodicFlusher
+from pkg.sender.dispatcher import dispatcher
+
+CHANNEL_KEY_SETTINGS: dict[str, str] = {
+    "wechat_bot": "wechat_bot_key",
+    "server_chan": "server_chan_key",
+    "email": "smtp_recipient",
+}
+"""推送通道与其密钥设置项的对应关系，密钥为空的通道视为未配置"""
+
+
+def configured_channels(settings: SettingsSnapshot) -> list[str]:
+    """
+    解析 `mentioned_channel` 设置，返回已启用且已填写密钥的推送通道。
+
+    :param settings: 设置快照
+    """
+    channels = []
+    for name in (settings.get("mentioned_channel") or "").split(","):
+        name = name.strip()
+        key_setting = CHANNEL_KEY_SETTINGS.get(name)
+        if key_setting and settings.get(key_setting) and name not in channels:
+            channels.append(name)
+    return channels
+
+
+async def deliver(session: AsyncSession, title: str, body: str) -> None:
+    """
+    并发发送到所有已配置的推送通道。
+
+    只要有一个通道发送成功即视为投递成功；全部失败或被熔断跳过时抛出异常，
+    由发件箱按退避策略重试。
+
+    :param session: 数据库会话
+    :param title: 通知标题
+    :param body: 通知正文（Markdown）
+    :raises RuntimeError: 没有可用的通道或所有通道都发送失败时抛出
+    """
+    error, = await deliver_batch(session, [(title, body)])
+    if error is not None:
+        raise RuntimeError(error)
+
+
+async def deliver_batch(
+    session: AsyncSession,
+    messages: list[tuple[str, str]],
+    budget: float | None = None,
+) -> list[str | None]:
+    """
+    将多条通知并发发送到所有已配置的推送通道。
+
+    邮件等支持批量发送的通道一次发送全部通知，共用同一个已登录的连接。
+    每条通知只要有一个通道发送成功即视为投递成功。
+
+    :param session: 数据库会话
+    :param messages: (标题, Markdown 正文) 列表
+    :param budget: 每个通道的总时间上限，单位秒，超时未发送的通知视为失败
+    :return: 与 `messages` 一一对应的错误信息，投递成功时为 None
+    """
+    channels = configured_channels(await SettingsCache.get(session))
+    if not channels:
+        return ["No notification channel is configured"] * len(messages)
+
+    results = await dispatcher.dispatch_batch(session, messages, channels, budget)
+    return [
+        None if any(result.values()) else f"All notification channels failed: {', '.join(result)}"
+        for result in results
+    ]
+
+
+async def enqueue_notification(
+    session: AsyncSession,
+    dedup_key: str,
+    title: str,
+    body: str,
+    item_id: UUID | None = None,
+    dedup: bool = True,
+) -> bool:
+    """
+    将通知写入发件箱，经组提交队列提交。
+
+    若同一去重键在 `notify_dedup_window` 秒内已有通知，则合并为同一次投递，不再写入新记录。
+
+    :param session: 数据库会话
+    :param dedup_key: 去重键
+    :param title: 通知标题
+    :param body: 通知正文（Markdown）
+    :param item_id: 关联的物品 ID
+    :param dedup: 是否按去重窗口合并，调用方已自行聚合时传入 False
+    :return: 是否写入了新的通知
+    """
+    settings = await SettingsCache.get(session)
+    window = (settings.get("notify_dedup_window") or 0) if dedup else 0
+
+    async def operation(writer: AsyncSession) -> bool:
+        # 去重查询与写入在写连接的同一事务中进行，并发的重复请求不会各自写入一条通知
+        if window > 0:
+            recent = await NotificationOutbox.get(
+                writer,
+                (NotificationOutbox.dedup_key == dedup_key)
+                & (NotificationOutbox.created_at >= datetime.now() - timedelta(seconds=window)),
+                columns=[NotificationOutbox.id],
+            )
+            if recent:
+                logger.debug(f"Merged notification '{dedup_key}' into outbox entry {recent.id}")
+                return False
+
+        writer.add(NotificationOutbox(dedup_key=dedup_key, item_id=item_id, title=title, body=body))
+        await writer.flush()
+        return True
+
+    if not await Database.write(operation):
+        return False
+    notification_worker.wake()
+    return True
+
+
+class NotificationWorker(PeriodicFlusher):
+    """
+    发件箱投递任务。
+
+    每次运行取出一批到期的待投递通知一起发送，邮件通道复用同一个连接发送整批通知。
+    发送前先通过条件更新"租用"这些记录，避免多个进程重复投递；
+    失败时按 `base_delay * 2 ** attempts` 退避，超过最大重试次数后标记为失败。
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        batch_size: int,
+        max_attempts: int,
+        base_delay: float,
+        max_delay: float,
+        lease: float,
+    ) -> None:
+        """
+        :param interval: 两次轮询之间的最长间隔，单位秒
+        :param batch_size: 每次轮询最多处理的通知数
+        :param max_attempts: 最大投递次数
+        :param base_delay: 首次重试的等待时间，单位秒
+        :param max_delay: 重试等待时间的上限，单位秒
+        :param lease: 租用记录的时长，单位秒；整批投递最多使用其中的 80%，其余留给写回结果
+        """
+        super().__init__(interval)
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.lease = lease
+        self.delivered = 0
+        self.retried = 0
+        self.failed = 0
+
+    async def flush(self) -> None:
+        async with Database.session_context() as session:
+            due: list[NotificationOutbox] = await NotificationOutbox.get(
+                session,
+                (NotificationOutbox.status == OutboxStatusEnum.pending)
+                & (NotificationOutbox.next_attempt_at <= datetime.now()),
+                order_by=[NotificationOutbox.next_attempt_at],
+                limit=self.batch_size,
+                fetch_mode="all",
+            )
+            # 记录的状态通过条件更新写回，不经过会话的脏检查
+            session.expunge_all()
+
+            # 整批记录的租用与结果各在一个写操作中完成，只需两次提交
+            async def claim(writer: AsyncSession) -> list[NotificationOutbox]:
+                return [entry for entry in due if await self._claim(writer, entry)]
+
+            entries = await Database.write(claim)
+            if not entries:
+                return
+
+            try:
+                # 租期结束前必须写回结果，否则其他进程会重新租用这些记录并重复投递
+                errors = await deliver_batch(
+                    session,
+                    [(entry.title, entry.body) for entry in entries],
+                    budget=self.lease * 0.8,
+                )
+            except Exception as exc:  # noqa: BLE001
+                errors = [str(getattr(exc, "detail", exc))] * len(entries)
+
+            async def record(writer: AsyncSession) -> None:
+                for entry, error in zip(entries, errors):
+                    await self._record(writer, entry, error)
+
+            await Database.write(record)
+
+    async def _claim(self, session: AsyncSession, entry: NotificationOutbox) -> bool:
+        leased_until = datetime.now() + timedelta(seconds=self.lease)
+        claimed = await NotificationOutbox.update_where(
+            session,
+            (NotificationOutbox.id == entry.id)
+            & (NotificationOutbox.status == OutboxStatusEnum.pending)
+            & (NotificationOutbox.next_attempt_at == entry.next_attempt_at),
+            {"next_attempt_at": leased_until},
+            commit=False,
+        )
+        if claimed != 1:
+            return False
+        entry.next_attempt_at = leased_until
+        return True
+
+    async def _record(self, session: AsyncSession, entry: NotificationOutbox, error: str | None) -> None:
+        entry.attempts += 1
+        if error is not None:
+            entry.last_error = error[:500]
+            if entry.attempts >= self.max_attempts:
+                entry.status = OutboxStatusEnum.failed
+                self.failed += 1
+                logger.error(f"Giving up notification {entry.id} after {entry.attempts} attempts: {entry.last_error}")
+            else:
+                delay = min(self.base_delay * 2 ** (entry.attempts - 1), self.max_delay)
+                entry.next_attempt_at = datetime.now() + timedelta(seconds=delay)
+                self.retried += 1
+                logger.warning(f"Notification {entry.id} failed, retrying in {delay:.0f}s: {entry.last_error}")
+        else:
+            entry.status = OutboxStatusEnum.sent
+            entry.sent_at = datetime.now()
+            entry.last_error = None
+            self.delivered += 1
+
+        await NotificationOutbox.update_where(
+            session,
+            NotificationOutbox.id == entry.id,
+            {
+                "attempts": entry.attempts,
+                "status": entry.status,
+                "next_attempt_at": entry.next_attempt_at,
+                "sent_at": entry.sent_at,
+                "last_error": entry.last_error,
+            },
+            commit=False,
+        )
+
+    async def stats(self) -> dict[str, int]:
+        """
+        返回投递统计与发件箱中待投递的通知数。
+        """
+        async with Database.session_context() as session:
+            pending = (await session.exec(
+                select(func.count())
+                .select_from(NotificationOutbox)
+                .where(NotificationOutbox.status == OutboxStatusEnum.pending)
+            )).one()
+        return {
+            "pending": pending,
+            "delivered": self.delivered,
+            "retried": self.retried,
+            "failed": self.failed,
+        }
+
+
+notification_worker = NotificationWorker(
+    interval=float(os.getenv("NOTIFY_POLL_INTERVAL", 5)),
+    batch_size=int(os.getenv("NOTIFY_BATCH_SIZE", 50)),
+    max_attempts=int(os.getenv("NOTIFY_MAX_ATTEMPTS", 8)),
+    base_delay=float(os.getenv("NOTIFY_RETRY_BASE_DELAY", 5)),
+    max_delay=float(os.getenv("NOTIFY_RETRY_MAX_DELAY", 900)),
+    lease=float(os.getenv("NOTIFY_LEASE", 60)),
+)
+"""发件箱投递任务"""
+
+
+class LostScanDigest(PeriodicFlusher):
+    """
+    丢失物品被扫码时的物主提醒摘要。
+
+    扫码请求只在内存中按物主累计被扫描的物品，每个物主从第一次扫码起经过
+    `lost_scan_digest_window` 秒后合并为一条摘要写入发件箱。无论物品被扫描多少次，
+    每个物主在每个窗口内至多产生一次推送；摘要中列出的物品数不超过 `max_items`。
+    """
+
+    def __init__(self, interval: float, max_owners: int, max_items: int) -> None:
+        """
+        :param interval: 两次检查之间的最长间隔，单位秒
+        :param max_owners: 同时累计的物主数上限，超出后新物主的扫码被丢弃并计数
+        :param max_items: 单条摘要中列出的物品数上限
+        """
+        super().__init__(interval)
+        self.max_owners = max_owners
+        self.max_items = max_items
+        self._pending: dict[UUID, tuple[datetime, dict[UUID | None, list]]] = {}
+        self._draining = False
+        self.recorded = 0
+        self.dropped = 0
+        self.digests = 0
+
+    def record(self, user_id: UUID, item_id: UUID, item_name: str, ip: str | None) -> None:
+        """
+        记录一次丢失物品的扫码。
+
+        :param user_id: 物主 ID
+        :param item_id: 物品 ID
+        :param item_name: 物品名称
+        :param ip: 扫码者 IP
+        """
+        now = datetime.now()
+        pending = self._pending.get(user_id)
+        if pending is None:
+            if len(self._pending) >= self.max_owners:
+                self.dropped += 1
+                return
+            pending = self._pending[user_id] = (now, {})
+
+        items = pending[1]
+        entry = items.get(item_id)
+        if entry is not None:
+            entry[1] += 1
+            entry[2], entry[3] = ip, now
+        elif len(items) < self.max_items:
+            items[item_id] = [item_name, 1, ip, now]
+        else:
+            # 超出上限的物品只计入"其他"
+            items.setdefault(None, [None, 0, None, now])[1] += 1
+        self.recorded += 1
+
+    async def stop(self) -> None:
+        """停止后台任务，关闭前不论窗口是否结束都发出剩余的摘要。"""
+        self._draining = True
+        try:
+            await super().stop()
+        finally:
+            self._draining = False
+
+    async def flush(self) -> None:
+        if not self._pending:
+            return
+
+        async with Database.session_context() as session:
+            settings = await SettingsCache.get(session)
+            window = timedelta(seconds=settings.get("lost_scan_digest_window") or 0)
+            cutoff = datetime.now() - window
+
+            due = [
+                user_id for user_id, (started, _) in self._pending.items()
+                if self._draining or started <= cutoff
+            ]
+            for user_id in due:
+                started, items = self._pending.pop(user_id)
+                try:
+                    await enqueue_notification(
+                        session,
+                        dedup_key=f"lost_scan:{user_id}",
+                        title="丢失物品被扫描 - Findreve",
+                        body=self._render(items),
+                        dedup=False,
+                    )
+                except Exception:
+                    # 写入失败时放回，下次再试
+                    self._pending.setdefault(user_id, (started, items))
+                    raise
+                self.digests += 1
+
+    @staticmethod
+    def _render(items: dict[UUID | None, list]) -> str:
+        lines = ["您标记为丢失的物品被扫描："]
+        for item_id, (name, count, ip, last_at) in items.items():
+            if item_id is None:
+                lines.append(f"- 其他物品共被扫描 {count} 次")
+            else:
+                lines.append(f"- “{name}”被扫描 {count} 次，最近一次 {last_at:%Y-%m-%d %H:%M:%S}，IP：{ip or '未知'}")
+        return "\n".join(lines)
+
+    def stats(self) -> dict[str, int]:
+        """
+        返回摘要聚合的统计信息。
+        """
+        return {
+            "pending_owners": len(self._pending),
+            "recorded": self.recorded,
+            "dropped": self.dropped,
+            "digests": self.digests,
+        }
+
+
+lost_scan_digest = LostScanDigest(
+    interval=float(os.getenv("LOST_SCAN_DIGEST_INTERVAL", 10)),
+    max_owners=int(os.getenv("LOST_SCAN_DIGEST_MAX_OWNERS", 10000)),
+    max_items=int(os.getenv("LOST_SCAN_DIGEST_MAX_ITEMS", 20)),
+)
+"""丢失物品扫码的物主提醒摘要"""
@@ -2,58 +2,161 @@
 物品相关业务逻辑。
 """
 
-from typing import List
+import base64
+import codecs
+import csv
+import json
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, AsyncIterator, Literal
 from uuid import UUID
 
 from fastapi import status
 from loguru import logger
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import tuple_
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from model import Item, ItemDataResponse, Setting, User
-from model.item import ItemDataUpdateRequest, ItemTypeEnum
-from pkg.sender import ServerChatBot, WeChatBot
+from model import Database, Item, ItemDataResponse, SettingsCache, User
+from model.item import (
+    ItemBase,
+    ItemBatchGetResponse,
+    ItemBatchResult,
+    ItemBatchResultEnum,
+    ItemDataUpdateRequest,
+    ItemOwnerResponse,
+    ItemPage,
+    ItemStatusEnum,
+    ItemTypeEnum,
+)
+from model.webhook import WebhookEventEnum
+from pkg.cache import LoadingCache
 from pkg import utils
+from services import events
+from services.notification import configured_channels, enqueue_notification, lost_scan_digest
+from services.scan import fetch_scan_stats, find_ip_buffer, scan_event_queue, scan_stats
+
+
+@dataclass(frozen=True, slots=True)
+class CachedItem:
+    """公开扫码接口缓存的物品数据"""
+
+    data: dict[str, Any]
+    """序列化后的 `ItemDataResponse`"""
+
+    status: ItemStatusEnum
+    """物品状态，用于判断是否需要记录寻找者 IP"""
+
+    user_id: UUID
+    """物品所属的用户 ID"""
+
+
+item_cache: LoadingCache[UUID, CachedItem] = LoadingCache(
+    maxsize=int(os.getenv("ITEM_CACHE_SIZE", 4096)),
+    ttl=float(os.getenv("ITEM_CACHE_TTL", 60)),
+)
+"""公开扫码接口的物品缓存，以物品 UUID 为键"""
+
+
+_LIST_COLUMNS = [
+    Item.id, Item.type, Item.name, Item.icon, Item.status, Item.phone, Item.description,
+    Item.find_ip, Item.created_at, Item.expires_at, Item.lost_at, Item.parent_item_id,
+]
+"""物品列表需要的列，只查询这些列而不构造完整的 `Item` 对象"""
+
+_PUBLIC_COLUMNS = [
+    Item.type, Item.name, Item.icon, Item.status, Item.phone, Item.description,
+    Item.expires_at, Item.lost_at, Item.user_id,
+]
+"""公开扫码接口需要的列：`ItemDataResponse` 的字段与物主 ID"""
+
+
+def _encode_cursor(created_at: datetime, item_id: UUID) -> str:
+    raw = f"{created_at.isoformat()}|{item_id.hex}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, item_id = raw.split("|")
+        return datetime.fromisoformat(created_at), UUID(hex=item_id)
+    except ValueError:
+        utils.raise_bad_request("Invalid cursor")
+
+
+def _to_owner_response(row, stats: tuple[int, int]) -> ItemOwnerResponse:
+    scan_count, unique_finders = stats
+    return ItemOwnerResponse(
+        id=row.id,
+        type=row.type,
+        name=row.name,
+        icon=row.icon or "",
+        status=row.status,
+        phone=row.phone if row.phone and row.phone.isdigit() else None,
+        description=row.description,
+        find_ip=row.find_ip,
+        created_at=row.created_at,
+        expires_at=row.expires_at,
+        lost_at=row.lost_at,
+        parent_item_id=row.parent_item_id,
+        scan_count=scan_count,
+        unique_finders=unique_finders,
+    )
 
 
 async def list_items(
     session: AsyncSession,
     user: User,
-    item_id: int | None = None,
-    key: str | None = None,
-) -> List[Item]:
+    item_id: UUID | None = None,
+    status: ItemStatusEnum | None = None,
+    type: ItemTypeEnum | None = None,
+    parent_item_id: UUID | None = None,
+    cursor: str | None = None,
+    limit: int = 50,
+) -> ItemPage:
     """
-    根据条件获取当前用户的物品列表。
+    按条件分页获取当前用户的物品，附带扫码次数与不同扫码者数量的估算值。
+
+    按 `(created_at, id)` 升序进行键集分页，`cursor` 为上一页返回的 `next_cursor`；
+    每页在索引中直接定位到游标之后按序读取，每行再按 rowid 回表取出列表所需的列（索引不覆盖这些列），
+    翻页开销只与每页行数有关，与翻页深度无关。所有筛选条件都在 SQL 中完成。
     """
+    condition = Item.user_id == user.id
     if item_id is not None:
-        results = await Item.get(session, (Item.id == item_id) & (Item.user_id == user.id))
-        results = [results] if results else []
-    elif key is not None:
-        results = await Item.get(session, (Item.key == key) & (Item.user_id == user.id))
-        results = [results] if results else []
-    else:
-        results = await Item.get(session, Item.user_id == user.id, fetch_mode="all")
-
-    if not results:
-        return []
-
-    items: list[Item] = []
-    for obj in results:
-        items.append(
-            Item(
-                id=obj.id,
-                type=obj.type,
-                key=obj.id,
-                name=obj.name,
-                icon=obj.icon or "",
-                status=obj.status or "",
-                phone=obj.phone if obj.phone and obj.phone.isdigit() else None,
-                lost_description=obj.description,
-                find_ip=obj.find_ip,
-                create_time=obj.created_at.isoformat(),
-                lost_time=obj.lost_at.isoformat() if obj.lost_at else None,
-            )
-        )
-    return items
+        condition &= Item.id == item_id
+    if status is not None:
+        condition &= Item.status == status
+    if type is not None:
+        condition &= Item.type == type
+    if parent_item_id is not None:
+        condition &= Item.parent_item_id == parent_item_id
+    if cursor:
+        after_created_at, after_id = _decode_cursor(cursor)
+        # 行值比较才能让 SQLite 在索引中直接定位到游标之后，展开成 OR 只能按 user_id 定位后逐项过滤
+        condition &= tuple_(Item.created_at, Item.id) > (after_created_at, after_id)
+
+    # 多取一行用于判断是否还有下一页
+    rows = await Item.get(
+        session,
+        condition,
+        columns=_LIST_COLUMNS,
+        order_by=[Item.created_at, Item.id],
+        limit=limit + 1,
+        fetch_mode="all",
+    )
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_cursor(rows[-1].created_at, rows[-1].id)
+
+    stats = await fetch_scan_stats(session, [row.id for row in rows])
+
+    items = [_to_owner_response(row, stats[row.id]) for row in rows]
+    return ItemPage(items=items, next_cursor=next_cursor)
 
 
 async def create_item(
@@ -66,7 +169,6 @@ async def create_item(
     """
     try:
         request_dict = request.model_dump()
-        request_dict["user"] = user
         request_dict["user_id"] = user.id
         await Item.add(session, Item.model_validate(request_dict))
     except Exception as exc:  # noqa: BLE001
@@ -74,6 +176,170 @@ async def create_item(
         utils.raise_internal_error(str(exc))
 
 
+ITEM_IMPORT_CHUNK_SIZE = int(os.getenv("ITEM_IMPORT_CHUNK_SIZE", 500))
+"""批量导入时每个事务写入的物品数"""
+
+ITEM_IMPORT_MAX_ROWS = int(os.getenv("ITEM_IMPORT_MAX_ROWS", 50000))
+"""单次导入的最大行数"""
+
+ITEM_IMPORT_MAX_RECORD_BYTES = int(os.getenv("ITEM_IMPORT_MAX_RECORD_BYTES", 64 * 1024))
+"""导入时单条记录的最大字节数"""
+
+_IMPORT_MAX_ERRORS = 100
+"""导入结果中最多返回的错误条数"""
+
+
+class _RecordTooLargeError(Exception):
+    pass
+
+
+async def _iter_records(
+    chunks: AsyncIterator[bytes],
+    format: Literal["csv", "jsonl"],
+) -> AsyncIterator[tuple[int, str]]:
+    """
+    将字节流按记录切分，不把整个请求体读入内存。
+
+    CSV 的字段中可能含有换行，引号个数为奇数时与下一行合并为同一条记录。
+    只切分新收到的文本，引号个数随片段累计，每个字符只扫描一次；
+    单条记录超过 `ITEM_IMPORT_MAX_RECORD_BYTES` 字节时中止，避免缺少换行或引号不成对的输入占满内存。
+
+    :return: 逐条产出记录起始的物理行号与记录内容
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    # 当前记录中已结束的行，与尚未遇到换行的行片段
+    lines: list[str] = []
+    line: list[str] = []
+    size = 0
+    quoted = False
+    line_no = 1
+    start = 1
+
+    def split(text: str, final: bool = False):
+        nonlocal line, size, quoted, line_no, start
+        pieces = text.split("\n")
+        for index, piece in enumerate(pieces):
+            if index:
+                # 前一个片段以换行结束
+                lines.append("".join(line).rstrip("\r"))
+                line = []
+                line_no += 1
+                if not quoted:
+                    record = "\n".join(lines)
+                    lines.clear()
+                    size = 0
+                    if record.strip():
+                        yield start, record
+                    start = line_no
+
+            line.append(piece)
+            size += len(piece.encode())
+            if format == "csv" and piece.count('"') % 2:
+                quoted = not quoted
+            if size > ITEM_IMPORT_MAX_RECORD_BYTES:
+                raise _RecordTooLargeError(
+                    f"Record at line {start} exceeds {ITEM_IMPORT_MAX_RECORD_BYTES} bytes"
+                )
+
+        if final:
+            lines.append("".join(line).rstrip("\r"))
+            record = "\n".join(lines)
+            if record.strip():
+                yield start, record
+
+    async for chunk in chunks:
+        for record in split(decoder.decode(chunk)):
+            yield record
+    for record in split(decoder.decode(b"", final=True), final=True):
+        yield record
+
+
+async def _iter_import_rows(
+    chunks: AsyncIterator[bytes],
+    format: Literal["csv", "jsonl"],
+) -> AsyncIterator[tuple[int, dict[str, Any] | Exception]]:
+    header: list[str] | None = None
+    async for line_no, record in _iter_records(chunks, format):
+        if format == "csv" and header is None:
+            header = [name.strip() for name in next(csv.reader([record]))]
+            continue
+
+        try:
+            if format == "csv":
+                values = next(csv.reader([record]))
+                row = {k: v for k, v in zip(header, values) if v != ""}
+            else:
+                row = json.loads(record)
+                if not isinstance(row, dict):
+                    raise ValueError("Each line must be a JSON object")
+        except (ValueError, csv.Error) as exc:
+            yield line_no, exc
+        else:
+            yield line_no, row
+
+
+async def import_items(
+    session: AsyncSession,
+    user: User,
+    chunks: AsyncIterator[bytes],
+    format: Literal["csv", "jsonl"],
+) -> dict[str, Any]:
+    """
+    从 CSV 或 JSON Lines 流批量导入物品。
+
+    请求体边读取边校验，每 `ITEM_IMPORT_CHUNK_SIZE` 个物品用一次批量 INSERT 写入并提交，
+    单个事务的大小与内存占用都与导入总量无关。校验失败的行会被跳过，并以所在的物理行号在结果中报告；
+    已提交的批次不会因为后续的错误回滚。
+
+    CSV 首行为表头，可用列为 `name`、`type`、`icon`、`status`、`phone`、`description`；
+    JSON Lines 每行一个包含这些字段的对象。
+
+    :return: 导入的物品数、失败的行数与部分错误详情
+    """
+    imported = 0
+    failed = 0
+    errors: list[dict[str, Any]] = []
+    batch: list[Item] = []
+
+    async def flush() -> None:
+        nonlocal imported
+        if batch:
+            await Item.add(session, batch, bulk=True)
+            imported += len(batch)
+            batch.clear()
+
+    rows = 0
+    try:
+        async for line_no, row in _iter_import_rows(chunks, format):
+            rows += 1
+            if rows > ITEM_IMPORT_MAX_ROWS:
+                await flush()
+                utils.raise_bad_request(
+                    f"Import is limited to {ITEM_IMPORT_MAX_ROWS} rows, {imported} items were imported"
+                )
+
+            try:
+                if isinstance(row, Exception):
+                    raise row
+                data = ItemBase.model_validate(row)
+            except (ValueError, ValidationError) as exc:
+                failed += 1
+                if len(errors) < _IMPORT_MAX_ERRORS:
+                    errors.append({"line": line_no, "error": str(exc)[:200]})
+                continue
+
+            batch.append(Item(**data.model_dump(), user_id=user.id))
+            if len(batch) >= ITEM_IMPORT_CHUNK_SIZE:
+                await flush()
+    except _RecordTooLargeError as exc:
+        await flush()
+        utils.raise_bad_request(f"{exc}, {imported} items were imported")
+
+    await flush()
+    logger.info(f"Imported {imported} items for user {user.id}, {failed} rows failed")
+    return {"imported": imported, "failed": failed, "errors": errors}
+
+
 async def update_item(
     session: AsyncSession,
     user: User,
@@ -82,12 +348,41 @@ async def update_item(
 ) -> None:
     """
     更新物品信息。
+
+    归属校验与修改在一条 `UPDATE ... WHERE id = ? AND user_id = ? RETURNING` 中完成；
+    修改状态时先在同一个写事务中读取旧状态，用于发布 `status_change` 事件，只提交一次。
     """
-    obj = await Item.get(session, (Item.id == item_id) & (Item.user_id == user.id))
-    if not obj:
+    values = request.model_dump(exclude_unset=True)
+    owned = (Item.id == item_id) & (Item.user_id == user.id)
+    new_status = values.get("status")
+
+    async def operation(writer: AsyncSession) -> tuple[bool, ItemStatusEnum | None]:
+        old_status = None
+        if new_status is not None:
+            row = await Item.get(writer, owned, columns=[Item.status])
+            if row is None:
+                return False, None
+            old_status = row.status
+        rows = await Item.update_where(writer, owned, values, commit=False, returning=[Item.id])
+        return bool(rows), old_status
+
+    if values:
+        found, old_status = await Database.write(operation)
+    else:
+        found, old_status = await Item.get(session, owned, columns=[Item.id]) is not None, None
+    if not found:
         utils.raise_not_found("Item not found or access denied")
 
-    await obj.update(session, request, exclude_unset=True)
+    item_cache.invalidate(item_id)
+
+    if new_status is not None and old_status != new_status:
+        await events.emit(
+            session,
+            user.id,
+            WebhookEventEnum.status_change,
+            item_id,
+            {"old_status": old_status, "status": new_status},
+        )
 
 
 async def delete_item(
@@ -97,31 +392,238 @@ async def delete_item(
 ) -> None:
     """
     删除指定物品。
+
+    只发出一条 `DELETE`，扫码记录与统计由数据库级联删除；仍有子物品时拒绝删除。
     """
-    obj = await Item.get(session, (Item.id == item_id) & (Item.user_id == user.id))
-    if not obj:
+    try:
+        deleted = await Item.delete_where(session, (Item.id == item_id) & (Item.user_id == user.id))
+    except IntegrityError:
+        await session.rollback()
+        utils.raise_conflict("Item still has sub items")
+
+    if not deleted:
         utils.raise_not_found("Item not found or access denied")
-    await Item.delete(session, obj)
+    item_cache.invalidate(item_id)
+
+
+ITEM_BATCH_MAX_IDS = int(os.getenv("ITEM_BATCH_MAX_IDS", 500))
+"""批量接口单次最多处理的物品数"""
+
+
+def _unique_ids(ids: list[UUID]) -> list[UUID]:
+    ids = list(dict.fromkeys(ids))
+    if len(ids) > ITEM_BATCH_MAX_IDS:
+        utils.raise_bad_request(f"At most {ITEM_BATCH_MAX_IDS} items can be processed at once")
+    return ids
+
+
+async def get_items_batch(
+    session: AsyncSession,
+    user: User,
+    ids: list[UUID],
+) -> ItemBatchGetResponse:
+    """
+    批量获取物品，一次 `WHERE user_id = ? AND id IN (...)` 查询完成归属校验。
+
+    :return: 找到的物品（顺序与请求一致）以及不存在或无权访问的物品 ID
+    """
+    ids = _unique_ids(ids)
+    rows = await Item.get(
+        session,
+        (Item.user_id == user.id) & Item.id.in_(ids),
+        columns=_LIST_COLUMNS,
+        fetch_mode="all",
+    )
+    found = {row.id: row for row in rows}
+    stats = await fetch_scan_stats(session, list(found))
+
+    return ItemBatchGetResponse(
+        items=[_to_owner_response(found[item_id], stats[item_id]) for item_id in ids if item_id in found],
+        not_found=[item_id for item_id in ids if item_id not in found],
+    )
+
+
+async def update_items_batch(
+    session: AsyncSession,
+    user: User,
+    ids: list[UUID],
+    patch: ItemDataUpdateRequest,
+) -> list[ItemBatchResult]:
+    """
+    对一批物品应用同一组修改。
+
+    修改在一条 `UPDATE ... WHERE user_id = ? AND id IN (...) RETURNING id` 中完成并提交，
+    不加载任何物品；修改状态时先在同一个写事务中投影查询状态将要变化的物品，
+    用于发布 `status_change` 事件。
+
+    :return: 每个物品 ID 的处理结果
+    """
+    ids = _unique_ids(ids)
+    values = patch.model_dump(exclude_unset=True)
+    owned = (Item.user_id == user.id) & Item.id.in_(ids)
+
+    if not values:
+        rows = await Item.get(session, owned, columns=[Item.id], fetch_mode="all")
+        updated = {row.id for row in rows}
+        old_status: dict[UUID, ItemStatusEnum] = {}
+    else:
+        async def operation(writer: AsyncSession) -> tuple[set[UUID], dict[UUID, ItemStatusEnum]]:
+            changing: dict[UUID, ItemStatusEnum] = {}
+            if values.get("status") is not None:
+                rows = await Item.get(
+                    writer,
+                    owned & (Item.status != values["status"]),
+                    columns=[Item.id, Item.status],
+                    fetch_mode="all",
+                )
+                changing = {row.id: row.status for row in rows}
+            rows = await Item.update_where(writer, owned, values, commit=False, returning=[Item.id])
+            return {row.id for row in rows}, changing
+
+        updated, old_status = await Database.write(operation)
+
+    for item_id in updated:
+        item_cache.invalidate(item_id)
+
+    for item_id, previous in old_status.items():
+        if item_id in updated:
+            await events.emit(
+                session,
+                user.id,
+                WebhookEventEnum.status_change,
+                item_id,
+                {"old_status": previous, "status": values["status"]},
+            )
+
+    return [
+        ItemBatchResult(id=item_id, result=ItemBatchResultEnum.ok if item_id in updated else ItemBatchResultEnum.not_found)
+        for item_id in ids
+    ]
+
+
+async def delete_items_batch(
+    session: AsyncSession,
+    user: User,
+    ids: list[UUID],
+) -> list[ItemBatchResult]:
+    """
+    批量删除物品。
+
+    在同一个写事务中先投影查询批次内物品的父物品，以及哪些物品还有不在本批次中的子物品；
+    这些物品与它们在批次内的祖先都会被跳过并报告为 `conflict`，其余物品用一条
+    `DELETE ... WHERE user_id = ? AND id IN (...) RETURNING id` 删除，
+    子物品与父物品在同一批次中时一起删除。
+
+    :return: 每个物品 ID 的处理结果
+    """
+    ids = _unique_ids(ids)
+
+    async def operation(writer: AsyncSession) -> tuple[set[UUID], set[UUID]]:
+        rows = await Item.get(
+            writer,
+            (Item.user_id == user.id) & Item.id.in_(ids),
+            columns=[Item.id, Item.parent_item_id],
+            fetch_mode="all",
+        )
+        parents = {row.id: row.parent_item_id for row in rows}
+        if not parents:
+            return set(), set()
+
+        children = await Item.get(
+            writer,
+            Item.parent_item_id.in_(list(parents)) & ~Item.id.in_(list(parents)),
+            columns=[Item.parent_item_id],
+            fetch_mode="all",
+        )
+        blocked = {row.parent_item_id for row in children}
+
+        # 被跳过的物品会留下，它在批次内的祖先也就仍有子物品，需要一并跳过
+        pending = list(blocked)
+        while pending:
+            parent = parents.get(pending.pop())
+            if parent in parents and parent not in blocked:
+                blocked.add(parent)
+                pending.append(parent)
+
+        targets = [item_id for item_id in parents if item_id not in blocked]
+        if not targets:
+            return set(), blocked
+
+        owned = (Item.user_id == user.id) & Item.id.in_(targets)
+        # RESTRICT 逐行检查，先解除批次内的父子关系，子物品与父物品才能一起删除
+        await Item.update_where(
+            writer,
+            owned & Item.parent_item_id.in_(targets),
+            {"parent_item_id": None},
+            commit=False,
+        )
+        rows = await Item.delete_where(writer, owned, commit=False, returning=[Item.id])
+        return {row.id for row in rows}, blocked
+
+    deleted, blocked = await Database.write(operation)
+
+    for item_id in deleted:
+        item_cache.invalidate(item_id)
+
+    return [
+        ItemBatchResult(
+            id=item_id,
+            result=(
+                ItemBatchResultEnum.ok if item_id in deleted
+                else ItemBatchResultEnum.conflict if item_id in blocked
+                else ItemBatchResultEnum.not_found
+            ),
+        )
+        for item_id in ids
+    ]
+
+
+async def _load_cached_item(session: AsyncSession, item_id: UUID) -> CachedItem | None:
+    row = await Item.get_by(session, id=item_id, columns=_PUBLIC_COLUMNS)
+    if not row:
+        return None
+
+    return CachedItem(
+        data=ItemDataResponse.model_validate(row._mapping).model_dump(),
+        status=row.status,
+        user_id=row.user_id,
+    )
 
 
 async def retrieve_object(
     session: AsyncSession,
     item_id: UUID,
     client_host: str,
-) -> ItemDataResponse:
+    user_agent: str | None = None,
+) -> dict[str, Any]:
     """
-    根据物品 ID 获取物品信息并视情况更新寻找者 IP。
+    根据物品 ID 获取物品信息，记录扫码历史；物品丢失时更新寻找者 IP 并提醒物主。
+
+    物品数据经 `item_cache` 读穿缓存，同一物品的并发未命中只会查询一次数据库。
+    扫码记录与寻找者 IP 写入内存缓冲后由后台批量落库，本请求不等待提交。
+
+    :return: 序列化后的 `ItemDataResponse`
     """
-    object_data = await Item.get(session, Item.id == item_id)
+    cached = await item_cache.get_or_load(item_id, lambda: _load_cached_item(session, item_id))
 
-    if not object_data:
+    if not cached:
         utils.raise_not_found("物品不存在或出现异常")
 
-    if object_data.status == "lost":
-        object_data.find_ip = client_host
-        object_data = await object_data.save(session)
+    scan_event_queue.record(item_id, client_host, user_agent)
+    scan_stats.record(item_id, client_host)
+
+    if cached.status == ItemStatusEnum.lost:
+        find_ip_buffer.record(item_id, client_host)
+        lost_scan_digest.record(cached.user_id, item_id, cached.data["name"], client_host)
 
-    return ItemDataResponse.model_validate(object_data)
+    await events.emit(
+        session,
+        cached.user_id,
+        WebhookEventEnum.scan,
+        item_id,
+        {"status": cached.status, "ip": client_host, "user_agent": user_agent},
+    )
+    return cached.data
 
 
 async def notify_move_car(
@@ -131,16 +633,19 @@ async def notify_move_car(
 ) -> int:
     """
     向车主发送挪车通知。
+
+    通知写入发件箱并提交后立即返回，由后台任务负责投递与重试；
+    同一车辆在 `notify_dedup_window` 秒内的重复请求会合并为一次投递。
     """
-    item_data = await Item.get_exist_one(session=session, id=item_id)
+    item_data = await Item.get_by(session, id=item_id, columns=[Item.type, Item.name, Item.user_id])
+    if not item_data:
+        utils.raise_not_found("Item not found")
 
     if item_data.type != ItemTypeEnum.car:
         utils.raise_bad_request("Item is not car")
 
-    server_chan_key = await Setting.get(session, Setting.name == "server_chan_key")
-    wechat_bot_key = await Setting.get(session, Setting.name == "wechat_bot_key")
-    if not (server_chan_key.value or wechat_bot_key.value):
-        utils.raise_internal_error("未配置Server酱，无法发送挪车通知")
+    if not configured_channels(await SettingsCache.get(session)):
+        utils.raise_internal_error("未配置通知推送通道，无法发送挪车通知")
 
     title = "挪车通知 - Findreve"
     description = (
@@ -149,15 +654,19 @@ async def notify_move_car(
         "请尽快联系请求者并挪车。"
     )
 
-    mentioned_channel = (await Setting.get(session, Setting.name == "mentioned_channel")).value
-
-    if mentioned_channel == "server_chan":
-        await ServerChatBot.send_text(session=session, title=title, description=description)
-    elif mentioned_channel == "wechat_bot":
-        await WeChatBot.send_markdown(
-            session=session,
-            markdown=f"# {title}\n\n{description}",
-            version="v1",
-        )
+    await enqueue_notification(
+        session,
+        dedup_key=f"move_car:{item_id}",
+        title=title,
+        body=description,
+        item_id=item_id,
+    )
+    await events.emit(
+        session,
+        item_data.user_id,
+        WebhookEventEnum.notify,
+        item_id,
+        {"type": "move_car", "phone": phone},
+    )
 
     return status.HTTP_204_NO_CONTENT
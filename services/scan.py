@@ -0,0 +1,343 @@
+"""
+扫码相关的后台写入逻辑。
+
+公开扫码接口只把数据写入内存缓冲，由后台任务批量落库，扫码请求本身不等待任何提交。
+"""
+
+import os
+from collections import deque
+from datetime import datetime
+from typing import List
+from uuid import UUID
+
+from loguru import logger
+from sqlalchemy import bindparam, insert, update
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from model import Database, Item, ItemScanStats, ScanEvent, ScanEventResponse, User
+from pkg import utils
+from pkg.batcher import PeriodicFlusher
+from pkg.hyperloglog import HyperLogLog
+
+
+class FindIpBuffer(PeriodicFlusher):
+    """
+    丢失物品寻找者 IP 的写后缓冲。
+
+    同一物品在一个刷写周期内的多次扫码会被合并，只保留最后一次的 IP，
+    然后在一个事务中用一条批量 UPDATE 写入。
+    """
+
+    def __init__(self, interval: float) -> None:
+        super().__init__(interval)
+        self._pending: dict[UUID, str] = {}
+
+    def record(self, item_id: UUID, client_host: str) -> None:
+        """
+        记录一次扫码的寻找者 IP，后写入的覆盖先写入的。
+
+        :param item_id: 物品 ID
+        :param client_host: 寻找者 IP
+        """
+        self._pending[item_id] = client_host
+
+    async def flush(self) -> None:
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, {}
+        table = Item.__table__
+        statement = (
+            update(table)
+            .where(table.c.id == bindparam('b_id'))
+            .values(find_ip=bindparam('b_find_ip'))
+        )
+        async def write(session: AsyncSession) -> None:
+            await session.exec(
+                statement,
+                params=[{'b_id': item_id, 'b_find_ip': ip} for item_id, ip in batch.items()],
+            )
+
+        try:
+            await Database.write(write)
+        except Exception:
+            # 写入失败时放回缓冲区，但不覆盖期间产生的更新的记录
+            for item_id, ip in batch.items():
+                self._pending.setdefault(item_id, ip)
+            raise
+
+        logger.debug(f"Flushed find_ip of {len(batch)} items")
+
+
+find_ip_buffer = FindIpBuffer(interval=float(os.getenv("FIND_IP_FLUSH_INTERVAL", 2)))
+"""寻找者 IP 的写后缓冲"""
+
+
+class ScanEventQueue(PeriodicFlusher):
+    """
+    扫码记录的有界写入队列。
+
+    扫码请求只把记录追加到内存队列，后台任务按 `batch_size` 分批批量插入。
+    队列已满时丢弃最旧的记录并计数，保证内存占用有上限且扫码请求永不阻塞。
+    """
+
+    def __init__(self, interval: float, maxsize: int, batch_size: int) -> None:
+        """
+        :param interval: 两次刷写之间的最长间隔，单位秒
+        :param maxsize: 队列最多缓存的记录数
+        :param batch_size: 单条 INSERT 写入的最大记录数，队列积压达到该数量时提前刷写
+        """
+        super().__init__(interval)
+        self.batch_size = batch_size
+        self._queue: deque[dict] = deque(maxlen=maxsize)
+        self.recorded = 0
+        self.inserted = 0
+        self.dropped = 0
+
+    def record(self, item_id: UUID, ip: str | None, user_agent: str | None) -> None:
+        """
+        记录一次扫码。
+
+        :param item_id: 物品 ID
+        :param ip: 扫码者 IP
+        :param user_agent: 扫码者 User-Agent
+        """
+        if len(self._queue) == self._queue.maxlen:
+            self.dropped += 1
+        now = datetime.now()
+        self._queue.append({
+            'item_id': item_id,
+            'ip': ip,
+            'user_agent': user_agent[:512] if user_agent else None,
+            'created_at': now,
+            'updated_at': now,
+        })
+        self.recorded += 1
+        if len(self._queue) >= self.batch_size:
+            self.wake()
+
+    async def flush(self) -> None:
+        while self._queue:
+            batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+            try:
+                try:
+                    await Database.write(lambda session: self._insert(session, batch))
+                except IntegrityError:
+                    # 期间有物品被删除，去掉这些物品的记录后重试
+                    kept = await Database.write(lambda session: self._insert(session, batch, alive_only=True))
+                    self.dropped += len(batch) - len(kept)
+                    batch = kept
+            except Exception:
+                self.dropped += len(batch)
+                raise
+            self.inserted += len(batch)
+
+    @staticmethod
+    async def _insert(session: AsyncSession, batch: list[dict], alive_only: bool = False) -> list[dict]:
+        if alive_only:
+            ids = {event['item_id'] for event in batch}
+            alive = set(await session.exec(select(Item.id).where(Item.id.in_(ids))))
+            batch = [event for event in batch if event['item_id'] in alive]
+        if batch:
+            await session.exec(insert(ScanEvent.__table__), params=batch)
+        return batch
+
+    def stats(self) -> dict[str, int]:
+        """
+        返回队列的统计信息。
+        """
+        return {
+            "queued": len(self._queue),
+            "maxsize": self._queue.maxlen,
+            "recorded": self.recorded,
+            "inserted": self.inserted,
+            "dropped": self.dropped,
+        }
+
+
+scan_event_queue = ScanEventQueue(
+    interval=float(os.getenv("SCAN_EVENT_FLUSH_INTERVAL", 2)),
+    maxsize=int(os.getenv("SCAN_EVENT_QUEUE_SIZE", 10000)),
+    batch_size=int(os.getenv("SCAN_EVENT_BATCH_SIZE", 500)),
+)
+"""扫码记录的写入队列"""
+
+
+class ScanStatsAggregator(PeriodicFlusher):
+    """
+    物品扫码次数与不同扫码者数量的内存聚合。
+
+    每次扫码只在内存中累加计数并更新 HyperLogLog，后台任务定期读取数据库中已有的
+    寄存器数据进行合并，再把累计次数、估算值与寄存器数据写回 `ItemScanStats`。
+    """
+
+    def __init__(self, interval: float, max_pending: int) -> None:
+        """
+        :param interval: 两次刷写之间的最长间隔，单位秒
+        :param max_pending: 待刷写的物品数达到该值时提前刷写
+        """
+        super().__init__(interval)
+        self.max_pending = max_pending
+        self._pending: dict[UUID, tuple[int, HyperLogLog]] = {}
+
+    def record(self, item_id: UUID, ip: str | None) -> None:
+        """
+        记录一次扫码。
+
+        :param item_id: 物品 ID
+        :param ip: 扫码者 IP
+        """
+        count, sketch = self._pending.get(item_id) or (0, HyperLogLog())
+        if ip:
+            sketch.add(ip)
+        self._pending[item_id] = (count + 1, sketch)
+        if len(self._pending) >= self.max_pending:
+            self.wake()
+
+    def pending_count(self, item_id: UUID) -> int:
+        """
+        获取尚未写入数据库的扫码次数。
+
+        :param item_id: 物品 ID
+        """
+        pending = self._pending.get(item_id)
+        return pending[0] if pending else 0
+
+    async def flush(self) -> None:
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, {}
+        try:
+            await self._merge(batch)
+        except Exception:
+            # 写入失败时将本批数据合并回缓冲区
+            for item_id, (count, sketch) in batch.items():
+                pending = self._pending.get(item_id)
+                if pending:
+                    sketch.merge(pending[1])
+                    count += pending[0]
+                self._pending[item_id] = (count, sketch)
+            raise
+
+    async def _merge(self, batch: dict[UUID, tuple[int, HyperLogLog]]) -> None:
+        written = await Database.write(lambda session: self._write(session, batch))
+        logger.debug(f"Flushed scan stats of {written} items")
+
+    @staticmethod
+    async def _write(session: AsyncSession, batch: dict[UUID, tuple[int, HyperLogLog]]) -> int:
+        ids = list(batch)
+        existing = {
+            row.item_id: row
+            for row in await session.exec(
+                select(ItemScanStats.item_id, ItemScanStats.scan_count, ItemScanStats.sketch)
+                .where(ItemScanStats.item_id.in_(ids))
+            )
+        }
+        # 期间被删除的物品不再写入统计
+        alive = set(await session.exec(select(Item.id).where(Item.id.in_(ids)))).union(existing)
+
+        updates, inserts = [], []
+        for item_id, (count, sketch) in batch.items():
+            if item_id not in alive:
+                continue
+            row = existing.get(item_id)
+            if row is not None:
+                if row.sketch:
+                    sketch.merge(HyperLogLog.from_bytes(row.sketch))
+                updates.append({
+                    'b_item_id': item_id,
+                    'scan_count': row.scan_count + count,
+                    'unique_estimate': sketch.estimate(),
+                    'sketch': sketch.to_bytes(),
+                })
+            else:
+                now = datetime.now()
+                inserts.append({
+                    'item_id': item_id,
+                    'scan_count': count,
+                    'unique_estimate': sketch.estimate(),
+                    'sketch': sketch.to_bytes(),
+                    'created_at': now,
+                    'updated_at': now,
+                })
+
+        table = ItemScanStats.__table__
+        if updates:
+            await session.exec(
+                update(table).where(table.c.item_id == bindparam('b_item_id')),
+                params=updates,
+            )
+        if inserts:
+            await session.exec(insert(table), params=inserts)
+        return len(updates) + len(inserts)
+
+    def stats(self) -> dict[str, int]:
+        """
+        返回聚合器的统计信息。
+        """
+        return {"pending_items": len(self._pending)}
+
+
+scan_stats = ScanStatsAggregator(
+    interval=float(os.getenv("SCAN_STATS_FLUSH_INTERVAL", 10)),
+    max_pending=int(os.getenv("SCAN_STATS_MAX_PENDING", 1000)),
+)
+"""物品扫码统计的内存聚合"""
+
+
+async def fetch_scan_stats(
+    session: AsyncSession,
+    item_ids: list[UUID],
+) -> dict[UUID, tuple[int, int]]:
+    """
+    批量获取物品的扫码统计，只读取计数列，不加载寄存器数据。
+
+    扫码次数包含尚未写入数据库的部分；不同扫码者的估算值在每次刷写时更新。
+
+    :return: 物品 ID 到 (扫码次数, 不同扫码者估算值) 的映射
+    """
+    if not item_ids:
+        return {}
+
+    rows = await session.exec(
+        select(ItemScanStats.item_id, ItemScanStats.scan_count, ItemScanStats.unique_estimate)
+        .where(ItemScanStats.item_id.in_(item_ids))
+    )
+    stored = {row.item_id: (row.scan_count, row.unique_estimate) for row in rows}
+    return {
+        item_id: (
+            stored.get(item_id, (0, 0))[0] + scan_stats.pending_count(item_id),
+            stored.get(item_id, (0, 0))[1],
+        )
+        for item_id in item_ids
+    }
+
+
+async def list_scan_events(
+    session: AsyncSession,
+    user: User,
+    item_id: UUID,
+    offset: int = 0,
+    limit: int = 50,
+) -> List[ScanEventResponse]:
+    """
+    分页获取当前用户某个物品的扫码记录，按时间倒序排列。
+
+    尚未刷写到数据库的记录不会出现在结果中。
+    """
+    if not await Item.get(session, (Item.id == item_id) & (Item.user_id == user.id), columns=[Item.id]):
+        utils.raise_not_found("Item not found or access denied")
+
+    return await ScanEvent.get(
+        session,
+        ScanEvent.item_id == item_id,
+        offset=offset,
+        limit=limit,
+        fetch_mode="all",
+        order_by=[ScanEvent.created_at.desc(), ScanEvent.id.desc()],
+        columns=[ScanEvent.ip, ScanEvent.user_agent, ScanEvent.created_at],
+        into=ScanEventResponse,
+    )
@@ -2,16 +2,117 @@
 会话服务，负责处理登录与令牌生成逻辑。
 """
 
+import asyncio
+import os
 from datetime import datetime, timedelta, timezone
+from fastapi import BackgroundTasks
+from loguru import logger
 from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import Any
+from uuid import UUID
 import jwt
 
-from model import Setting, User
+from model import Database, Setting, SettingsCache, User
 from model.response import TokenResponse
 from pkg import Password, utils
+from pkg.login_guard import FailureTracker
+from pkg.password import Argon2Cost, PasswordPoolBusyError, PasswordStatus
 import JWT
 
+ARGON2_COST_SETTINGS: tuple[str, str, str] = (
+    "argon2_time_cost",
+    "argon2_memory_cost",
+    "argon2_parallelism",
+)
+"""保存 Argon2 成本参数的设置项名称，顺序与 `Argon2Cost` 一致"""
+
+_FAILURE_WINDOW = float(os.getenv("LOGIN_FAILURE_WINDOW", 900))
+_GUARD_SIZE = int(os.getenv("LOGIN_GUARD_SIZE", 10000))
+
+account_failures = FailureTracker(
+    limit=int(os.getenv("LOGIN_MAX_FAILURES_PER_ACCOUNT", 10)),
+    window=_FAILURE_WINDOW,
+    maxsize=_GUARD_SIZE,
+)
+"""按账号统计的登录失败次数"""
+
+ip_failures = FailureTracker(
+    limit=int(os.getenv("LOGIN_MAX_FAILURES_PER_IP", 50)),
+    window=_FAILURE_WINDOW,
+    maxsize=_GUARD_SIZE,
+)
+"""按来源 IP 统计的登录失败次数"""
+
+
+async def apply_password_policy(session: AsyncSession) -> None:
+    """
+    从设置中读取已保存的 Argon2 成本参数并应用到全局哈希器。
+
+    参数未配置时保留 argon2-cffi 的默认值。同时预先生成占位哈希，
+    使第一个未知账号的登录请求也不会多出一次哈希的耗时。
+    """
+    settings = await SettingsCache.get(session)
+    values = [settings.get(name) for name in ARGON2_COST_SETTINGS]
+    if all(values):
+        Password.configure(Argon2Cost(*values))
+
+    await Password.verify_dummy_async("")
+
+
+async def calibrate_password_hasher(
+    session: AsyncSession,
+    budget_ms: float,
+) -> Argon2Cost:
+    """
+    按延迟预算在当前主机上校准 Argon2 成本参数，保存到设置并立即生效。
+
+    :param budget_ms: 单次哈希的目标耗时，单位毫秒
+    :return: 校准后的成本参数
+    """
+    cost = await asyncio.to_thread(Password.calibrate, budget_ms)
+
+    for name, value in zip(ARGON2_COST_SETTINGS, cost):
+        setting = await Setting.get_by(session, name=name)
+        setting.value = str(value)
+        setting = await setting.save(session, refresh=False)
+        SettingsCache.replace(setting)
+
+    logger.info(f"Argon2 calibrated for a {budget_ms} ms budget")
+    Password.configure(cost)
+    return cost
+
+
+async def rehash_password(
+    user_id: UUID,
+    old_hash: str,
+    password: str,
+) -> None:
+    """
+    使用当前的 Argon2 参数重新哈希密码并保存。
+
+    在登录成功后作为后台任务运行；若期间密码已被修改，则放弃本次更新。
+    """
+    try:
+        new_hash = await Password.hash_async(password)
+    except PasswordPoolBusyError:
+        logger.info("Argon2 pool is busy, postponing password rehash to the next login")
+        return
+
+    async def operation(writer: AsyncSession) -> bool:
+        # 检查与写入在同一个写事务中，期间修改的密码不会被覆盖
+        account = await User.get_by(writer, id=user_id)
+        if account is None or account.password != old_hash:
+            return False
+        account.password = new_hash
+        await writer.flush()
+        return True
+
+    if not await Database.write(operation):
+        return
+
+    logger.info(f"Rehashed password of user {user_id} with current Argon2 parameters")
+
+
 async def create_access_token(
     session: AsyncSession,
     data: dict[str, Any],
@@ -20,8 +121,8 @@ async def create_access_token(
     创建访问令牌。
     """
     to_encode = data.copy()
-    jwt_exp_setting = await Setting.get(session, Setting.name == "jwt_token_exp")
-    expire = datetime.now(timezone.utc) + timedelta(int(jwt_exp_setting.value))
+    settings = await SettingsCache.get(session)
+    expire = datetime.now(timezone.utc) + timedelta(settings["jwt_token_exp"])
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, key=await JWT.get_secret_key(), algorithm="HS256")
     return encoded_jwt
@@ -31,15 +132,44 @@ async def authenticate_user(
     session: AsyncSession,
     username: str,
     password: str,
+    client_host: str | None = None,
+    background_tasks: BackgroundTasks | None = None,
 ) -> User:
     """
     验证用户名和密码，返回认证后的用户。
+
+    - 账号或来源 IP 在滑动窗口内失败次数过多时直接返回 429，不再执行 Argon2 校验
+    - 账号不存在时对占位哈希执行同等开销的校验，避免通过响应时间探测账号
+    - Argon2 校验在独立线程池中进行，线程池饱和时返回 503，而不是拖垮整个事件循环
+    - 若密码哈希使用的是过时的参数，会在响应返回后于后台重新哈希并保存
     """
-    account = await User.get(session, User.email == username)
+    account_key = username.lower()
+    if account_failures.is_blocked(account_key) or (
+        client_host is not None and ip_failures.is_blocked(client_host)
+    ):
+        utils.raise_too_many_requests("Too many failed login attempts, please try again later")
+
+    account = await User.get_by(session, email=username)
+
+    try:
+        if not account or account.email != username:
+            status = await Password.verify_dummy_async(password)
+        else:
+            status = await Password.verify_async(account.password, password)
+    except PasswordPoolBusyError:
+        utils.raise_service_unavailable("Too many login requests, please try again later")
 
-    if not account or account.email != username or not Password.verify(account.password, password):
+    if status == PasswordStatus.INVALID:
+        account_failures.record_failure(account_key)
+        if client_host is not None:
+            ip_failures.record_failure(client_host)
         utils.raise_unauthorized("Account or password is incorrect")
 
+    account_failures.reset(account_key)
+
+    if status == PasswordStatus.EXPIRED and background_tasks is not None:
+        background_tasks.add_task(rehash_password, account.id, account.password, password)
+
     return account
 
 
@@ -47,11 +177,19 @@ async def login_for_access_token(
     session: AsyncSession,
     username: str,
     password: str,
+    client_host: str | None = None,
+    background_tasks: BackgroundTasks | None = None,
 ) -> TokenResponse:
     """
     登录并生成访问令牌。
     """
-    user = await authenticate_user(session=session, username=username, password=password)
+    user = await authenticate_user(
+        session=session,
+        username=username,
+        password=password,
+        client_host=client_host,
+        background_tasks=background_tasks,
+    )
 
     access_token = await create_access_token(
         session=session,
@@ -0,0 +1,178 @@
+"""
+Webhook 订阅相关业务逻辑。
+"""
+
+import os
+from typing import List
+from uuid import UUID
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from model import Database, User
+from model.webhook import (
+    WebhookEventEnum,
+    WebhookSubscription,
+    WebhookSubscriptionCreateRequest,
+    WebhookSubscriptionResponse,
+    WebhookSubscriptionUpdateRequest,
+)
+from pkg import Password, utils
+from pkg.cache import LoadingCache
+from pkg.sender.webhook import WebhookTarget, resolve_public_address, webhook_dispatcher
+
+MAX_SUBSCRIPTIONS_PER_USER = int(os.getenv("WEBHOOK_MAX_PER_USER", 20))
+"""每个用户最多注册的 Webhook 数"""
+
+subscription_cache: LoadingCache[UUID, tuple[tuple[frozenset[str], WebhookTarget], ...]] = LoadingCache(
+    maxsize=int(os.getenv("WEBHOOK_CACHE_SIZE", 4096)),
+    ttl=float(os.getenv("WEBHOOK_CACHE_TTL", 60)),
+)
+"""用户已启用的 Webhook 缓存，以用户 ID 为键；没有订阅的用户缓存为空元组"""
+
+
+async def _load_targets(session: AsyncSession, user_id: UUID) -> tuple[tuple[frozenset[str], WebhookTarget], ...]:
+    rows = await WebhookSubscription.get(
+        session,
+        (WebhookSubscription.user_id == user_id) & (WebhookSubscription.enabled == True),  # noqa: E712
+        fetch_mode="all",
+        columns=[WebhookSubscription.id, WebhookSubscription.url, WebhookSubscription.secret, WebhookSubscription.events],
+    )
+    return tuple(
+        (
+            frozenset(e for e in row.events.split(',') if e),
+            WebhookTarget(subscription_id=row.id, url=row.url, secret=row.secret),
+        )
+        for row in rows
+    )
+
+
+async def targets_for(session: AsyncSession, user_id: UUID, event: WebhookEventEnum) -> list[WebhookTarget]:
+    """
+    获取用户订阅了某个事件的投递目标。
+
+    订阅经 `subscription_cache` 读穿缓存，热路径上通常不查询数据库。
+
+    :param session: 数据库会话
+    :param user_id: 用户 ID
+    :param event: 事件类型
+    """
+    targets = await subscription_cache.get_or_load(user_id, lambda: _load_targets(session, user_id))
+    return [target for events, target in targets if event in events]
+
+
+def _to_response(subscription: WebhookSubscription, with_secret: bool = False) -> WebhookSubscriptionResponse:
+    return WebhookSubscriptionResponse(
+        id=subscription.id,
+        url=subscription.url,
+        enabled=subscription.enabled,
+        events=sorted(subscription.event_set),
+        created_at=subscription.created_at,
+        secret=subscription.secret if with_secret else None,
+        stats=webhook_dispatcher.subscription_stats(subscription.id),
+    )
+
+
+async def list_webhooks(session: AsyncSession, user: User) -> List[WebhookSubscriptionResponse]:
+    """
+    获取当前用户的 Webhook 列表，附带本进程内的投递统计。
+    """
+    subscriptions = await WebhookSubscription.get(
+        session,
+        WebhookSubscription.user_id == user.id,
+        fetch_mode="all",
+        order_by=[WebhookSubscription.created_at],
+    )
+    return [_to_response(s) for s in subscriptions]
+
+
+async def _check_url(url: str) -> None:
+    try:
+        await resolve_public_address(url)
+    except ValueError as exc:
+        utils.raise_bad_request(str(exc))
+
+
+async def create_webhook(
+    session: AsyncSession,
+    user: User,
+    request: WebhookSubscriptionCreateRequest,
+) -> WebhookSubscriptionResponse:
+    """
+    注册 Webhook，签名密钥只在此时返回一次。
+
+    地址必须是 https，且主机名只能解析到公网地址。
+    """
+    await _check_url(str(request.url))
+    subscription = WebhookSubscription(
+        user_id=user.id,
+        url=str(request.url),
+        events=",".join(sorted(set(request.events))),
+        enabled=request.enabled,
+        secret=Password.generate(32),
+    )
+
+    async def operation(writer: AsyncSession) -> bool:
+        # 数量检查与写入在同一个写事务中，并发注册不会超过上限
+        existing = await WebhookSubscription.get(
+            writer,
+            WebhookSubscription.user_id == user.id,
+            fetch_mode="all",
+            columns=[WebhookSubscription.id],
+        )
+        if len(existing) >= MAX_SUBSCRIPTIONS_PER_USER:
+            return False
+        writer.add(subscription)
+        await writer.flush()
+        return True
+
+    if not await Database.write(operation):
+        utils.raise_bad_request(f"At most {MAX_SUBSCRIPTIONS_PER_USER} webhooks are allowed")
+
+    subscription_cache.invalidate(user.id)
+    return _to_response(subscription, with_secret=True)
+
+
+async def update_webhook(
+    session: AsyncSession,
+    user: User,
+    webhook_id: UUID,
+    request: WebhookSubscriptionUpdateRequest,
+) -> None:
+    """
+    更新 Webhook 的地址、订阅事件或启用状态。
+    """
+    values = {}
+    if request.url is not None:
+        await _check_url(str(request.url))
+        values["url"] = str(request.url)
+    if request.events is not None:
+        values["events"] = ",".join(sorted(set(request.events)))
+    if request.enabled is not None:
+        values["enabled"] = request.enabled
+
+    owned = (WebhookSubscription.id == webhook_id) & (WebhookSubscription.user_id == user.id)
+    if values:
+        found = await WebhookSubscription.update_where(session, owned, values)
+    else:
+        found = await WebhookSubscription.get(session, owned, columns=[WebhookSubscription.id])
+    if not found:
+        utils.raise_not_found("Webhook not found or access denied")
+    subscription_cache.invalidate(user.id)
+
+
+async def delete_webhook(
+    session: AsyncSession,
+    user: User,
+    webhook_id: UUID,
+) -> None:
+    """
+    删除 Webhook。
+    """
+    deleted = await WebhookSubscription.delete_where(
+        session,
+        (WebhookSubscription.id == webhook_id) & (WebhookSubscription.user_id == user.id),
+    )
+    if not deleted:
+        utils.raise_not_found("Webhook not found or access denied")
+    subscription_cache.invalidate(user.id)
+    webhook_dispatcher.forget(webhook_id)
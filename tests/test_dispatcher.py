@@ -0,0 +1,39 @@
+"""
+通知分发器的测试。
+"""
+
+import asyncio
+import time
+
+from pkg.sender.dispatcher import NotificationDispatcher
+
+
+def test_dispatch_batch_stays_within_budget():
+    dispatcher = NotificationDispatcher(timeout=0.2, failure_threshold=100, reset_timeout=60)
+    delivered: list[str] = []
+
+    async def send_one(session, title, body) -> None:
+        await asyncio.sleep(0.05)
+        delivered.append(title)
+
+    async def send_many(session, messages) -> list[bool]:
+        for title, body in messages:
+            await send_one(session, title, body)
+        return [True] * len(messages)
+
+    dispatcher.register("slow", send_one)
+    dispatcher.register("batched", send_one, send_many)
+    messages = [(f"message {i}", "body") for i in range(50)]
+
+    start = time.perf_counter()
+    results = asyncio.run(dispatcher.dispatch_batch(None, messages, ["slow", "batched"], budget=0.5))
+    elapsed = time.perf_counter() - start
+
+    # 每条通知 0.05 秒，50 条需要 2.5 秒，时间用完后其余通知留待下次投递
+    assert elapsed < 0.8
+    for name in ("slow", "batched"):
+        sent = [result[name] for result in results]
+        assert 0 < sum(sent) < len(messages)
+        assert sent == sorted(sent, reverse=True)
+        stats = dispatcher.stats()[name]
+        assert stats["skipped"] > 0
@@ -0,0 +1,160 @@
+"""
+SMTP 连接池的测试，使用 aiosmtpd 在本地启动一个需要登录的 SMTP 服务器。
+"""
+
+import asyncio
+import socket
+from email.message import EmailMessage
+
+import pytest
+from aiosmtpd.controller import Controller
+from aiosmtpd.smtp import AuthResult
+
+from pkg.sender.dispatcher import NotificationDispatcher
+from pkg.sender.smtp import SMTPConfig, SMTPPool
+
+
+class RecordingHandler:
+    """记录收到的邮件以及它们所在的 SMTP 会话"""
+
+    def __init__(self) -> None:
+        self.logins = 0
+        self.sessions: list[object] = []
+        self.subjects: list[str] = []
+        self.reject: set[str] = set()
+
+    def authenticate(self, server, session, envelope, mechanism, auth_data) -> AuthResult:
+        self.logins += 1
+        return AuthResult(success=auth_data.login == b"findreve" and auth_data.password == b"secret")
+
+    async def handle_DATA(self, server, session, envelope) -> str:
+        subject = envelope.content.decode().split("Subject: ", 1)[1].split("\r\n", 1)[0]
+        if subject in self.reject:
+            return "554 Message rejected"
+        self.sessions.append(session)
+        self.subjects.append(subject)
+        return "250 OK"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_server():
+    handler = RecordingHandler()
+    controller = Controller(
+        handler,
+        hostname="127.0.0.1",
+        port=_free_port(),
+        authenticator=handler.authenticate,
+        auth_require_tls=False,
+    )
+    controller.start()
+    try:
+        yield handler, SMTPConfig(
+            host="127.0.0.1",
+            port=controller.port,
+            username="findreve",
+            password="secret",
+            tls="none",
+        )
+    finally:
+        controller.stop()
+
+
+def _message(subject: str) -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = "findreve@example.com"
+    message["To"] = "owner@example.com"
+    message["Subject"] = subject
+    message.set_content(subject)
+    return message
+
+
+def test_pool_reuses_one_login_across_messages(smtp_server):
+    handler, config = smtp_server
+    pool = SMTPPool(size=1, idle_timeout=30, timeout=5)
+
+    async def run() -> None:
+        await pool.send(config, [_message(f"batch {i}") for i in range(20)])
+        for i in range(5):
+            await pool.send(config, [_message(f"single {i}")])
+        await pool.close()
+
+    asyncio.run(run())
+
+    assert len(handler.subjects) == 25
+    assert handler.logins == 1
+    assert len({id(session) for session in handler.sessions}) == 1
+    assert pool.stats()["connects"] == 1
+    assert pool.stats()["reuses"] == 5
+
+
+def test_dispatch_batch_sends_all_messages_over_one_connection(smtp_server):
+    handler, config = smtp_server
+    pool = SMTPPool(size=2, idle_timeout=30, timeout=5)
+    dispatcher = NotificationDispatcher(timeout=5, failure_threshold=5, reset_timeout=60)
+    single_calls = 0
+
+    async def send_one(session, title, body) -> None:
+        nonlocal single_calls
+        single_calls += 1
+        await pool.send(config, [_message(title)])
+
+    async def send_many(session, messages) -> list[bool]:
+        errors = await pool.send(config, [_message(title) for title, _ in messages])
+        return [error is None for error in errors]
+
+    dispatcher.register("email", send_one, send_many)
+    messages = [(f"digest {i}", "body") for i in range(30)]
+
+    async def run() -> list[dict[str, bool]]:
+        try:
+            return await dispatcher.dispatch_batch(None, messages, ["email"])
+        finally:
+            await pool.close()
+
+    results = asyncio.run(run())
+
+    assert results == [{"email": True}] * len(messages)
+    assert single_calls == 0
+    assert handler.subjects == [title for title, _ in messages]
+    assert handler.logins == 1
+    assert len({id(session) for session in handler.sessions}) == 1
+    assert dispatcher.stats()["email"]["sent"] == len(messages)
+
+
+def test_rejected_message_does_not_fail_the_rest_of_the_batch(smtp_server):
+    handler, config = smtp_server
+    handler.reject = {"message 3"}
+    pool = SMTPPool(size=1, idle_timeout=30, timeout=5)
+    dispatcher = NotificationDispatcher(timeout=5, failure_threshold=5, reset_timeout=60)
+
+    async def send_one(session, title, body) -> None:
+        raise AssertionError("batch sender should be used")
+
+    async def send_many(session, messages) -> list[bool]:
+        errors = await pool.send(config, [_message(title) for title, _ in messages])
+        return [error is None for error in errors]
+
+    dispatcher.register("email", send_one, send_many)
+    messages = [(f"message {i}", "body") for i in range(8)]
+
+    async def run() -> list[dict[str, bool]]:
+        try:
+            return await dispatcher.dispatch_batch(None, messages, ["email"])
+        finally:
+            await pool.close()
+
+    results = asyncio.run(run())
+
+    assert [result["email"] for result in results] == [i != 3 for i in range(8)]
+    assert handler.subjects == [f"message {i}" for i in range(8) if i != 3]
+    assert handler.logins == 1
+    assert len({id(session) for session in handler.sessions}) == 1
+    assert pool.stats()["connects"] == 1
+    stats = dispatcher.stats()["email"]
+    assert (stats["sent"], stats["failed"]) == (7, 1)